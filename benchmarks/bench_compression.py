@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Shows the tradeoff between the CPU time spent compressing uploads and the time saved
+sending them, for text and RTF documents of various sizes over links of various
+speeds. Execute from the root of the repository like:
+
+  python benchmarks/bench_compression.py
+
+The estimated wall time of an upload is the time to compress it (if compressed)
+plus the time to send it at the link's bandwidth, ignoring latency.
+"""
+
+import io
+import random
+import time
+
+from draftable.transport import UploadCompression
+from draftable.transport.multipart import MultipartBody
+
+# Repeating a small document would compress unrealistically well, so documents are
+# generated from words chosen at random.
+with open("test-files/hello-left.txt") as f:
+    WORDS = (
+        f.read()
+        + " agreement party shall means including without limitation pursuant section"
+        + " hereto notwithstanding provided that each"
+    ).split()
+SIZES = (64 * 1024, 1024 * 1024, 16 * 1024 * 1024)
+LEVELS = (1, 6, 9)
+# Link bandwidths, in megabits per second.
+BANDWIDTHS = (10, 100, 1000)
+REPEAT = 3
+
+
+def document(kind, size):
+    rng = random.Random(size)
+    paragraphs = []
+    length = 0
+    while length < size:
+        words = rng.choices(WORDS, k=rng.randint(20, 120))
+        if kind == "rtf":
+            words[0] = "{\\b " + words[0] + "}"
+            paragraph = " ".join(words) + "\\par\n"
+        else:
+            paragraph = " ".join(words) + "\n\n"
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+    content = "".join(paragraphs)
+    if kind == "rtf":
+        content = "{\\rtf1\\ansi\\deff0 " + content + "}"
+    return content.encode("utf-8")[:size]
+
+
+def compress(content, level):
+    body = MultipartBody(
+        {"left.file_type": "txt"},
+        {"left.file": ("left", io.BytesIO(content), "application/octet-stream")},
+    )
+    compression = UploadCompression(threshold=0, level=level, max_ratio=1.0)
+    best = None
+    for _ in range(REPEAT):
+        body.reset()
+        start = time.process_time()
+        with compression.compress(body) as compressed:
+            elapsed = time.process_time() - start
+            size = len(compressed)
+        best = elapsed if best is None else min(best, elapsed)
+    return len(body), size, best
+
+
+def main():
+    header = f"{'sample':<8}{'size':>8}{'level':>7}{'ratio':>8}{'cpu':>10}"
+    header += "".join(f"{f'{mbps}Mb/s':>16}" for mbps in BANDWIDTHS)
+    print(header)
+    print(" " * 41 + "".join(f"{'raw -> gzip':>16}" for _ in BANDWIDTHS))
+
+    for name in ("txt", "rtf"):
+        for size in SIZES:
+            content = document(name, size)
+            for level in LEVELS:
+                raw, compressed, cpu = compress(content, level)
+                row = (
+                    f"{name:<8}{size // 1024:>7}K{level:>7}"
+                    f"{compressed / raw:>8.3f}{cpu * 1e3:>8.1f}ms"
+                )
+                for mbps in BANDWIDTHS:
+                    bytes_per_second = mbps * 1e6 / 8
+                    before = raw / bytes_per_second
+                    after = cpu + compressed / bytes_per_second
+                    row += f"{before * 1e3:>8.0f}{after * 1e3:>6.0f}ms"
+                print(row)
+
+
+if __name__ == "__main__":
+    main()
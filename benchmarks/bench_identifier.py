@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Compares the performance of `generate_identifiers` with the previous `random.choice`
+based implementation of `generate_identifier`. Execute from the root of the
+repository like:
+
+  python benchmarks/bench_identifier.py
+"""
+
+import random
+import string
+import timeit
+
+from draftable.endpoints.comparisons.identifier import (
+    generate_identifier,
+    generate_identifiers,
+)
+
+COUNTS = (1, 100, 10_000)
+REPEAT = 5
+
+
+def previous_generate_identifier():
+    return "".join(random.choice(string.ascii_letters) for _ in range(12))
+
+
+def bench(func, count):
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=REPEAT, number=1)) / count
+
+
+def main():
+    print(f"{'count':<10}{'previous':>12}{'single':>12}{'bulk':>12}{'speedup':>10}")
+    for count in COUNTS:
+        before = bench(
+            lambda: [previous_generate_identifier() for _ in range(count)], count
+        )
+        single = bench(lambda: [generate_identifier() for _ in range(count)], count)
+        bulk = bench(lambda: generate_identifiers(count), count)
+        print(
+            f"{count:<10}{before * 1e6:>10.2f}us{single * 1e6:>10.2f}us"
+            f"{bulk * 1e6:>10.2f}us{before / bulk:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
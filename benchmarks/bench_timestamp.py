@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Compares the performance of `parse_datetime` with the previous `strptime` based
+implementation. Execute from the root of the repository like:
+
+  python benchmarks/bench_timestamp.py
+"""
+
+import timeit
+
+from draftable.utilities.timestamp import _parse_datetime_strptime, parse_datetime
+
+SAMPLES = {
+    "with microseconds": "2024-05-17T08:21:43.123456Z",
+    "without microseconds": "2024-05-17T08:21:43Z",
+}
+NUMBER = 100_000
+REPEAT = 5
+
+
+def bench(func, value):
+    timer = timeit.Timer(lambda: func(value))
+    return min(timer.repeat(repeat=REPEAT, number=NUMBER)) / NUMBER
+
+
+def main():
+    print(f"{'sample':<22}{'strptime':>12}{'current':>12}{'speedup':>10}")
+    for name, value in SAMPLES.items():
+        assert parse_datetime(value) == _parse_datetime_strptime(value)
+        before = bench(_parse_datetime_strptime, value)
+        after = bench(parse_datetime, value)
+        print(
+            f"{name:<22}{before * 1e6:>10.2f}us{after * 1e6:>10.2f}us"
+            f"{before / after:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
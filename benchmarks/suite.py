@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+"""
+Measures the client's hot paths, and compares them with a stored baseline so that
+regressions show up in review. Execute from the root of the repository like:
+
+  python benchmarks/suite.py                  # run and compare with the baseline
+  python benchmarks/suite.py --save           # run and replace the baseline
+  python benchmarks/suite.py change_details   # run benchmarks matching a pattern
+
+Each benchmark reports the best time per operation of several repeats. Timings
+depend on the machine, so the baseline records where it was measured, and should
+be saved again (in the same commit) when a change is expected to affect them, or
+when comparing on a different machine. The exit status is 1 if any benchmark is
+slower than its baseline by more than the tolerance.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from draftable import Client
+from draftable.endpoints.comparisons.changes import change_details_from_response
+from draftable.endpoints.comparisons.comparison import comparison_from_response
+from draftable.endpoints.comparisons.inventory import ComparisonInventory
+from draftable.endpoints.comparisons.signing import get_viewer_url_signature
+from draftable.endpoints.validation import validate_identifier
+from draftable.testing import StandInServer
+from draftable.testing.payloads import generate_change_details
+from draftable.transport.multipart import MultipartBody
+from draftable.transport.rest_client import _flatten_form_data
+from draftable.utilities.timestamp import parse_datetime
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+REPEAT = 5
+TOLERANCE = 0.25
+
+# name -> (setup, operations per call, calls per repeat)
+BENCHMARKS = {}
+
+
+def benchmark(name, operations=1, number=1):
+    """Registers a benchmark. The decorated function is a context manager which
+    yields the function to time, performing `operations` operations per call."""
+
+    def register(setup):
+        BENCHMARKS[name] = (contextmanager(setup), operations, number)
+        return setup
+
+    return register
+
+
+def comparison_data(index):
+    return {
+        "identifier": f"comparison{index:08d}",
+        "left": {"file_type": "pdf", "display_name": "left.pdf"},
+        "right": {"file_type": "docx", "source_url": "https://example.com/r.docx"},
+        "public": False,
+        "creation_time": "2024-05-17T08:21:43.123456Z",
+        "expiry_time": "2024-06-17T08:21:43Z",
+        "ready": True,
+        "ready_time": "2024-05-17T08:22:01.654321Z",
+        "failed": False,
+    }
+
+
+@benchmark("change_details_1k", operations=1000, number=10)
+def bench_change_details_1k():
+    data = generate_change_details(1000, seed=0)
+    yield lambda: change_details_from_response(data)
+
+
+@benchmark("change_details_100k", operations=100_000)
+def bench_change_details_100k():
+    data = generate_change_details(100_000, seed=0)
+    yield lambda: change_details_from_response(data)
+
+
+@benchmark("comparison_from_response", operations=10_000)
+def bench_comparison_from_response():
+    # The results of listing comparisons.
+    results = [comparison_data(index) for index in range(10_000)]
+    yield lambda: [comparison_from_response(data) for data in results]
+
+
+@benchmark("inventory", operations=10_000)
+def bench_inventory():
+    results = [comparison_data(index) for index in range(10_000)]
+    yield lambda: ComparisonInventory.from_results(results)
+
+
+@benchmark("parse_datetime", number=100_000)
+def bench_parse_datetime():
+    yield lambda: parse_datetime("2024-05-17T08:21:43.123456Z")
+
+
+@benchmark("validate_identifier", number=100_000)
+def bench_validate_identifier():
+    yield lambda: validate_identifier("aBcDeFgHiJkL-0123_xyz")
+
+
+@benchmark("get_viewer_url_signature", number=10_000)
+def bench_get_viewer_url_signature():
+    yield lambda: get_viewer_url_signature("account", "token", "abc", 1_700_000_000)
+
+
+@benchmark("multipart_64mib", operations=64)
+def bench_multipart():
+    # Per MiB of a file, flattened and encoded as a multipart upload.
+    content = os.urandom(1024 * 1024) * 64
+
+    def encode():
+        data, files = _flatten_form_data(
+            {
+                "identifier": "abc",
+                "left": {
+                    "file_type": "pdf",
+                    "file": ("left.pdf", io.BytesIO(content), "application/pdf"),
+                },
+                "right": {"file_type": "pdf", "source_url": "https://example.com/"},
+            }
+        )
+        for _ in MultipartBody(data, files):
+            pass
+
+    yield encode
+
+
+@benchmark("request_throughput", operations=400)
+def bench_request_throughput():
+    # Per request, of 400 requests made by 8 threads to a local stand-in server.
+    with StandInServer() as server:
+        client = Client(server.account_id, server.auth_token, server.base_url)
+        identifier = client.comparisons.create(
+            "https://example.com/left.pdf", "https://example.com/right.pdf"
+        ).identifier
+
+        def requests():
+            with ThreadPoolExecutor(8) as executor:
+                list(executor.map(client.comparisons.get, [identifier] * 400))
+
+        yield requests
+
+
+def run(name):
+    setup, operations, number = BENCHMARKS[name]
+    with setup() as func:
+        func()  # Warm up
+        best = min(timeit.Timer(func).repeat(repeat=REPEAT, number=number))
+    return best / number / operations
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "processor": platform.processor(),
+    }
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.1f}ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("patterns", nargs="*", help="only run matching benchmarks")
+    parser.add_argument("--save", action="store_true", help="replace the baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=TOLERANCE,
+        help="the fraction slower than the baseline that is a regression "
+        f"(default {TOLERANCE})",
+    )
+    args = parser.parse_args()
+
+    baseline = {"environment": {}, "results": {}}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    if not args.save and baseline["environment"] != environment():
+        print(
+            "Warning: the baseline was measured in a different environment:",
+            baseline["environment"],
+            file=sys.stderr,
+        )
+
+    names = [
+        name
+        for name in BENCHMARKS
+        if not args.patterns or any(re.search(p, name) for p in args.patterns)
+    ]
+    print(f"{'benchmark':<28}{'baseline':>12}{'current':>12}{'change':>10}")
+    results = {}
+    regressions = []
+    for name in names:
+        results[name] = current = run(name)
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"{name:<28}{'-':>12}{format_time(current):>12}")
+            continue
+        change = current / previous - 1
+        flag = ""
+        if change > args.tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<28}{format_time(previous):>12}{format_time(current):>12}"
+            f"{change:>+10.0%}{flag}"
+        )
+
+    if args.save:
+        baseline["environment"] = environment()
+        baseline["saved"] = time.strftime("%Y-%m-%d")
+        baseline["results"].update(results)
+        with open(BASELINE, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved the baseline to {BASELINE}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
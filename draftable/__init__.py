@@ -1,5 +1,9 @@
 from .client import PRODUCTION_CLOUD_BASE_URL, Client
-from .endpoints.comparisons.identifier import generate_identifier
+from .endpoints.comparisons.identifier import (
+    collision_probability,
+    generate_identifier,
+    generate_identifiers,
+)
 from .endpoints.comparisons.sides import make_side
 
 try:
@@ -1,23 +1,75 @@
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
 from .endpoints import ComparisonsEndpoint, ExportsEndpoint
-from .transport import RESTClient
+from .endpoints.comparisons.comparisons import DEFAULT_CACHE_TTL
+from .endpoints.latency import LatencyTracker
+from .pipeline import DEFAULT_POLL_INTERVAL, ComparePipeline, PipelineJob
+from .transport import (
+    DEFAULT_MAX_CONNECTIONS,
+    Instrumentation,
+    RESTClient,
+    Timeouts,
+    TransportStats,
+    UploadCompression,
+)
 from .utilities.urls import Url
 
 try:
-    from typing import Optional
+    from typing import Any, BinaryIO, Iterable, Iterator, Optional, Union
 except ImportError:
     pass
 
+if TYPE_CHECKING:
+    from .endpoints.comparisons.sides import FileSide, URLSide
+    from .endpoints.exports.export import Export
+    from .pipeline import PipelineResult
+
 
 PRODUCTION_CLOUD_BASE_URL = "https://api.draftable.com/v1"
 
 
 class Client(object):
-    def __init__(self, account_id, auth_token, base_url=None):
-        # type: (str, str, Optional[str]) -> None
-        self.__client = RESTClient(account_id, auth_token)
+    def __init__(
+        self,
+        account_id,
+        auth_token,
+        base_url=None,
+        max_connections=DEFAULT_MAX_CONNECTIONS,
+        comparison_cache_size=0,
+        comparison_cache_ttl=DEFAULT_CACHE_TTL,
+        upload_compression=None,
+        json_backend=None,
+        instrumentation=None,
+        timeouts=None,
+        max_retries=0,
+        latency_tracker=None,
+    ):
+        # type: (str, str, Optional[str], int, int, timedelta, Optional[Union[str, UploadCompression]], Optional[str], Optional[Instrumentation], Optional[Timeouts], int, Optional[LatencyTracker]) -> None
+        if isinstance(upload_compression, str):
+            upload_compression = UploadCompression(upload_compression)
+        self.__client = RESTClient(
+            account_id,
+            auth_token,
+            max_connections,
+            upload_compression,
+            json_backend,
+            instrumentation,
+            timeouts,
+            max_retries,
+        )
         self.__base_url = Url(base_url or PRODUCTION_CLOUD_BASE_URL)
-        self.comparisons = ComparisonsEndpoint(self.__client, self.__base_url)
-        self.exports = ExportsEndpoint(self.__client, self.__base_url)
+        self.comparisons = ComparisonsEndpoint(
+            self.__client,
+            self.__base_url,
+            cache_size=comparison_cache_size,
+            cache_ttl=comparison_cache_ttl,
+            latency_tracker=latency_tracker,
+        )
+        self.exports = ExportsEndpoint(
+            self.__client, self.__base_url, latency_tracker=latency_tracker
+        )
+        self.__latency_tracker = latency_tracker
 
     @property
     def account_id(self):
@@ -34,6 +86,17 @@ class Client(object):
         # type: () -> str
         return str(self.__base_url)
 
+    @property
+    def transport_stats(self):
+        # type: () -> TransportStats
+        """Totals of the time spent waiting for and decoding the API's responses."""
+        return self.__client.stats
+
+    @property
+    def latency_tracker(self):
+        # type: () -> Optional[LatencyTracker]
+        return self.__latency_tracker
+
     @property
     def verify_ssl(self):
         # type: () -> bool
@@ -44,6 +107,61 @@ class Client(object):
         # type: (bool) -> None
         self.__client.verify_ssl = v
 
+    def compare_and_export(
+        self,
+        left,  # type: Union[str, FileSide, URLSide]
+        right,  # type: Union[str, FileSide, URLSide]
+        kind="single_page",  # type: str
+        dest=None,  # type: Optional[Union[str, BinaryIO]]
+        include_cover_page=False,  # type: bool
+        poll_interval=DEFAULT_POLL_INTERVAL,  # type: float
+        timeout=None,  # type: Optional[float]
+        **kwargs,  # type: Any
+    ):
+        # type: (...) -> Export
+        """Creates a comparison, exports it once ready, and downloads the export.
+
+        :param left: as for `comparisons.create`.
+        :param right: as for `comparisons.create`.
+        :param kind: the kind of export, as for `exports.create`.
+        :param dest: a file path or writable binary stream to download the export
+            to, or None to skip downloading it.
+        :param include_cover_page: as for `exports.create`.
+        :param poll_interval: the number of seconds to wait between status requests.
+        :param timeout: the maximum number of seconds to wait for each of the
+            comparison and export to be ready, or None to wait forever.
+        :param kwargs: additional arguments for `PipelineJob`, i.e. for
+            `comparisons.create` and a `cancellation` token for the whole job.
+        :return: the ready export
+        """
+        job = PipelineJob(
+            left,
+            right,
+            dest,
+            kind=kind,
+            include_cover_page=include_cover_page,
+            **kwargs,
+        )
+        with ComparePipeline(
+            self, 1, 1, 1, 1, poll_interval=poll_interval, timeout=timeout
+        ) as pipeline:
+            result = pipeline.submit(job).result()
+        if result.error is not None:
+            raise result.error
+        return result.export
+
+    def compare_and_export_many(self, jobs, **kwargs):
+        # type: (Iterable[PipelineJob], Any) -> Iterator[PipelineResult]
+        """Runs many compare and export jobs concurrently, overlapping their stages.
+
+        :param jobs: the jobs to run.
+        :param kwargs: arguments for `ComparePipeline`, such as the concurrency of
+            each stage (`max_uploads`, `max_polls`, `max_exports`, `max_downloads`).
+        :return: an iterator of results, in the order that jobs finish
+        """
+        with ComparePipeline(self, **kwargs) as pipeline:
+            yield from pipeline.run(jobs)
+
     def __repr__(self):
         # type: () -> str
         return (
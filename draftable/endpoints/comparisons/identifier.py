@@ -1,13 +1,129 @@
-import random
+import math
+import secrets
 import string
+import time
+
+from ..exceptions import InvalidArgument
+from ..validation import _MAX_ID_LENGTH
+
+try:
+    from typing import List
+except ImportError:
+    pass
 
 # Constants for generating random unique (with high probability) identifiers:
 _RANDOM_ID_LENGTH = 12
-_RANDOM_ID_CHARSET = string.ascii_letters
+# Uppercase letters sort before lowercase letters in ASCII, so in this order the
+# alphabet can also encode time-sortable prefixes.
+_RANDOM_ID_CHARSET = string.ascii_uppercase + string.ascii_lowercase
+
+# Random bytes are mapped to characters by translation, rejecting bytes which would
+# otherwise bias the result towards the start of the alphabet.
+_ACCEPTED_BYTES = 256 - 256 % len(_RANDOM_ID_CHARSET)
+_BYTE_TO_CHARACTER = bytes.maketrans(
+    bytes(range(_ACCEPTED_BYTES)),
+    (_RANDOM_ID_CHARSET * (_ACCEPTED_BYTES // len(_RANDOM_ID_CHARSET))).encode("ascii"),
+)
+_REJECTED_BYTES = bytes(range(_ACCEPTED_BYTES, 256))
+
+# Time-sortable identifiers are prefixed with the number of milliseconds since the
+# epoch, which fits in 8 characters until the year 3664.
+_TIMESTAMP_LENGTH = 8
+
+
+def _random_characters(count):
+    # type: (int) -> str
+    characters = b""
+    while len(characters) < count:
+        needed = count - len(characters)
+        # Request a few more bytes than expected to be needed to usually avoid a
+        # second round.
+        extra = needed * (256 - _ACCEPTED_BYTES) // _ACCEPTED_BYTES + 16
+        characters += secrets.token_bytes(needed + extra).translate(
+            _BYTE_TO_CHARACTER, _REJECTED_BYTES
+        )
+    return characters[:count].decode("ascii")
 
 
-def generate_identifier():
+def _timestamp_prefix():
     # type: () -> str
-    return "".join(
-        random.choice(_RANDOM_ID_CHARSET) for _ in range(_RANDOM_ID_LENGTH)  # nosec
-    )
+    milliseconds = time.time_ns() // 1_000_000
+    base = len(_RANDOM_ID_CHARSET)
+    digits = []
+    for _ in range(_TIMESTAMP_LENGTH):
+        milliseconds, digit = divmod(milliseconds, base)
+        digits.append(_RANDOM_ID_CHARSET[digit])
+    return "".join(reversed(digits))
+
+
+def _random_length(length, sortable):
+    # type: (int, bool) -> int
+    minimum = _TIMESTAMP_LENGTH + 1 if sortable else 1
+    if not isinstance(length, int) or not minimum <= length <= _MAX_ID_LENGTH:
+        raise InvalidArgument(
+            "length",
+            f"`length` must be an integer between {minimum} and {_MAX_ID_LENGTH}.",
+        )
+    return length - _TIMESTAMP_LENGTH if sortable else length
+
+
+def generate_identifier(length=_RANDOM_ID_LENGTH, sortable=False):
+    # type: (int, bool) -> str
+    """Generates a random unique (with high probability) comparison identifier.
+
+    :param length: the length of the identifier
+    :param sortable: if True, the identifier is prefixed with the current time, so
+        that identifiers sort in the order they were generated (to the millisecond)
+    """
+    return generate_identifiers(1, length, sortable)[0]
+
+
+def generate_identifiers(count, length=_RANDOM_ID_LENGTH, sortable=False):
+    # type: (int, int, bool) -> List[str]
+    """Generates many random unique (with high probability) comparison identifiers.
+
+    This is much faster than calling `generate_identifier` repeatedly. Use
+    `collision_probability` to choose a `length` for the number of identifiers needed.
+
+    :param count: the number of identifiers to generate
+    :param length: as for `generate_identifier`
+    :param sortable: as for `generate_identifier`
+    """
+    random_length = _random_length(length, sortable)
+    if not isinstance(count, int) or count < 0:
+        raise InvalidArgument("count", "`count` must be a non-negative integer.")
+
+    characters = _random_characters(count * random_length)
+    identifiers = [
+        characters[i : i + random_length]
+        for i in range(0, len(characters), random_length)
+    ]
+    if sortable:
+        prefix = _timestamp_prefix()
+        identifiers = [prefix + identifier for identifier in identifiers]
+    return identifiers
+
+
+def collision_probability(count, length=_RANDOM_ID_LENGTH, sortable=False):
+    # type: (int, int, bool) -> float
+    """Estimates the probability of any two of `count` generated identifiers being
+    equal.
+
+    For time-sortable identifiers only identifiers generated in the same millisecond
+    can collide, so this is an upper bound which assumes they all were.
+
+    :param count: the number of identifiers
+    :param length: as for `generate_identifier`
+    :param sortable: as for `generate_identifier`
+    """
+    random_length = _random_length(length, sortable)
+    if not isinstance(count, int) or count < 0:
+        raise InvalidArgument("count", "`count` must be a non-negative integer.")
+
+    # The birthday bound: 1 - exp(-n(n - 1) / 2N) for N possible identifiers,
+    # computed in log space as N can be far too large for a float.
+    pairs = count * (count - 1) // 2
+    if not pairs:
+        return 0.0
+    exponent = math.log(pairs) - random_length * math.log(len(_RANDOM_ID_CHARSET))
+    return -math.expm1(-math.exp(exponent))
@@ -0,0 +1,144 @@
+from ...utilities.timestamp import parse_datetime
+
+try:
+    from typing import Any, Dict, Iterable, List
+except ImportError:
+    pass
+
+
+# The columns of an inventory, in order, with their Arrow types.
+COLUMNS = (
+    ("identifier", "string"),
+    ("left_file_type", "string"),
+    ("right_file_type", "string"),
+    ("left_display_name", "string"),
+    ("right_display_name", "string"),
+    ("left_source_url", "string"),
+    ("right_source_url", "string"),
+    ("public", "bool"),
+    ("creation_time", "timestamp"),
+    ("expiry_time", "timestamp"),
+    ("ready", "bool"),
+    ("ready_time", "timestamp"),
+    ("ready_seconds", "float64"),
+    ("failed", "bool"),
+    ("error_message", "string"),
+)
+
+
+class ComparisonInventory(object):
+    """A table of comparisons, stored as a list of values for each column.
+
+    The columns are those of `Comparison`, with each side's properties in
+    `left_...` and `right_...` columns, and `ready_seconds`: the number of seconds
+    between a comparison's creation and it becoming ready, or None if it isn't
+    ready. Timestamps are timezone aware datetimes in UTC, and missing values are
+    None.
+    """
+
+    def __init__(self, columns):
+        # type: (Dict[str, List[Any]]) -> None
+        """
+        :param columns: a list of values for each column named in `COLUMNS`, all
+            of the same length
+        """
+        lengths = {len(columns[name]) for name, _ in COLUMNS}
+        if len(lengths) > 1:
+            raise ValueError("The columns of an inventory must be the same length.")
+        self.__columns = {name: columns[name] for name, _ in COLUMNS}
+
+    @classmethod
+    def from_results(cls, results):
+        # type: (Iterable[dict]) -> ComparisonInventory
+        """Builds an inventory from the results of listing comparisons, as returned
+        by the API, without creating a `Comparison` for each.
+        """
+        rows = []
+        for data in results:
+            left = data["left"]
+            right = data["right"]
+            creation_time = parse_datetime(data["creation_time"])
+            expiry_time = data.get("expiry_time")
+            ready_time = data.get("ready_time")
+            ready_seconds = None
+            if ready_time:
+                ready_time = parse_datetime(ready_time)
+                ready_seconds = (ready_time - creation_time).total_seconds()
+            # In the order of COLUMNS.
+            rows.append(
+                (
+                    str(data["identifier"]),
+                    left["file_type"],
+                    right["file_type"],
+                    left.get("display_name"),
+                    right.get("display_name"),
+                    left.get("source_url"),
+                    right.get("source_url"),
+                    data.get("public", False),
+                    creation_time,
+                    parse_datetime(expiry_time) if expiry_time else None,
+                    data.get("ready"),
+                    ready_time or None,
+                    ready_seconds,
+                    data.get("failed"),
+                    data.get("error_message"),
+                )
+            )
+
+        # Transposes the rows into columns.
+        values = list(map(list, zip(*rows))) or [[] for _ in COLUMNS]
+        return cls({name: column for (name, _), column in zip(COLUMNS, values)})
+
+    @property
+    def columns(self):
+        # type: () -> List[str]
+        """The names of the columns, in order."""
+        return list(self.__columns)
+
+    def __getitem__(self, name):
+        # type: (str) -> List[Any]
+        """Returns the values of a column. The list mustn't be modified."""
+        return self.__columns[name]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.__columns["identifier"])
+
+    def to_dict(self):
+        # type: () -> Dict[str, List[Any]]
+        """Returns a dictionary of a (new) list of values for each column."""
+        return {name: list(values) for name, values in self.__columns.items()}
+
+    def to_pandas(self):
+        # type: () -> Any
+        """Returns the inventory as a `pandas.DataFrame`. Requires pandas."""
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError("ComparisonInventory.to_pandas requires pandas.")
+        frame = pandas.DataFrame(self.__columns, columns=self.columns)
+        for name, kind in COLUMNS:
+            if kind == "timestamp":
+                # Columns which are all None aren't otherwise recognised as times.
+                frame[name] = pandas.to_datetime(frame[name], utc=True)
+        return frame
+
+    def to_arrow(self):
+        # type: () -> Any
+        """Returns the inventory as a `pyarrow.Table`. Requires pyarrow."""
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("ComparisonInventory.to_arrow requires pyarrow.")
+        types = {
+            "string": pyarrow.string(),
+            "bool": pyarrow.bool_(),
+            "float64": pyarrow.float64(),
+            "timestamp": pyarrow.timestamp("us", tz="UTC"),
+        }
+        schema = pyarrow.schema([(name, types[kind]) for name, kind in COLUMNS])
+        return pyarrow.Table.from_pydict(self.__columns, schema=schema)
+
+    def __repr__(self):
+        # type: () -> str
+        return f"ComparisonInventory(<{len(self)} comparisons>)"
@@ -1,3 +1,6 @@
+import mmap
+import os
+from contextlib import ExitStack, contextmanager
 from os.path import basename, isfile, join, splitext
 
 # urllib3 is a required dependency of requests
@@ -5,9 +8,10 @@ from urllib3.util import parse_url
 
 from .. import validation
 from ..exceptions import InvalidArgument, InvalidPath
+from . import filetypes
 
 try:
-    from typing import Any, Optional, Union
+    from typing import Any, BinaryIO, Iterator, Optional, Union
 except ImportError:
     pass
 
@@ -18,6 +22,21 @@ class Side(object):
         self.__file_type = validation.validate_file_type(file_type)
         self.__display_name = None if display_name is None else str(display_name)
 
+    def __enter__(self):
+        # type: () -> Side
+        return self
+
+    def __exit__(self, *exc_info):
+        # type: (Any) -> None
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        """Releases any resources held by the side.
+
+        Sides may also be used as context managers, which close them on exit.
+        """
+
     @property
     def file_type(self):
         # type: () -> str
@@ -30,18 +49,152 @@ class Side(object):
 
 
 class FileSide(Side):
-    def __init__(self, file, file_type, display_name=None):
-        # type: (Any, str, Optional[str]) -> None
-        self.__file = validation.validate_file(file)
+    def __init__(self, file, file_type, display_name=None, memory_map=False):
+        # type: (Any, Optional[str], Optional[str], bool) -> None
+        """
+        :param file: the content to upload: a file object opened for reading in binary
+            mode, the path of a file, or a bytes-like object (e.g. `bytes`, a
+            `memoryview` or an `mmap.mmap`), which is uploaded without being copied
+        :param file_type: a string like "pdf", "docx", etc, or "guess" (or None) to
+            detect it from the file's content, or failing that, its name
+        :param display_name: the name of the file shown in the comparison viewer
+        :param memory_map: if True and `file` is a path, the file is memory-mapped
+            while it's uploaded, rather than being read. If parts of the mapping are
+            still referenced afterwards (e.g. by the traceback of a failed upload),
+            it's closed once they're garbage collected.
+        """
+        self.__path = None  # type: Optional[str]
+        self.__file = None  # type: Any
+        # The bytes-like object given to the side, and the side's view of it.
+        self.__source = None  # type: Any
+        self.__source_size = 0
+        self.__buffer = None  # type: Optional[memoryview]
+        self.__memory_map = bool(memory_map)
+
+        if isinstance(file, (str, os.PathLike)):
+            self.__path = validation.validate_file_path(file)
+        elif isinstance(file, (bytes, bytearray, memoryview, mmap.mmap)):
+            self.__buffer = validation.validate_buffer(file)
+            self.__source = file
+            self.__source_size = self.__buffer.nbytes
+        else:
+            self.__file = validation.validate_file(file)
+
+        if file_type is None or file_type == "guess":
+            file_type = self.__guess_file_type()
+            if not file_type:
+                raise InvalidArgument(
+                    "file_type",
+                    "Unable to detect the file type from the file's content or name. "
+                    "`file_type` must be specified.",
+                )
         super().__init__(file_type=file_type, display_name=display_name)
 
     @property
     def file(self):
         # type: () -> Any
+        """The file object to upload, or None if the side's content is a buffer.
+
+        For sides created from a path, the file is opened when this is first accessed
+        and remains open until the side is closed. Prefer `open()`, which only keeps
+        the file open while it's needed.
+        """
+        if self.__file is None and self.__path is not None:
+            self.__file = open(self.__path, "rb")
         return self.__file
 
+    @property
+    def path(self):
+        # type: () -> Optional[str]
+        return self.__path
+
+    @property
+    def buffer(self):
+        # type: () -> Optional[memoryview]
+        """A view of the content to upload, or None if the side's content is a file.
+
+        The view is released when the side is closed, and acquired again when this
+        is next accessed.
+        """
+        if self.__buffer is None and self.__source is not None:
+            self.__buffer = validation.validate_buffer(self.__source)
+        return self.__buffer
+
+    @contextmanager
+    def open(self):
+        # type: () -> Iterator[Union[BinaryIO, memoryview]]
+        """Provides the content to upload, as a file object or a memoryview.
+
+        Files opened (or memory-mapped) from a path are closed on exiting the context,
+        so the side can be uploaded again, including concurrently.
+        """
+        if self.__source is not None:
+            yield self.buffer
+        elif self.__path is None:
+            yield self.__file
+        else:
+            with open(self.__path, "rb") as file:
+                if not self.__memory_map:
+                    yield file
+                    return
+                with _memory_map(file) as view:
+                    yield view
+
+    def close(self):
+        # type: () -> None
+        """Closes the file opened for `file` if the side was created from a path, and
+        releases the side's view of its buffer. Files and buffers given to the side
+        aren't closed, and the side can still be used afterwards, in which case the
+        file is opened (or the view acquired) again.
+        """
+        if self.__path is not None and self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        if self.__buffer is not None:
+            # Allows a memory-mapped file given to the side to be closed.
+            self.__buffer.release()
+            self.__buffer = None
+
+    def __guess_file_type(self):
+        # type: () -> Optional[str]
+        if self.__source is not None:
+            return filetypes.sniff_buffer(self.__buffer)
+        if self.__path is not None:
+            with open(self.__path, "rb") as file:
+                return guess_file_type(file)
+        return guess_file_type(self.__file)
+
     def __str__(self):
-        return f"File side: {self.__file} ({self.file_type}, '{self.display_name}')"
+        if self.__path is not None:
+            source = self.__path
+        elif self.__source is not None:
+            source = f"<{self.__source_size} bytes>"
+        else:
+            source = self.__file
+        return f"File side: {source} ({self.file_type}, '{self.display_name}')"
+
+
+@contextmanager
+def _memory_map(file):
+    # type: (BinaryIO) -> Iterator[Union[BinaryIO, memoryview]]
+    try:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files can't be memory-mapped.
+        yield file
+        return
+
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # Slices of the view are still referenced (e.g. by a failed request's
+            # body), so the mapping is closed once they're garbage collected.
+            pass
 
 
 class URLSide(Side):
@@ -69,6 +222,29 @@ def data_from_side(side_name, side):
         # User has provided a file path or URL.
         side = make_side(side)
 
+    content = None
+    if isinstance(side, FileSide):
+        content = side.buffer if side.buffer is not None else side.file
+    return _side_data(side_name, side, content)
+
+
+@contextmanager
+def open_side_data(side_name, side):
+    # type: (str, Union[str, FileSide, URLSide]) -> Iterator[dict]
+    """As `data_from_side`, but files are only open within the context, and sides
+    created from strings are closed on exit.
+    """
+    with ExitStack() as stack:
+        if isinstance(side, str):
+            side = stack.enter_context(make_side(side))
+        content = None
+        if isinstance(side, FileSide):
+            content = stack.enter_context(side.open())
+        yield _side_data(side_name, side, content)
+
+
+def _side_data(side_name, side, content):
+    # type: (str, Side, Any) -> dict
     data = {
         "file_type": side.file_type,
     }
@@ -81,7 +257,7 @@ def data_from_side(side_name, side):
         assert isinstance(side, FileSide)
         data["file"] = (
             f"{side_name}.{side.file_type}",
-            side.file,
+            content,
             join("application", "octet-stream"),
         )
     return data
@@ -93,30 +269,29 @@ def side_from_url(url, file_type, display_name=None):
 
 
 def side_from_file(file_obj, file_type, display_name=None):
-    # type: (Any, str, Optional[str]) -> FileSide
+    # type: (Any, Optional[str], Optional[str]) -> FileSide
     return FileSide(file_obj, file_type, display_name)
 
 
-def side_from_file_path(file_path, file_type=None, display_name=None):
-    should_guess = file_type is None or file_type == "guess"
-    if should_guess:
-        file_type = guess_file_type_from_path(file_path)
+def side_from_file_path(file_path, file_type=None, display_name=None, memory_map=False):
+    # type: (str, Optional[str], Optional[str], bool) -> FileSide
     display_name = display_name or basename(file_path)
-
-    # TODO: make sure this closes the file handle
-    return FileSide(open(file_path, "rb"), file_type, display_name)
+    # The file is only opened while it's uploaded.
+    return FileSide(file_path, file_type, display_name, memory_map)
 
 
-def make_side(url_or_file_path, file_type=None, display_name=None):
-    # type: (str, Optional[str], Optional[str]) -> Side
+def make_side(url_or_file_path, file_type=None, display_name=None, sniff_url=False):
+    # type: (str, Optional[str], Optional[str], bool) -> Side
     """
     Parsing the URL or file path and looking for the file extension is "ok"
-    but works only based on human conventions. The more industrial strength
-    approach is to read the beginning of the file or URL and determine the
-    type unambiguously from the content.
+    but works only based on human conventions, so the type of a file is detected
+    from its content where possible, falling back to its extension. The content of
+    a URL is only inspected if `sniff_url` is True.
 
     :param url_or_file_path: a URL or file path to compare.
     :param file_type: a string like "pdf", "docx", etc, or "guess" (or None) to detect.
+    :param sniff_url: if True, and `file_type` is to be detected, the start of the
+        content at a URL is downloaded to detect its type.
     :return: a Side object
     """
     guess_type = file_type is None or file_type == "guess"
@@ -126,7 +301,9 @@ def make_side(url_or_file_path, file_type=None, display_name=None):
             url_or_file_path
         )  # parse to get the path component on its own, without query string
         if guess_type:
-            file_type = guess_file_type_from_path(url.path)
+            file_type = (
+                sniff_url and filetypes.sniff_url(url.url)
+            ) or guess_file_type_from_path(url.path)
             if not file_type:
                 raise InvalidArgument(
                     "file_type",
@@ -158,6 +335,19 @@ def make_side(url_or_file_path, file_type=None, display_name=None):
     )
 
 
+def guess_file_type(file):
+    # type: (Any) -> Optional[str]
+    """Guesses the type of an open binary file from its content, falling back to the
+    extension of its name. The file's position is left unchanged.
+    """
+    file_type = filetypes.sniff_file(file)
+    if not file_type:
+        name = getattr(file, "name", None)
+        if isinstance(name, str):
+            file_type = guess_file_type_from_path(name)
+    return file_type
+
+
 def guess_file_type_from_path(path):
     _, file_type = splitext(path)
     return file_type.strip(".").lower()
@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from . import comparison as comparison_module
+from .comparison import Comparison, ComparisonSide, comparison_from_response
+
+DATA = {
+    "identifier": "abc",
+    "left": {"file_type": "pdf", "display_name": "left.pdf"},
+    "right": {"file_type": "docx", "source_url": "https://example.com/right.docx"},
+    "public": True,
+    "creation_time": "2024-05-17T08:21:43.123456Z",
+    "expiry_time": "2024-06-17T08:21:43Z",
+    "ready": True,
+    "ready_time": "2024-05-17T08:22:01Z",
+    "failed": False,
+}
+
+
+def test_comparison_from_response():
+    comparison = comparison_from_response(DATA)
+    assert comparison.identifier == "abc"
+    assert comparison.public and comparison.ready and not comparison.failed
+    assert comparison.left.file_type == "pdf"
+    assert comparison.left.display_name == "left.pdf"
+    assert comparison.right.source_url == "https://example.com/right.docx"
+    assert comparison.creation_time == datetime(
+        2024, 5, 17, 8, 21, 43, 123456, timezone.utc
+    )
+    assert comparison.expiry_time == datetime(2024, 6, 17, 8, 21, 43, 0, timezone.utc)
+    assert comparison.ready_time == datetime(2024, 5, 17, 8, 22, 1, 0, timezone.utc)
+    assert comparison.error_message is None
+
+
+def test_optional_fields():
+    data = {key: DATA[key] for key in ("identifier", "left", "right", "creation_time")}
+    comparison = comparison_from_response(data)
+    assert comparison.expiry_time is None
+    assert comparison.ready_time is None
+    assert comparison.public is False
+
+
+def test_lazy_conversion(monkeypatch):
+    parsed = []
+
+    def parse_datetime(value):
+        parsed.append(value)
+        return datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(comparison_module, "parse_datetime", parse_datetime)
+    comparison = comparison_from_response(DATA)
+    assert comparison.identifier == "abc" and comparison.ready
+    assert parsed == []
+
+    # Converted once, on first access.
+    assert comparison.creation_time is comparison.creation_time
+    assert parsed == [DATA["creation_time"]]
+    assert comparison.left is comparison.left
+    assert isinstance(comparison.left, ComparisonSide)
+    assert "expiry_time=datetime" in repr(comparison)
+    assert len(parsed) == 3
+
+
+def test_slots():
+    comparison = comparison_from_response(DATA)
+    with pytest.raises(AttributeError):
+        comparison.extra = 1
+    with pytest.raises(AttributeError):
+        comparison.left.extra = 1
+
+
+def test_constructed_with_datetimes():
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    side = ComparisonSide("pdf", None, None)
+    comparison = Comparison(
+        "abc", side, side, False, created, None, False, None, False, None
+    )
+    assert comparison.creation_time is created
+    assert comparison.left is side
+    assert "creation_time=2024-01-01T00:00:00Z" in str(comparison)
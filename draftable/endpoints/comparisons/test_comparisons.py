@@ -0,0 +1,80 @@
+from draftable.utilities import Url
+
+from .comparisons import ComparisonsEndpoint
+
+
+def _comparison_data(identifier, ready):
+    return {
+        "identifier": identifier,
+        "left": {"file_type": "pdf"},
+        "right": {"file_type": "pdf"},
+        "creation_time": "2024-01-01T00:00:00Z",
+        "ready": ready,
+    }
+
+
+class _ConditionalClient(object):
+    """Serves a single comparison, honouring entity tags."""
+
+    def __init__(self, ready=False):
+        self.data = _comparison_data("abc", ready)
+        self.etag = '"1"'
+        self.requests = []
+
+    def get(
+        self, url, parameters=None, operation="read", deadline=None, cancellation=None
+    ):
+        self.requests.append((str(url), None))
+        return self.data
+
+    def get_conditional(self, url, etag=None, deadline=None, cancellation=None):
+        self.requests.append((str(url), etag))
+        if etag == self.etag:
+            return None, etag
+        return self.data, self.etag
+
+    def delete(self, url, deadline=None, cancellation=None):
+        self.requests.append((str(url), "DELETE"))
+
+
+def test_get_uncached():
+    client = _ConditionalClient(ready=True)
+    endpoint = ComparisonsEndpoint(client, Url("http://api"))
+    assert endpoint.get("abc").identifier == "abc"
+    assert endpoint.get("abc").identifier == "abc"
+    assert client.requests == [("http://api/comparisons/abc", None)] * 2
+
+
+def test_get_cached_ready_skips_network():
+    client = _ConditionalClient(ready=True)
+    endpoint = ComparisonsEndpoint(client, Url("http://api"), cache_size=10)
+    first = endpoint.get("abc")
+    assert endpoint.get("abc") is first
+    assert len(client.requests) == 1
+
+    endpoint.clear_cache()
+    endpoint.get("abc")
+    assert len(client.requests) == 2
+
+
+def test_get_cached_not_ready_revalidates():
+    client = _ConditionalClient(ready=False)
+    endpoint = ComparisonsEndpoint(client, Url("http://api"), cache_size=10)
+    first = endpoint.get("abc")
+    assert endpoint.get("abc") is first
+    assert client.requests[-1] == ("http://api/comparisons/abc", '"1"')
+
+    client.data = _comparison_data("abc", ready=True)
+    client.etag = '"2"'
+    assert endpoint.get("abc").ready
+    assert endpoint.get("abc").ready
+    assert len(client.requests) == 3
+
+
+def test_delete_invalidates_cache():
+    client = _ConditionalClient(ready=True)
+    endpoint = ComparisonsEndpoint(client, Url("http://api"), cache_size=10)
+    endpoint.get("abc")
+    endpoint.delete("abc")
+    endpoint.get("abc")
+    assert [etag for _, etag in client.requests] == [None, "DELETE", None]
@@ -0,0 +1,167 @@
+import io
+import struct
+import zipfile
+
+import pytest
+import requests
+
+from draftable.endpoints.exceptions import InvalidArgument
+
+from .filetypes import SNIFF_SIZE, sniff_file, sniff_file_type, sniff_url
+from .sides import FileSide, make_side
+
+_CONTENT_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml"
+    ".document.main+xml",
+    "docm": "application/vnd.ms-word.document.macroEnabled.main+xml",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml"
+    ".presentation.main+xml",
+    "pptm": "application/vnd.ms-powerpoint.presentation.macroEnabled.main+xml",
+}
+
+
+def _ooxml(file_type, compression=zipfile.ZIP_DEFLATED, padding=0):
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        f'<Override PartName="/word/document.xml" '
+        f'ContentType="{_CONTENT_TYPES[file_type]}"/>'
+        "</Types>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        archive.writestr("[Content_Types].xml", " " * padding + content_types)
+        archive.writestr("word/document.xml", "<document/>" * 1000)
+    return buffer.getvalue()
+
+
+def _ole2(stream_name, directory_sector=0):
+    header = bytearray(512)
+    header[:8] = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+    struct.pack_into("<H", header, 30, 9)
+    struct.pack_into("<I", header, 48, directory_sector)
+    sectors = bytearray(512 * (directory_sector + 1))
+    entry = "Root Entry".encode("utf-16-le") + stream_name.encode("utf-16-le")
+    sectors[-512 : -512 + len(entry)] = entry
+    return bytes(header + sectors)
+
+
+@pytest.mark.parametrize("file_type", sorted(_CONTENT_TYPES))
+def test_sniff_ooxml(file_type):
+    assert sniff_file_type(_ooxml(file_type)) == file_type
+    assert sniff_file_type(_ooxml(file_type, zipfile.ZIP_STORED)) == file_type
+
+
+def test_sniff_ooxml_truncated():
+    # [Content_Types].xml extends beyond the header, but is detected from its start.
+    data = _ooxml("pptx", zipfile.ZIP_STORED, padding=SNIFF_SIZE)
+    assert sniff_file_type(data[:SNIFF_SIZE]) is None
+    data = _ooxml("pptx", zipfile.ZIP_STORED)
+    assert sniff_file_type(data[:SNIFF_SIZE]) == "pptx"
+
+
+def test_sniff_other_zip():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("hello.txt", "hello")
+    assert sniff_file_type(buffer.getvalue()) is None
+
+
+def test_sniff_ole2():
+    assert sniff_file_type(_ole2("WordDocument")) == "doc"
+    assert sniff_file_type(_ole2("PowerPoint Document")) == "ppt"
+    assert sniff_file_type(_ole2("Workbook")) is None
+
+    # The directory is beyond the header, so must be read separately.
+    data = _ole2("WordDocument", directory_sector=20)
+    assert sniff_file_type(data[:SNIFF_SIZE]) is None
+    assert sniff_file(io.BufferedReader(io.BytesIO(data))) == "doc"
+
+
+def test_sniff_other_types():
+    assert sniff_file_type(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n") == "pdf"
+    assert sniff_file_type(b"\r\n%PDF-1.4\n") == "pdf"
+    assert sniff_file_type(b"{\\rtf1\\ansi\\deff0") == "rtf"
+    assert sniff_file_type("Hello, wörld".encode("utf-8")) == "txt"
+    assert sniff_file_type("Hello".encode("utf-16")) == "txt"
+    # Truncated part way through a multi-byte character.
+    assert sniff_file_type("wörld".encode("utf-8")[:2]) == "txt"
+    assert sniff_file_type(b"\x89PNG\r\n\x1a\n\x00\x00") is None
+    assert sniff_file_type(b"\xc3\x28 invalid UTF-8") is None
+    assert sniff_file_type(b"") is None
+
+
+def test_sniff_file_rewinds():
+    file = io.BytesIO(b"prefix" + _ooxml("docx"))
+    file.seek(6)
+    assert sniff_file(file) == "docx"
+    assert file.tell() == 6
+
+
+def test_file_side_guesses_from_content(tmp_path):
+    # A mislabelled file is detected from its content.
+    path = tmp_path / "mislabelled.doc"
+    path.write_bytes(_ooxml("docx"))
+    side = make_side(str(path))
+    assert side.file_type == "docx"
+    assert side.file.tell() == 0
+    side.file.close()
+
+    # A file without an extension is detected from its content.
+    path = tmp_path / "document"
+    path.write_bytes(b"%PDF-1.4\n")
+    with open(path, "rb") as file:
+        assert FileSide(file, "guess").file_type == "pdf"
+
+    # An explicit file type is used as given.
+    with open(path, "rb") as file:
+        assert FileSide(file, "docx").file_type == "docx"
+
+    path = tmp_path / "unknown"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00")
+    with pytest.raises(InvalidArgument):
+        make_side(str(path))
+
+
+class _Raw(object):
+    def __init__(self, content):
+        self.content = content
+
+    def read(self, size, decode_content=False):
+        return self.content[:size]
+
+
+class _Response(object):
+    def __init__(self, content, status_code):
+        self.raw = _Raw(content)
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+
+class _Session(object):
+    def __init__(self, content, status_code=206):
+        self.content = content
+        self.status_code = status_code
+        self.headers = None
+
+    def get(self, url, headers, stream, timeout):
+        self.headers = headers
+        return _Response(self.content, self.status_code)
+
+
+def test_sniff_url():
+    session = _Session(_ooxml("docm"))
+    assert sniff_url("https://example.com/file", session=session) == "docm"
+    assert session.headers == {"Range": f"bytes=0-{SNIFF_SIZE - 1}"}
+
+    assert sniff_url("https://example.com/file", session=_Session(b"", 404)) is None
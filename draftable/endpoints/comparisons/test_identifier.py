@@ -0,0 +1,58 @@
+import string
+from collections import Counter
+
+import pytest
+
+from ..exceptions import InvalidArgument
+from ..validation import validate_identifiers
+from .identifier import collision_probability, generate_identifier, generate_identifiers
+
+
+def test_generate_identifier():
+    identifier = generate_identifier()
+    assert len(identifier) == 12
+    assert set(identifier) <= set(string.ascii_letters)
+    assert len(generate_identifier(length=40)) == 40
+
+
+def test_generate_identifiers():
+    identifiers = generate_identifiers(10_000, length=8)
+    assert len(identifiers) == 10_000
+    assert all(len(identifier) == 8 for identifier in identifiers)
+    assert validate_identifiers(identifiers) == identifiers
+    assert generate_identifiers(0) == []
+
+
+def test_generate_identifiers_is_unbiased():
+    counts = Counter("".join(generate_identifiers(10_000, length=52)))
+    expected = 10_000
+    # Each letter should appear 10,000 times, give or take ~100.
+    assert all(abs(counts[c] - expected) < 1000 for c in string.ascii_letters)
+
+
+def test_generate_identifiers_sortable():
+    earlier = generate_identifiers(100, length=16, sortable=True)
+    later = generate_identifier(length=16, sortable=True)
+    assert all(len(identifier) == 16 for identifier in earlier)
+    assert len({identifier[:8] for identifier in earlier}) == 1
+    assert earlier[0][:8] <= later[:8]
+
+
+@pytest.mark.parametrize(
+    "length, sortable", [(0, False), (1025, False), (8, True), ("12", False)]
+)
+def test_generate_identifiers_invalid_length(length, sortable):
+    with pytest.raises(InvalidArgument):
+        generate_identifiers(1, length, sortable)
+
+
+def test_collision_probability():
+    assert collision_probability(0) == 0.0
+    assert collision_probability(1) == 0.0
+    assert collision_probability(53, length=1) == pytest.approx(1.0)
+    # ~1.3e-9 for a million identifiers of 12 random letters.
+    assert 1e-9 < collision_probability(1_000_000) < 1e-8
+    assert collision_probability(1_000_000, length=20, sortable=True) == (
+        collision_probability(1_000_000, length=12)
+    )
+    assert collision_probability(10, length=1024) == 0.0
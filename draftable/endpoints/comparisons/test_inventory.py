@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from draftable.utilities import Url
+
+from .comparisons import ComparisonsEndpoint
+from .inventory import COLUMNS, ComparisonInventory
+
+
+def _comparison_data(n, ready=True, failed=False):
+    data = {
+        "identifier": f"id{n}",
+        "left": {"file_type": "pdf", "display_name": f"left{n}.pdf"},
+        "right": {"file_type": "docx", "source_url": "https://example.com/r.docx"},
+        "creation_time": f"2024-01-{n + 1:02d}T00:00:00Z",
+        "ready": ready,
+        "failed": failed,
+    }
+    if ready:
+        data["ready_time"] = f"2024-01-{n + 1:02d}T00:00:{n:02d}.5Z"
+    if failed:
+        data["error_message"] = "Failed"
+    return data
+
+
+class _PagedClient(object):
+    def __init__(self, results):
+        self.results = results
+
+    def get(self, url, parameters=None, deadline=None, cancellation=None):
+        offset, limit = parameters["offset"], parameters["limit"]
+        return {
+            "count": len(self.results),
+            "results": self.results[offset : offset + limit],
+        }
+
+
+def test_from_results():
+    inventory = ComparisonInventory.from_results(
+        [_comparison_data(0), _comparison_data(1, ready=False), _comparison_data(2)]
+    )
+    assert len(inventory) == 3
+    assert inventory.columns == [name for name, _ in COLUMNS]
+    assert inventory["identifier"] == ["id0", "id1", "id2"]
+    assert inventory["left_display_name"] == ["left0.pdf", "left1.pdf", "left2.pdf"]
+    assert inventory["right_source_url"] == ["https://example.com/r.docx"] * 3
+    assert inventory["left_source_url"] == [None] * 3
+    assert inventory["creation_time"][0] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert inventory["ready"] == [True, False, True]
+    assert inventory["ready_time"][1] is None
+    assert inventory["ready_seconds"] == [0.5, None, 2.5]
+    assert inventory["expiry_time"] == [None] * 3
+
+    columns = inventory.to_dict()
+    columns["identifier"].clear()
+    assert len(inventory["identifier"]) == 3
+
+
+def test_empty():
+    inventory = ComparisonInventory.from_results([])
+    assert len(inventory) == 0
+    assert inventory.to_dict() == {name: [] for name, _ in COLUMNS}
+
+
+def test_columns_must_be_the_same_length():
+    columns = {name: [] for name, _ in COLUMNS}
+    columns["identifier"].append("abc")
+    with pytest.raises(ValueError):
+        ComparisonInventory(columns)
+
+
+def test_endpoint_inventory():
+    results = [_comparison_data(n, failed=n % 3 == 0) for n in range(7)]
+    endpoint = ComparisonsEndpoint(_PagedClient(results), Url("http://api"))
+    inventory = endpoint.inventory(page_size=3)
+    assert inventory["identifier"] == [f"id{n}" for n in range(7)]
+    assert inventory["error_message"].count("Failed") == 3
+
+    failed = endpoint.inventory(page_size=3, failed=True)
+    assert failed["identifier"] == ["id0", "id3", "id6"]
+
+
+def test_to_pandas():
+    pandas = pytest.importorskip("pandas")
+    frame = ComparisonInventory.from_results(
+        [_comparison_data(0), _comparison_data(1, ready=False)]
+    ).to_pandas()
+    assert list(frame.columns) == [name for name, _ in COLUMNS]
+    assert isinstance(frame["expiry_time"].dtype, pandas.DatetimeTZDtype)
+    assert frame["ready_seconds"].iloc[0] == 0.5
+
+
+def test_to_arrow():
+    pytest.importorskip("pyarrow")
+    table = ComparisonInventory.from_results(
+        [_comparison_data(0), _comparison_data(1, ready=False)]
+    ).to_arrow()
+    assert table.num_rows == 2
+    assert table.column("ready_seconds").to_pylist() == [0.5, None]
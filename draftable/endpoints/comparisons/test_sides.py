@@ -1,9 +1,10 @@
+import mmap
 from os.path import isfile, join
 from pathlib import Path
 
 import pytest
 
-from draftable.endpoints.exceptions import InvalidPath
+from draftable.endpoints.exceptions import InvalidArgument, InvalidPath
 
 from .sides import (
     FileSide,
@@ -12,6 +13,7 @@ from .sides import (
     data_from_side,
     guess_file_type_from_path,
     make_side,
+    open_side_data,
 )
 
 root_dir = Path(__file__).parents[3]  # HACK
@@ -144,3 +146,74 @@ def test_side_https_url_query_string():
     assert r.file_type == "docx"
     assert r.display_name == "right.docx"
     assert r.url == p
+
+
+def test_side_from_path_opens_lazily():
+    p = _get_test_file_path("hello.pdf")
+    with open(p, "rb") as f:
+        expected = f.read()
+
+    with FileSide(Path(p), "guess") as side:
+        assert side.file_type == "pdf"
+        assert side.path == p
+
+        with side.open() as content:
+            assert content.read() == expected
+        assert content.closed
+
+        file = side.file
+        assert file.read() == expected
+    assert file.closed
+
+    side = FileSide(p, "pdf", memory_map=True)
+    with side.open() as content:
+        assert isinstance(content, memoryview)
+        assert content.tobytes() == expected
+
+
+def test_side_from_buffer():
+    mapped = mmap.mmap(-1, 16)
+    mapped[:9] = b"%PDF-1.4\n"
+
+    with FileSide(mapped, None, "hello.pdf") as side:
+        assert side.file_type == "pdf"
+        assert side.file is None
+        assert side.buffer.obj is mapped
+        assert str(side) == "File side: <16 bytes> (pdf, 'hello.pdf')"
+        with side.open() as content:
+            assert content is side.buffer
+    # The side no longer prevents the mapping from being closed.
+    mapped.close()
+
+    # Closed sides can be used again.
+    side = FileSide(b"%PDF-1.4\n", "pdf")
+    for _ in range(2):
+        with side:
+            with open_side_data("left", side) as data:
+                assert data["file"][1].tobytes() == b"%PDF-1.4\n"
+    assert str(side) == "File side: <9 bytes> (pdf, 'None')"
+
+    side = FileSide(bytearray(b"{\\rtf1"), "guess")
+    assert side.file_type == "rtf"
+    assert data_from_side("left", side)["file"][1] is side.buffer
+
+    with pytest.raises(InvalidArgument):
+        FileSide(b"", "pdf")
+    with pytest.raises(InvalidArgument):
+        FileSide(memoryview(b"abcd")[::2], "pdf")
+    with pytest.raises(InvalidArgument):
+        FileSide(join("test-files", "missing.pdf"), "pdf")
+
+
+def test_open_side_data_closes_sides_it_creates():
+    p = _get_test_file_path("hello.pdf")
+    with open_side_data("left", p) as data:
+        file = data["file"][1]
+        assert data["file_type"] == "pdf"
+        assert not file.closed
+    assert file.closed
+
+    with open(p, "rb") as given:
+        with open_side_data("right", FileSide(given, "pdf")) as data:
+            assert data["file"][1] is given
+        assert not given.closed
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+
+from draftable import Client
+from draftable.endpoints.exceptions import InvalidArgument
+
+from .signing import SigningContext, get_viewer_url_signature
+
+
+@pytest.mark.parametrize("account_id", ["aa", "RiWmsc-test", 'quote"andé'])
+def test_signing_context_matches(account_id):
+    context = SigningContext(account_id, "bb")
+    for identifier in ("abc", "a.b-c_d", "x" * 1024):
+        assert context.sign(identifier, 1700000000) == get_viewer_url_signature(
+            account_id, "bb", identifier, 1700000000
+        )
+
+
+def test_signed_viewer_urls():
+    comparisons = Client("aa", "bb").comparisons
+    urls = comparisons.signed_viewer_urls(["a", "b"], timedelta(minutes=5))
+    assert len(urls) == 2
+    valid_until = int(urls[0].split("valid_until=")[1].split("&")[0])
+    for url, identifier in zip(urls, ["a", "b"]):
+        signature = get_viewer_url_signature("aa", "bb", identifier, valid_until)
+        assert url.endswith(
+            f"/viewer/aa/{identifier}?valid_until={valid_until}&signature={signature}"
+        )
+
+
+def test_signed_viewer_urls_bucketed():
+    comparisons = Client("aa", "bb").comparisons
+    first = comparisons.signed_viewer_urls(
+        ["a", "b"], timedelta(minutes=5), wait=True, bucket=timedelta(hours=1)
+    )
+    second = comparisons.signed_viewer_urls(
+        ["b"], timedelta(minutes=5), wait=True, bucket=timedelta(hours=1)
+    )
+    assert second == first[1:]
+    assert first[0].endswith("&wait")
+    valid_until = int(first[0].split("valid_until=")[1].split("&")[0])
+    assert valid_until % 3600 == 0
+
+    with pytest.raises(InvalidArgument):
+        comparisons.signed_viewer_urls(["a"], bucket=timedelta(0))
+    with pytest.raises(InvalidArgument):
+        comparisons.signed_viewer_urls(["not valid"], bucket=timedelta(hours=1))
+
+
+def test_signing_context_verify():
+    comparisons = Client("aa", "bb", "https://dr.corp.co/api/v1").comparisons
+    context = SigningContext("aa", "bb")
+
+    url = comparisons.signed_viewer_url("abc", timedelta(minutes=5))
+    assert context.verify(url)
+    assert context.verify(url + "&wait")
+    assert not SigningContext("aa", "other").verify(url)
+    assert not SigningContext("other", "bb").verify(url)
+
+    valid_until = int(url.split("valid_until=")[1].split("&")[0])
+    assert not context.verify(url, now=valid_until + 1)
+    assert not context.verify(url.replace("/abc?", "/abd?"))
+    assert not context.verify(url.replace("valid_until=", "valid_until=1"))
+    assert not context.verify(url[:-1] + "é")
+    assert not context.verify(url.split("&signature")[0])
+    assert not context.verify(comparisons.public_viewer_url("abc"))
+    assert not context.verify("https://dr.corp.co/abc?valid_until=x&signature=y")
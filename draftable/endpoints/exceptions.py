@@ -1,12 +1,21 @@
 import functools
+from typing import TYPE_CHECKING
 
 import requests
 
+from ..transport.cancellation import CancelledError
+from ..transport.timeouts import DeadlineExceededError
+
 try:
-    from typing import Union
+    from typing import Any, List, Tuple, Union
 except ImportError:
     pass
 
+if TYPE_CHECKING:
+    # Only imported for type checking, as these modules depend on this one.
+    from .comparisons.comparison import Comparison
+    from .exports.export import Export
+
 
 class EndpointException(Exception):
     pass
@@ -24,6 +33,25 @@ class InvalidArgument(EndpointException):
         )
 
 
+class InvalidIdentifiers(InvalidArgument):
+    def __init__(self, invalid):
+        # type: (List[Tuple[int, Any, str]]) -> None
+        """
+        :param invalid: a list of (index, identifier, message) tuples describing
+            each invalid identifier
+        """
+        self.invalid = invalid
+        details = "; ".join(
+            f"[{index}] {identifier!r}: {message}"
+            for index, identifier, message in invalid[:10]
+        )
+        if len(invalid) > 10:
+            details += f"; and {len(invalid) - 10} more"
+        super().__init__(
+            "identifiers", f"{len(invalid)} identifier(s) are invalid: {details}"
+        )
+
+
 class BadRequest(EndpointException):
     def __init__(self, status_code, response):
         # type: (int, Union[dict, list]) -> None
@@ -36,6 +64,38 @@ class NotFound(BadRequest):
     pass
 
 
+class DeadlineExceeded(EndpointException):
+    pass
+
+
+class Cancelled(EndpointException):
+    pass
+
+
+class ChecksumMismatch(EndpointException):
+    def __init__(self, expected, actual):
+        # type: (str, str) -> None
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f"Checksum mismatch: expected={expected}, actual={actual}")
+
+
+class ComparisonFailed(EndpointException):
+    def __init__(self, comparison):
+        # type: (Comparison) -> None
+        self.comparison = comparison
+        super().__init__(
+            f"Comparison '{comparison.identifier}' failed: {comparison.error_message}"
+        )
+
+
+class ExportFailed(EndpointException):
+    def __init__(self, export):
+        # type: (Export) -> None
+        self.export = export
+        super().__init__(f"Export '{export.identifier}' failed: {export.error_message}")
+
+
 def raise_for(ex):
     # type: (requests.exceptions.RequestException) -> None
     if isinstance(ex, requests.exceptions.HTTPError):
@@ -47,6 +107,15 @@ def raise_for(ex):
         except Exception:
             # No JSON body? This shouldn't happen, but we'll rethrow anyway.
             wrapper = BadRequest(ex.response.status_code, ex.response)
+    elif isinstance(ex, DeadlineExceededError):
+        wrapper = DeadlineExceeded(str(ex))
+    elif isinstance(ex, CancelledError):
+        wrapper = Cancelled(str(ex))
+    elif isinstance(ex, requests.exceptions.Timeout):
+        wrapper = EndpointException(
+            "The API didn't respond in time. Timeouts can be configured with "
+            "`Client(timeouts=...)`."
+        )
     else:
         # An error in communication has occurred.
         wrapper = EndpointException(
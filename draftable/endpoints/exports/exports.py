@@ -1,21 +1,54 @@
+import functools
+import os
+import time
+from datetime import timedelta
+
 from ...transport import RESTClient
+from ...transport.cancellation import CancellationToken
+from ...transport.download import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_RESUMES,
+    stream_to_destination,
+)
+from ...transport.timeouts import Deadline
 from ...utilities import Url
+from ..bulk import DEFAULT_MAX_WORKERS, BulkItemResult, run_in_order
 from ..comparisons.comparison import Comparison
-from ..exceptions import handle_request_exception
-from ..validation import validate_export_kind, validate_identifier
+from ..exceptions import (
+    ChecksumMismatch,
+    DeadlineExceeded,
+    InvalidArgument,
+    handle_request_exception,
+)
+from ..latency import LatencyTracker
+from ..pagination import DEFAULT_PAGE_SIZE, iter_results
+from ..validation import (
+    validate_cancellation,
+    validate_deadline,
+    validate_export_kind,
+    validate_identifier,
+    validate_max_workers,
+)
 from .export import Export, export_from_response
 
 try:
-    from typing import Optional, Union
+    from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
 except ImportError:
     pass
 
 
 class ExportsEndpoint(object):
-    def __init__(self, client, base_url):
-        # type: (RESTClient, Url) -> None
+    def __init__(self, client, base_url, latency_tracker=None):
+        # type: (RESTClient, Url, Optional[LatencyTracker]) -> None
+        """
+        :param client: the REST client used to make requests
+        :param base_url: the base URL of the API
+        :param latency_tracker: a `LatencyTracker` to record how long exports
+            created with this endpoint take to become ready, or None
+        """
         self.__url = base_url / "exports"
         self.__client = client
+        self.__latency_tracker = latency_tracker
 
     @property
     def account_id(self):
@@ -28,18 +61,105 @@ class ExportsEndpoint(object):
         return self.__client.auth_token
 
     @handle_request_exception
-    def get(self, identifier):
-        # type: (str) -> Export
+    def get(self, identifier, deadline=None, cancellation=None):
+        # type: (str, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Export
+        """Gets an export.
+
+        :param identifier: The identifier of the export
+        :param deadline: the maximum number of seconds (or a timedelta) to spend on
+            the request and any retries, or a `Deadline` shared with other calls
+        :param cancellation: a `CancellationToken` which abandons the call when
+            cancelled from another thread
+        :return: the export
+        """
         identifier = validate_identifier(identifier)
-        return export_from_response(self.__client.get(self.__url / identifier))
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
+        export = export_from_response(
+            self.__client.get(
+                self.__url / identifier, deadline=deadline, cancellation=cancellation
+            )
+        )
+        if self.__latency_tracker is not None:
+            self.__latency_tracker.export_received(export)
+        return export
+
+    def iter_all(
+        self, page_size=DEFAULT_PAGE_SIZE, prefetch=0, deadline=None, cancellation=None
+    ):
+        # type: (int, int, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Iterator[Export]
+        """Lazily iterates over all exports, fetching one page at a time.
+
+        :param page_size: the number of exports to request per page
+        :param prefetch: the number of upcoming pages to fetch concurrently, or 0 to fetch pages sequentially
+        :param deadline: the maximum number of seconds (or a timedelta) to spend
+            fetching all of the pages, from when this is called, or a `Deadline`
+            shared with other calls
+        :param cancellation: a `CancellationToken` which stops fetching pages when
+            cancelled from another thread
+        :return: an iterator of exports
+        """
+        fetch_page = functools.partial(
+            self.__get_page,
+            deadline=validate_deadline(deadline),
+            cancellation=validate_cancellation(cancellation),
+        )
+        results = iter_results(fetch_page, self.__url, page_size, prefetch=prefetch)
+        return map(export_from_response, results)
+
+    @handle_request_exception
+    def __get_page(self, url, parameters, deadline=None, cancellation=None):
+        # type: (Union[str, Url], Optional[dict], Optional[Deadline], Optional[CancellationToken]) -> Union[dict, list]
+        return self.__client.get(
+            url, parameters, deadline=deadline, cancellation=cancellation
+        )
+
+    @handle_request_exception
+    def wait_until_ready(
+        self, identifier, poll_interval=1.0, timeout=None, cancellation=None
+    ):
+        # type: (str, float, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Export
+        """Polls an export until it's ready (which includes having failed).
+
+        :param identifier: The identifier of the export
+        :param poll_interval: the number of seconds to wait between requests
+        :param timeout: the maximum number of seconds to wait, including the time
+            spent on requests, or a `Deadline`, or None to wait forever
+        :param cancellation: as for `get`, which also stops waiting between polls
+        :return: the ready export
+        """
+        deadline = validate_deadline(timeout, "timeout")
+        cancellation = validate_cancellation(cancellation)
+        while True:
+            export = self.get(identifier, deadline, cancellation)
+            if export.ready:
+                return export
+            if deadline is not None and deadline.remaining() < poll_interval:
+                raise DeadlineExceeded(
+                    f"Export '{identifier}' was not ready within "
+                    f"{deadline.seconds:g} seconds."
+                )
+            if cancellation is not None:
+                cancellation.sleep(poll_interval)
+            else:
+                time.sleep(poll_interval)
 
     @handle_request_exception
-    def create(self, comparison, kind="single_page", include_cover_page=False):
-        # type: (Union[str, Comparison], Optional[str], Optional[bool]) -> Export
+    def create(
+        self,
+        comparison,
+        kind="single_page",
+        include_cover_page=False,
+        deadline=None,
+        cancellation=None,
+    ):
+        # type: (Union[str, Comparison], Optional[str], Optional[bool], Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> Export
         """Creates a new export with the Draftable API.
 
         :param comparison: comparison object to be exported, or the identifier of a comparison.
         :param comparison: as for "left".
+        :param deadline: as for `get`.
+        :param cancellation: as for `get`.
         :return: the newly created export
         """
         if isinstance(comparison, str):
@@ -52,9 +172,111 @@ class ExportsEndpoint(object):
             )
 
         kind = validate_export_kind(kind)
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
         data = {
             "comparison": comparison_identifier,
             "kind": kind,
             "include_cover_page": include_cover_page,
         }
-        return export_from_response(self.__client.post(self.__url, data))
+        started = time.monotonic()
+        export = export_from_response(
+            self.__client.post(self.__url, data, deadline, cancellation)
+        )
+        if self.__latency_tracker is not None:
+            self.__latency_tracker.export_created(export, started)
+        return export
+
+    def create_many(
+        self,
+        comparisons,
+        kind="single_page",
+        include_cover_page=False,
+        max_workers=DEFAULT_MAX_WORKERS,
+        deadline=None,
+        cancellation=None,
+    ):
+        # type: (Iterable[Union[str, Comparison]], Optional[str], Optional[bool], int, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> List[BulkItemResult]
+        """Creates exports of many comparisons concurrently.
+
+        Failures don't stop the remaining exports from being created, and are
+        instead reported in the results.
+
+        :param comparisons: comparison objects to be exported, or comparison identifiers.
+        :param kind: as for `create`.
+        :param include_cover_page: as for `create`.
+        :param max_workers: the maximum number of concurrent requests.
+        :param deadline: as for `get`, shared by all of the requests.
+        :param cancellation: as for `get`, which abandons the remaining requests.
+        :return: a result for each comparison, in the order given, whose `value` is
+            the newly created export
+        """
+        kind = validate_export_kind(kind)
+        max_workers = validate_max_workers(max_workers)
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
+
+        def create(comparison):
+            return self.create(
+                comparison, kind, include_cover_page, deadline, cancellation
+            )
+
+        return run_in_order(create, comparisons, max_workers)
+
+    @handle_request_exception
+    def download(
+        self,
+        export,
+        dest,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        max_resumes=DEFAULT_MAX_RESUMES,
+        expected_digest=None,
+        digest_algorithm="sha256",
+        deadline=None,
+        cancellation=None,
+    ):
+        # type: (Union[str, Export], Union[str, os.PathLike, BinaryIO], int, int, Optional[str], str, Optional[Union[float, timedelta, Deadline]], Optional[CancellationToken]) -> str
+        """Downloads the rendered file of a ready export without holding it in memory.
+
+        :param export: export object to be downloaded, or the identifier of an export.
+        :param dest: a file path, or a writable binary stream, to write the file to.
+        :param chunk_size: the number of bytes to read and write at a time.
+        :param max_resumes: how many times to resume the download if interrupted.
+        :param expected_digest: if given, the hex-encoded digest the file must have,
+            otherwise `ChecksumMismatch` is raised (and a file path is removed).
+        :param digest_algorithm: the `hashlib` algorithm used to compute the digest.
+        :param deadline: as for `get`, including any resumed downloads.
+        :param cancellation: as for `get`, which also stops the download between
+            chunks.
+        :return: the hex-encoded digest of the downloaded file
+        """
+        deadline = validate_deadline(deadline)
+        cancellation = validate_cancellation(cancellation)
+        if isinstance(export, str):
+            export = self.get(export, deadline, cancellation)
+        elif not isinstance(export, Export):
+            raise TypeError(
+                "Export must either be an export identifier or Export object"
+            )
+
+        if not export.ready or export.failed:
+            raise InvalidArgument(
+                "export", "the export must be ready (and not failed) to download."
+            )
+
+        digest = stream_to_destination(
+            self.__client,
+            export.url,
+            dest,
+            chunk_size=chunk_size,
+            max_resumes=max_resumes,
+            digest_algorithm=digest_algorithm,
+            deadline=deadline,
+            cancellation=cancellation,
+        )
+        if expected_digest is not None and digest != expected_digest.lower():
+            if not hasattr(dest, "write"):
+                # Don't leave a file known to be corrupt behind.
+                os.remove(dest)
+            raise ChecksumMismatch(expected_digest, digest)
+        return digest
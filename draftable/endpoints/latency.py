@@ -0,0 +1,348 @@
+import bisect
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING
+
+try:
+    from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+except ImportError:
+    pass
+
+if TYPE_CHECKING:
+    # Only imported for type checking, as the endpoints depend on this module.
+    from .comparisons.comparison import Comparison
+    from .comparisons.inventory import ComparisonInventory
+    from .exports.export import Export
+
+
+# Upper bounds, in seconds, of the buckets of latency histograms.
+DEFAULT_LATENCY_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 1800, 3600)
+# The number of most recent latencies kept, per series, for percentiles.
+DEFAULT_MAX_SAMPLES = 10000
+# The number of created comparisons and exports that can be waiting to be seen
+# ready, beyond which the oldest are forgotten.
+DEFAULT_MAX_PENDING = 100000
+
+COMPARISON = "comparison"
+EXPORT = "export"
+# Measured by the client, from starting to create a comparison or export until
+# first receiving it ready. This includes uploads, network and polling overhead.
+OBSERVED = "observed"
+# Reported by the API, from a comparison's `creation_time` to its `ready_time`.
+PROCESSING = "processing"
+
+
+def file_type_key(left_file_type, right_file_type):
+    # type: (str, str) -> str
+    """The key that comparisons' latencies are grouped by, e.g. "pdf" or "doc/pdf"."""
+    if left_file_type == right_file_type:
+        return left_file_type
+    return f"{left_file_type}/{right_file_type}"
+
+
+def _percentile(ordered, fraction):
+    # type: (List[float], float) -> float
+    # The nearest-rank percentile of a sorted, non-empty list.
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class LatencySummary(object):
+    """A summary of the latencies of a series, e.g. the observed latencies of PDF
+    comparisons. Latencies are in seconds, and are None if there are none.
+    Percentiles are of the most recent latencies, up to the tracker's `max_samples`.
+    """
+
+    def __init__(
+        self,
+        resource,  # type: str
+        measure,  # type: str
+        key,  # type: str
+        count,  # type: int
+        failed,  # type: int
+        mean,  # type: Optional[float]
+        p50,  # type: Optional[float]
+        p95,  # type: Optional[float]
+        p99,  # type: Optional[float]
+        max,  # type: Optional[float]  # pylint: disable=redefined-builtin
+        buckets,  # type: List[Tuple[float, int]]
+    ):
+        # type: (...) -> None
+        self.resource = resource
+        self.measure = measure
+        self.key = key
+        self.count = count
+        self.failed = failed
+        self.mean = mean
+        self.p50 = p50
+        self.p95 = p95
+        self.p99 = p99
+        self.max = max
+        # Cumulative counts of latencies up to each bucket's upper bound, ending
+        # with the count of all latencies (with an upper bound of infinity).
+        self.buckets = buckets
+
+    @property
+    def failure_rate(self):
+        # type: () -> Optional[float]
+        total = self.count + self.failed
+        return self.failed / total if total else None
+
+    def to_dict(self):
+        # type: () -> Dict[str, Any]
+        return {
+            "resource": self.resource,
+            "measure": self.measure,
+            "key": self.key,
+            "count": self.count,
+            "failed": self.failed,
+            "mean": self.mean,
+            "p50": self.p50,
+            "p95": self.p95,
+            "p99": self.p99,
+            "max": self.max,
+            # JSON has no infinity, so the last bucket's bound is given as None.
+            "buckets": [
+                [None if math.isinf(bound) else bound, count]
+                for bound, count in self.buckets
+            ],
+        }
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "LatencySummary("
+            f"resource={self.resource!r}, "
+            f"measure={self.measure!r}, "
+            f"key={self.key!r}, "
+            f"count={self.count!r}, "
+            f"failed={self.failed!r}, "
+            f"p50={self.p50!r}, "
+            f"p95={self.p95!r}"
+            ")"
+        )
+
+
+class _Series(object):
+    def __init__(self, buckets, max_samples):
+        # type: (Sequence[float], int) -> None
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.samples = deque(maxlen=max_samples)  # type: Deque[float]
+        self.count = 0
+        self.failed = 0
+        self.sum = 0.0
+        self.max = None  # type: Optional[float]
+
+    def observe(self, seconds):
+        # type: (float) -> None
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.samples.append(seconds)
+        self.count += 1
+        self.sum += seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def summary(self, resource, measure, key):
+        # type: (str, str, str) -> LatencySummary
+        ordered = sorted(self.samples)
+        percentiles = [
+            _percentile(ordered, fraction) if ordered else None
+            for fraction in (0.5, 0.95, 0.99)
+        ]
+        cumulative = []
+        total = 0
+        for bound, count in zip(list(self.buckets) + [math.inf], self.counts):
+            total += count
+            cumulative.append((float(bound), total))
+        return LatencySummary(
+            resource,
+            measure,
+            key,
+            self.count,
+            self.failed,
+            self.sum / self.count if self.count else None,
+            *percentiles,
+            self.max,
+            cumulative,
+        )
+
+
+class LatencyTracker(object):
+    """Records how long comparisons and exports take to become ready.
+
+    Give a tracker to `Client(latency_tracker=...)` and it records, for each
+    comparison and export created by the client, the time from starting to create
+    it until the client first receives it ready (e.g. from `get` or
+    `wait_until_ready`), as the "observed" measure. This includes the time spent
+    uploading, and the overhead of polling. For comparisons it also records the
+    "processing" time reported by the API, from `creation_time` to `ready_time`.
+
+    Comparisons are grouped by file type, and exports by kind. Failed comparisons
+    and exports are counted but their latencies aren't recorded. The tracker is
+    safe to share between threads and clients.
+    """
+
+    def __init__(
+        self,
+        buckets=DEFAULT_LATENCY_BUCKETS,
+        max_samples=DEFAULT_MAX_SAMPLES,
+        max_pending=DEFAULT_MAX_PENDING,
+    ):
+        # type: (Sequence[float], int, int) -> None
+        """
+        :param buckets: the upper bounds, in seconds, of the histogram buckets
+        :param max_samples: the number of most recent latencies kept per series,
+            which percentiles are calculated from
+        :param max_pending: the number of created comparisons and exports to
+            remember until they're seen ready, beyond which the oldest are forgotten
+        """
+        if max_samples < 1 or max_pending < 1:
+            raise ValueError("`max_samples` and `max_pending` must be at least 1.")
+        self.__buckets = tuple(sorted(buckets))
+        self.__max_samples = max_samples
+        self.__max_pending = max_pending
+        self.__lock = threading.Lock()
+        self.__series = {}  # type: Dict[Tuple[str, str, str], _Series]
+        # Maps (resource, identifier) to (started, key) for the comparisons and
+        # exports waiting to be seen ready, in the order they were created.
+        self.__pending = OrderedDict()  # type: OrderedDict
+
+    def record(self, resource, measure, key, seconds, failed=False):
+        # type: (str, str, str, Optional[float], bool) -> None
+        """Records a latency, or a failure.
+
+        :param resource: "comparison" or "export"
+        :param measure: "observed" or "processing"
+        :param key: the file type of comparisons, or the kind of exports
+        :param seconds: the latency, which is ignored if `failed`
+        :param failed: True if the comparison or export failed
+        """
+        with self.__lock:
+            series = self.__series.get((resource, measure, key))
+            if series is None:
+                series = _Series(self.__buckets, self.__max_samples)
+                self.__series[(resource, measure, key)] = series
+            if failed:
+                series.failed += 1
+            elif seconds is not None:
+                series.observe(max(0.0, seconds))
+
+    def record_inventory(self, inventory):
+        # type: (ComparisonInventory) -> None
+        """Records the processing times of the ready comparisons in an inventory,
+        e.g. to summarise all of the comparisons in an account.
+        """
+        for left, right, ready, failed, seconds in zip(
+            inventory["left_file_type"],
+            inventory["right_file_type"],
+            inventory["ready"],
+            inventory["failed"],
+            inventory["ready_seconds"],
+        ):
+            if ready:
+                key = file_type_key(left, right)
+                self.record(COMPARISON, PROCESSING, key, seconds, bool(failed))
+
+    def comparison_created(self, comparison, started):
+        # type: (Comparison, float) -> None
+        """Called when a comparison is created.
+
+        :param started: the value of `time.monotonic()` when creating it started
+        """
+        key = file_type_key(comparison.left.file_type, comparison.right.file_type)
+        self.__created(COMPARISON, comparison.identifier, key, started)
+        self.comparison_received(comparison)
+
+    def comparison_received(self, comparison):
+        # type: (Comparison) -> None
+        """Called whenever a comparison is received from the API."""
+        if not comparison.ready:
+            return
+        pending = self.__ready(COMPARISON, comparison.identifier)
+        if pending is None:
+            return
+        started, key = pending
+        failed = bool(comparison.failed)
+        self.record(COMPARISON, OBSERVED, key, time.monotonic() - started, failed)
+        processing = None
+        if comparison.ready_time is not None:
+            processing = (
+                comparison.ready_time - comparison.creation_time
+            ).total_seconds()
+        self.record(COMPARISON, PROCESSING, key, processing, failed)
+
+    def export_created(self, export, started):
+        # type: (Export, float) -> None
+        """Called when an export is created.
+
+        :param started: the value of `time.monotonic()` when creating it started
+        """
+        self.__created(EXPORT, export.identifier, export.kind, started)
+        self.export_received(export)
+
+    def export_received(self, export):
+        # type: (Export) -> None
+        """Called whenever an export is received from the API."""
+        if not (export.ready or export.failed):
+            return
+        pending = self.__ready(EXPORT, export.identifier)
+        if pending is not None:
+            started, key = pending
+            self.record(
+                EXPORT, OBSERVED, key, time.monotonic() - started, bool(export.failed)
+            )
+
+    def __created(self, resource, identifier, key, started):
+        # type: (str, str, str, float) -> None
+        with self.__lock:
+            self.__pending[(resource, identifier)] = (started, key)
+            while len(self.__pending) > self.__max_pending:
+                self.__pending.popitem(last=False)
+
+    def __ready(self, resource, identifier):
+        # type: (str, str) -> Optional[Tuple[float, str]]
+        with self.__lock:
+            return self.__pending.pop((resource, identifier), None)
+
+    def summaries(self):
+        # type: () -> List[LatencySummary]
+        """Summarises each series of latencies, ordered by resource, measure and key."""
+        with self.__lock:
+            return [
+                series.summary(*name) for name, series in sorted(self.__series.items())
+            ]
+
+    def render(self):
+        # type: () -> str
+        """Formats the summaries as a table."""
+
+        def seconds(value):
+            # type: (Optional[float]) -> str
+            return "-" if value is None else f"{value:.1f}s"
+
+        lines = [
+            f"{'resource':<12}{'measure':<12}{'key':<12}{'count':>8}{'failed':>8}"
+            f"{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+        ]
+        for summary in self.summaries():
+            lines.append(
+                f"{summary.resource:<12}{summary.measure:<12}{summary.key:<12}"
+                f"{summary.count:>8}{summary.failed:>8}"
+                f"{seconds(summary.mean):>10}{seconds(summary.p50):>10}"
+                f"{seconds(summary.p95):>10}{seconds(summary.p99):>10}"
+                f"{seconds(summary.max):>10}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        # type: () -> None
+        """Forgets all latencies, and the comparisons and exports being waited for."""
+        with self.__lock:
+            self.__series.clear()
+            self.__pending.clear()
+
+    def __repr__(self):
+        # type: () -> str
+        return f"LatencyTracker(<{len(self.__series)} series>)"
@@ -0,0 +1,141 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .validation import validate_page_size, validate_prefetch
+
+try:
+    from typing import Any, Callable, Iterator, Optional, Union
+except ImportError:
+    pass
+
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def iter_results(
+    fetch_page, url, page_size=DEFAULT_PAGE_SIZE, parameters=None, prefetch=0
+):
+    # type: (Callable[[Any, Optional[dict]], Union[dict, list]], Any, int, Optional[dict], int) -> Iterator[dict]
+    """Lazily yields the raw result objects of a paginated listing endpoint.
+
+    Pages are requested using `limit` and `offset` query parameters. If the server
+    provides a `next` link it is followed as-is, otherwise the offset is advanced
+    by the number of results received until the `count` of results is reached, an
+    empty page is returned, or (without a `count`) a short page or a null `next`
+    link is returned. This copes with servers which return fewer results per page
+    than requested. Servers which don't paginate and return a plain list are also
+    supported.
+
+    :param fetch_page: callable taking `(url, parameters)` and returning the decoded response
+    :param url: the URL of the listing endpoint
+    :param page_size: the number of results to request per page
+    :param parameters: additional query parameters (e.g. filters) sent with every page
+    :param prefetch: the number of pages to fetch ahead of the page being consumed
+    """
+    page_size = validate_page_size(page_size)
+    prefetch = validate_prefetch(prefetch)
+    base_parameters = dict(parameters or {})
+
+    if prefetch:
+        return _iter_results_prefetched(
+            fetch_page, url, page_size, base_parameters, prefetch
+        )
+    return _iter_results_sequential(fetch_page, url, page_size, base_parameters)
+
+
+def _iter_results_sequential(fetch_page, url, page_size, base_parameters, offset=0):
+    # type: (Callable[[Any, Optional[dict]], Union[dict, list]], Any, int, dict, int) -> Iterator[dict]
+    next_url = url
+    next_parameters = dict(base_parameters, limit=page_size, offset=offset)
+
+    while next_url is not None:
+        page = fetch_page(next_url, next_parameters)
+
+        if isinstance(page, list):
+            # Unpaginated response: everything was returned at once.
+            yield from page
+            return
+
+        results = page.get("results") or []
+        yield from results
+        offset += len(results)
+
+        if page.get("next"):
+            # The link includes all query parameters, including our filters.
+            next_url = page["next"]
+            next_parameters = None
+            continue
+
+        if not results:
+            break
+        if "count" in page:
+            # The server may return fewer results than requested, so rely on the
+            # count rather than the size of the page when it's known.
+            if offset >= page["count"]:
+                break
+        elif "next" in page or len(results) < page_size:
+            break
+
+        next_parameters = dict(base_parameters, limit=page_size, offset=offset)
+
+
+def _iter_results_prefetched(fetch_page, url, page_size, base_parameters, prefetch):
+    # type: (Callable[[Any, Optional[dict]], Union[dict, list]], Any, int, dict, int) -> Iterator[dict]
+    # Following `next` links is inherently sequential, so prefetching computes the
+    # offsets of upcoming pages up front and requests them concurrently. Pages are
+    # always yielded in order, regardless of the order in which they complete. If
+    # the server returns fewer results than requested, the precomputed offsets are
+    # wrong, so the rest of the results are fetched sequentially instead.
+    executor = ThreadPoolExecutor(
+        max_workers=prefetch, thread_name_prefix="draftable-prefetch"
+    )
+    pending = deque()
+    next_offset = 0
+    count = None
+
+    def submit():
+        nonlocal next_offset
+        if count is not None and next_offset >= count:
+            return
+        parameters = dict(base_parameters, limit=page_size, offset=next_offset)
+        pending.append((next_offset, executor.submit(fetch_page, url, parameters)))
+        next_offset += page_size
+
+    try:
+        for _ in range(prefetch + 1):
+            submit()
+
+        while pending:
+            offset, future = pending.popleft()
+            page = future.result()
+
+            if isinstance(page, list):
+                # Unpaginated response: everything was returned at once.
+                yield from page
+                return
+
+            results = page.get("results") or []
+            if "count" in page:
+                count = page["count"]
+            if len(results) < page_size:
+                offset += len(results)
+                if not results or count is None or offset >= count:
+                    yield from results
+                    return
+                # The server capped the page size: stop prefetching.
+                for _, future in pending:
+                    future.cancel()
+                pending.clear()
+                yield from results
+                yield from _iter_results_sequential(
+                    fetch_page, url, page_size, base_parameters, offset
+                )
+                return
+
+            # Keep the pipeline full before handing results to the caller.
+            submit()
+            yield from results
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+import requests
+
+from draftable.commands.dr_compare import dr_compare_main
+from draftable.endpoints.comparisons import ComparisonsEndpoint
+from draftable.endpoints.exceptions import BadRequest, InvalidArgument
+from draftable.endpoints.exports import ExportsEndpoint
+from draftable.utilities import Url
+
+from .bulk import run_concurrently, run_in_order
+
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b'{"detail": "error"}'
+    return requests.exceptions.HTTPError(response=response)
+
+
+class _DeletingClient(object):
+    def __init__(self, existing, broken=()):
+        self.existing = set(existing)
+        self.broken = set(broken)
+        self.lock = threading.Lock()
+
+    def delete(self, url, deadline=None, cancellation=None):
+        identifier = str(url).rsplit("/", 1)[1]
+        if identifier in self.broken:
+            raise _http_error(500)
+        with self.lock:
+            if identifier not in self.existing:
+                raise _http_error(404)
+            self.existing.remove(identifier)
+
+
+def test_run_concurrently():
+    results = list(run_concurrently(lambda x: x * 2, range(100), max_workers=4))
+    assert sorted(r for _, r, _ in results) == [x * 2 for x in range(100)]
+    assert all(e is None for _, _, e in results)
+
+
+def test_run_concurrently_reports_exceptions():
+    def f(x):
+        if x % 2:
+            raise ValueError(x)
+        return x
+
+    results = {item: (r, e) for item, r, e in run_concurrently(f, range(10), 3)}
+    assert results[2] == (2, None)
+    assert isinstance(results[3][1], ValueError)
+
+
+def test_run_concurrently_is_lazy():
+    consumed = []
+
+    def items():
+        for x in range(1000):
+            consumed.append(x)
+            yield x
+
+    results = run_concurrently(lambda x: x, items(), max_workers=2)
+    next(results)
+    results.close()
+    assert len(consumed) < 10
+
+
+def test_delete_many():
+    client = _DeletingClient(["a", "b", "c"], broken=["d"])
+    endpoint = ComparisonsEndpoint(client, Url("http://api"))
+
+    summary = endpoint.delete_many(iter(["a", "b", "c", "d", "e"]), max_workers=2)
+    assert sorted(summary.deleted) == ["a", "b", "c"]
+    assert summary.missing == ["e"]
+    assert list(summary.failed) == ["d"]
+    assert isinstance(summary.failed["d"], BadRequest)
+    assert not summary.ok
+    assert not client.existing
+
+
+def test_delete_many_duplicates():
+    client = _DeletingClient(["a"], broken=["b"])
+    endpoint = ComparisonsEndpoint(client, Url("http://api"))
+    summary = endpoint.delete_many(["a", "b", "a", "b", "c", "c"])
+    assert summary.deleted == ["a"]
+    assert summary.missing == ["c"]
+    assert list(summary.failed) == ["b"]
+
+
+def test_delete_command_requires_identifiers(capsys):
+    with pytest.raises(SystemExit) as info:
+        dr_compare_main(["dr-compare", "delete", "-a", "account", "-t", "token"])
+    assert info.value.code == 2
+    assert "usage:" in capsys.readouterr().err
+
+
+def test_delete_many_missing_not_ok():
+    endpoint = ComparisonsEndpoint(_DeletingClient([]), Url("http://api"))
+    summary = endpoint.delete_many(["a"], missing_ok=False)
+    assert summary.missing == []
+    assert list(summary.failed) == ["a"]
+
+
+def test_run_in_order():
+    def f(x):
+        if x == 3:
+            raise ValueError(x)
+        return x * 2
+
+    results = run_in_order(f, iter(range(50)), max_workers=4)
+    assert [r.item for r in results] == list(range(50))
+    assert results[2].ok and results[2].value == 4
+    assert not results[3].ok and isinstance(results[3].error, ValueError)
+
+
+class _ExportingClient(object):
+    def post(self, url, data, deadline=None, cancellation=None):
+        return {
+            "identifier": f"export-{data['comparison']}",
+            "comparison": data["comparison"],
+            "ready": False,
+            "kind": data["kind"],
+            "url": None,
+        }
+
+
+def test_exports_create_many():
+    endpoint = ExportsEndpoint(_ExportingClient(), Url("http://api"))
+    results = endpoint.create_many(["a", "b", "in valid"], kind="combined")
+    assert [r.ok for r in results] == [True, True, False]
+    assert results[0].value.identifier == "export-a"
+    assert results[1].value.kind == "combined"
+    assert isinstance(results[2].error, InvalidArgument)
@@ -0,0 +1,156 @@
+import json
+import math
+
+import pytest
+
+from draftable import Client
+from draftable.commands.dr_compare import dr_compare_main
+from draftable.testing import StandInServer
+
+from .comparisons.inventory import ComparisonInventory
+from .latency import LatencyTracker, file_type_key
+
+
+def test_file_type_key():
+    assert file_type_key("pdf", "pdf") == "pdf"
+    assert file_type_key("doc", "pdf") == "doc/pdf"
+
+
+def test_summaries():
+    tracker = LatencyTracker(buckets=(1, 10))
+    for seconds in range(1, 101):
+        tracker.record("comparison", "observed", "pdf", seconds / 10)
+    tracker.record("comparison", "observed", "pdf", None, failed=True)
+    tracker.record("export", "observed", "combined", 20)
+
+    comparisons, exports = tracker.summaries()
+    assert (comparisons.resource, comparisons.measure, comparisons.key) == (
+        "comparison",
+        "observed",
+        "pdf",
+    )
+    assert comparisons.count == 100
+    assert comparisons.failed == 1
+    assert comparisons.failure_rate == pytest.approx(1 / 101)
+    assert comparisons.mean == pytest.approx(5.05)
+    assert (comparisons.p50, comparisons.p95, comparisons.p99) == (5.0, 9.5, 9.9)
+    assert comparisons.max == 10.0
+    assert comparisons.buckets == [(1.0, 10), (10.0, 100), (math.inf, 100)]
+    assert exports.buckets == [(1.0, 0), (10.0, 0), (math.inf, 1)]
+    assert json.loads(json.dumps(exports.to_dict()))["buckets"][-1] == [None, 1]
+
+    table = tracker.render().splitlines()
+    assert len(table) == 3
+    assert table[1].split() == [
+        "comparison",
+        "observed",
+        "pdf",
+        "100",
+        "1",
+        "5.0s",
+        "5.0s",
+        "9.5s",
+        "9.9s",
+        "10.0s",
+    ]
+
+    tracker.reset()
+    assert tracker.summaries() == []
+
+
+def test_max_samples():
+    tracker = LatencyTracker(max_samples=2)
+    for seconds in (100, 1, 2):
+        tracker.record("comparison", "observed", "pdf", seconds)
+    (summary,) = tracker.summaries()
+    # Percentiles are of the most recent latencies; the rest are of all of them.
+    assert summary.p99 == 2
+    assert (summary.count, summary.max) == (3, 100)
+
+
+def test_record_inventory():
+    inventory = ComparisonInventory.from_results(
+        [
+            {
+                "identifier": f"id{n}",
+                "left": {"file_type": "pdf"},
+                "right": {"file_type": "pdf" if n else "docx"},
+                "creation_time": "2024-01-01T00:00:00Z",
+                "ready": n < 3,
+                "ready_time": f"2024-01-01T00:00:{n:02d}Z",
+                "failed": n == 2,
+            }
+            for n in range(4)
+        ]
+    )
+    tracker = LatencyTracker()
+    tracker.record_inventory(inventory)
+    pdf, docx = tracker.summaries()
+    assert (docx.key, docx.measure, docx.count, docx.failed) == (
+        "pdf/docx",
+        "processing",
+        1,
+        0,
+    )
+    assert (pdf.key, pdf.count, pdf.failed, pdf.max) == ("pdf", 1, 1, 1.0)
+
+
+def test_client_tracking():
+    tracker = LatencyTracker(max_pending=2)
+    with StandInServer(ready_delay=0.1) as server:
+        client = Client(
+            server.account_id,
+            server.auth_token,
+            server.base_url,
+            latency_tracker=tracker,
+        )
+        assert client.latency_tracker is tracker
+        comparisons = [
+            client.comparisons.create(
+                "https://example.com/left.pdf", "https://example.com/right.pdf"
+            )
+            for _ in range(3)
+        ]
+        for comparison in comparisons:
+            client.comparisons.wait_until_ready(comparison.identifier, 0.05)
+        # Seeing a comparison ready again doesn't record it again.
+        client.comparisons.get(comparisons[-1].identifier)
+
+        export = client.exports.create(comparisons[-1], kind="combined")
+        client.exports.wait_until_ready(export.identifier, 0.05)
+
+    summaries = {
+        (summary.resource, summary.measure, summary.key): summary
+        for summary in tracker.summaries()
+    }
+    assert sorted(summaries) == [
+        ("comparison", "observed", "pdf"),
+        ("comparison", "processing", "pdf"),
+        ("export", "observed", "combined"),
+    ]
+    # The oldest comparison was forgotten, beyond `max_pending`.
+    observed = summaries[("comparison", "observed", "pdf")]
+    assert observed.count == 2
+    assert observed.p50 >= 0.1
+    assert summaries[("comparison", "processing", "pdf")].count == 2
+    assert summaries[("export", "observed", "combined")].count == 1
+
+
+def test_stats_command(capsys):
+    with StandInServer() as server:
+        client = Client(server.account_id, server.auth_token, server.base_url)
+        client.comparisons.create(
+            "https://example.com/left.pdf", "https://example.com/right.docx"
+        )
+        account = server.account_id
+        args = ["-a", account, "-t", server.auth_token, "-b", server.base_url]
+
+        dr_compare_main(["dr-compare", "stats", "-d", "1"] + args)
+        output = capsys.readouterr().out
+        assert "has 1 comparison(s): 0 pending, 0 failed." in output
+        assert "processing" in output and "pdf/docx" in output
+
+        dr_compare_main(["dr-compare", "stats", "--json"] + args)
+        stats = json.loads(capsys.readouterr().out)
+        assert stats["comparisons"] == 1
+        assert [summary["key"] for summary in stats["latencies"]] == ["pdf/docx"]
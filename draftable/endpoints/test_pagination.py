@@ -0,0 +1,208 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from draftable.endpoints.comparisons import ComparisonsEndpoint
+from draftable.endpoints.exceptions import DeadlineExceeded, InvalidArgument
+from draftable.endpoints.exports import ExportsEndpoint
+from draftable.transport import CancellationToken, Deadline
+from draftable.utilities import Url
+
+from .pagination import iter_results
+
+
+def _comparison_data(n, ready=True, failed=False):
+    return {
+        "identifier": f"id{n}",
+        "left": {"file_type": "pdf"},
+        "right": {"file_type": "pdf"},
+        "creation_time": f"2024-01-{n + 1:02d}T00:00:00Z",
+        "ready": ready,
+        "failed": failed,
+    }
+
+
+class _PagedClient(object):
+    """Serves a list of results using limit/offset pagination."""
+
+    def __init__(self, results, with_next=False, max_limit=None):
+        self.results = results
+        self.with_next = with_next
+        self.max_limit = max_limit
+        self.requests = []
+
+    def get(self, url, parameters=None, deadline=None, cancellation=None):
+        self.requests.append((str(url), parameters))
+        if parameters is None:
+            # Following a `next` link
+            offset, limit = map(int, str(url).rsplit("?", 1)[1].split(","))
+        else:
+            offset, limit = parameters["offset"], parameters["limit"]
+        if self.max_limit is not None:
+            limit = min(limit, self.max_limit)
+        page = {
+            "count": len(self.results),
+            "results": self.results[offset : offset + limit],
+        }
+        if self.with_next:
+            more = offset + limit < len(self.results)
+            page["next"] = f"http://next?{offset + limit},{limit}" if more else None
+        return page
+
+
+class _DeadlineRecordingClient(_PagedClient):
+    def __init__(self, results):
+        super().__init__(results)
+        self.calls = []
+
+    def get(self, url, parameters=None, deadline=None, cancellation=None):
+        self.calls.append((deadline, cancellation))
+        if deadline is not None:
+            deadline.check()
+        return super().get(url, parameters)
+
+
+def test_iter_results_offset():
+    client = _PagedClient(list(range(25)))
+    results = iter_results(client.get, "http://x", page_size=10)
+    assert client.requests == []  # lazy
+    assert list(results) == list(range(25))
+    assert [p["offset"] for _, p in client.requests] == [0, 10, 20]
+
+
+def test_iter_results_exact_multiple_uses_count():
+    client = _PagedClient(list(range(20)))
+    assert list(iter_results(client.get, "http://x", page_size=10)) == list(range(20))
+    assert len(client.requests) == 2
+
+
+def test_iter_results_capped_page_size():
+    client = _PagedClient(list(range(250)), max_limit=50)
+    results = iter_results(client.get, "http://x", page_size=100)
+    assert list(results) == list(range(250))
+    assert [p["offset"] for _, p in client.requests] == [0, 50, 100, 150, 200]
+
+
+def test_iter_results_short_page_without_count():
+    pages = [{"results": [1, 2]}, {"results": [3]}]
+    requests = []
+
+    def fetch_page(url, parameters):
+        requests.append(parameters)
+        return pages[len(requests) - 1]
+
+    assert list(iter_results(fetch_page, "http://x", page_size=2)) == [1, 2, 3]
+    assert len(requests) == 2
+
+
+def test_iter_results_next_links():
+    client = _PagedClient(list(range(25)), with_next=True)
+    assert list(iter_results(client.get, "http://x", page_size=10)) == list(range(25))
+    assert [url for url, _ in client.requests] == [
+        "http://x",
+        "http://next?10,10",
+        "http://next?20,10",
+    ]
+
+
+def test_iter_results_unpaginated_list():
+    assert list(iter_results(lambda url, params: [1, 2, 3], "http://x", 2)) == [1, 2, 3]
+
+
+def test_iter_results_filters_sent_with_every_page():
+    client = _PagedClient(list(range(5)))
+    list(iter_results(client.get, "http://x", 2, {"ready": "true"}))
+    assert all(p["ready"] == "true" for _, p in client.requests)
+
+
+def test_comparisons_iter_all():
+    data = [_comparison_data(n, ready=n % 2 == 0) for n in range(7)]
+    client = _PagedClient(data)
+    endpoint = ComparisonsEndpoint(client, Url("http://api"))
+
+    comparisons = list(endpoint.iter_all(page_size=3))
+    assert [c.identifier for c in comparisons] == [f"id{n}" for n in range(7)]
+    assert client.requests[0][0] == "http://api/comparisons"
+
+    ready = list(endpoint.iter_all(page_size=3, ready=True))
+    assert [c.identifier for c in ready] == ["id0", "id2", "id4", "id6"]
+    assert client.requests[-1][1]["ready"] == "true"
+
+    after = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    recent = list(endpoint.iter_all(created_after=after))
+    assert [c.identifier for c in recent] == ["id5", "id6"]
+
+
+def test_comparisons_iter_all_validates_eagerly():
+    endpoint = ComparisonsEndpoint(_PagedClient([]), Url("http://api"))
+    with pytest.raises(InvalidArgument):
+        endpoint.iter_all(page_size=0)
+    with pytest.raises(InvalidArgument):
+        endpoint.iter_all(created_after="yesterday")
+
+
+def test_iter_results_prefetch_preserves_order():
+    client = _PagedClient(list(range(95)))
+    results = iter_results(client.get, "http://x", page_size=10, prefetch=3)
+    assert list(results) == list(range(95))
+    assert sorted(p["offset"] for _, p in client.requests) == list(range(0, 100, 10))
+
+
+def test_iter_results_prefetch_stops_at_count():
+    client = _PagedClient(list(range(40)))
+    assert list(iter_results(client.get, "http://x", 10, prefetch=8)) == list(range(40))
+    # The first batch is requested before the count is known, but no more.
+    offsets = sorted(p["offset"] for _, p in client.requests)
+    assert offsets[:5] == list(range(0, 50, 10))
+    assert max(offsets) <= 80
+
+
+def test_iter_results_prefetch_capped_page_size():
+    client = _PagedClient(list(range(250)), max_limit=50)
+    results = iter_results(client.get, "http://x", page_size=100, prefetch=2)
+    assert list(results) == list(range(250))
+    # After the first short page the rest are requested sequentially.
+    offsets = [p["offset"] for _, p in client.requests]
+    assert offsets[-4:] == [50, 100, 150, 200]
+
+
+def test_iter_results_prefetch_early_close():
+    client = _PagedClient(list(range(1000)))
+    results = iter_results(client.get, "http://x", 10, prefetch=2)
+    assert next(results) == 0
+    results.close()
+    assert len(client.requests) <= 4
+
+
+def test_iter_results_prefetch_validation():
+    with pytest.raises(InvalidArgument):
+        iter_results(lambda url, params: [], "http://x", 10, prefetch=-1)
+
+
+def test_exports_iter_all():
+    data = [
+        {"identifier": f"e{n}", "comparison": "c", "kind": "left", "url": "u"}
+        for n in range(5)
+    ]
+    client = _PagedClient(data)
+    exports = ExportsEndpoint(client, Url("http://api")).iter_all(page_size=2)
+    assert [e.identifier for e in exports] == [f"e{n}" for n in range(5)]
+    assert client.requests[0][0] == "http://api/exports"
+
+
+def test_iter_all_deadline_and_cancellation():
+    client = _DeadlineRecordingClient([_comparison_data(n) for n in range(3)])
+    token = CancellationToken()
+    endpoint = ComparisonsEndpoint(client, Url("http://api"))
+    list(endpoint.iter_all(page_size=2, deadline=60, cancellation=token))
+    assert len(client.calls) == 2
+    assert all(isinstance(deadline, Deadline) for deadline, _ in client.calls)
+    assert all(cancellation is token for _, cancellation in client.calls)
+
+    endpoint.inventory(deadline=Deadline(60))
+    with pytest.raises(InvalidArgument):
+        endpoint.inventory(deadline=-1)
+
+    exports = ExportsEndpoint(client, Url("http://api"))
+    with pytest.raises(DeadlineExceeded):
+        list(exports.iter_all(deadline=Deadline(0)))
@@ -0,0 +1,66 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from ..transport.timeouts import Deadline
+from .exceptions import InvalidArgument, InvalidIdentifiers
+from .validation import validate_deadline, validate_identifier, validate_identifiers
+
+_ALLOWED = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-._")
+
+
+def test_validate_identifier_matches_character_set():
+    rng = random.Random(1234)
+    alphabet = "aZ09-._ /\\\n\x00é+*$^[]"
+    for _ in range(2000):
+        identifier = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6)))
+        if all(c in _ALLOWED for c in identifier):
+            assert validate_identifier(identifier) == identifier
+        else:
+            with pytest.raises(InvalidArgument, match="must only contain"):
+                validate_identifier(identifier)
+
+
+@pytest.mark.parametrize(
+    "identifier, message",
+    [
+        ("", "cannot be empty"),
+        (None, "cannot be empty"),
+        (b"abc", "must be a string"),
+        (123, "must be a string"),
+        ("a" * 1025, "between 1 and 1024"),
+        ("abc\n", "must only contain"),
+    ],
+)
+def test_validate_identifier_errors(identifier, message):
+    with pytest.raises(InvalidArgument, match=message):
+        validate_identifier(identifier)
+
+
+def test_validate_identifiers():
+    assert validate_identifiers(iter(["a", "b-c", "d.e_f"])) == ["a", "b-c", "d.e_f"]
+
+    with pytest.raises(InvalidIdentifiers) as info:
+        validate_identifiers(["a", "", "b", "c d", "e" * 1025])
+    assert [
+        (i, message.split(": ")[-1][:20]) for i, _, message in info.value.invalid
+    ] == [
+        (1, "`identifier` cannot "),
+        (3, "`identifier` must on"),
+        (4, "`identifier` must be"),
+    ]
+    assert isinstance(info.value, InvalidArgument)
+    assert "3 identifier(s) are invalid" in str(info.value)
+
+
+def test_validate_deadline():
+    assert validate_deadline(None) is None
+    deadline = Deadline(10)
+    assert validate_deadline(deadline) is deadline
+    assert validate_deadline(5).seconds == 5
+    assert validate_deadline(timedelta(minutes=1)).seconds == 60
+
+    for invalid in (0, -1, True, "10"):
+        with pytest.raises(InvalidArgument, match="`timeout`"):
+            validate_deadline(invalid, "timeout")
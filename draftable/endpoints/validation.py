@@ -1,17 +1,20 @@
+import os
+import re
 from datetime import datetime, timedelta, timezone
 
 import requests
 
-from draftable.endpoints.exceptions import InvalidArgument
+from draftable.endpoints.exceptions import InvalidArgument, InvalidIdentifiers
+from draftable.transport.cancellation import CancellationToken
+from draftable.transport.timeouts import Deadline
 
 try:
-    from typing import Any, Union
+    from typing import Any, Iterable, List, Optional, Union
 except ImportError:
     pass
 
-_valid_identifier_characters = set(
-    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-._"
-)
+# Identifiers may only contain ASCII letters, numbers, and the characters "-._".
+_valid_identifier_pattern = re.compile(r"[a-zA-Z0-9\-._]+")
 
 _MIN_ID_LENGTH = 1
 _MAX_ID_LENGTH = 1024
@@ -48,7 +51,7 @@ def validate_identifier(identifier):
             "identifier",
             f"`identifier` must be between {_MIN_ID_LENGTH} and {_MAX_ID_LENGTH} characters long.",
         )
-    if not all(c in _valid_identifier_characters for c in identifier):
+    if _valid_identifier_pattern.fullmatch(identifier) is None:
         raise InvalidArgument(
             "identifier",
             '`identifier` must only contain ASCII letters, numbers, and the characters "-._".',
@@ -56,6 +59,36 @@ def validate_identifier(identifier):
     return identifier
 
 
+def validate_identifiers(identifiers):
+    # type: (Iterable[str]) -> List[str]
+    """Validates many identifiers, reporting every invalid identifier at once.
+
+    :return: the identifiers, as a list
+    :raises InvalidIdentifiers: if any of the identifiers are invalid
+    """
+    identifiers = list(identifiers)
+    invalid = []
+
+    fullmatch = _valid_identifier_pattern.fullmatch
+    for index, identifier in enumerate(identifiers):
+        # Only identifiers failing this quick check need the full validation, which
+        # determines the error message.
+        if (
+            isinstance(identifier, str)
+            and len(identifier) <= _MAX_ID_LENGTH
+            and fullmatch(identifier) is not None
+        ):
+            continue
+        try:
+            validate_identifier(identifier)
+        except InvalidArgument as ex:
+            invalid.append((index, identifier, str(ex)))
+
+    if invalid:
+        raise InvalidIdentifiers(invalid)
+    return identifiers
+
+
 def validate_file_type(file_type):
     # type: (str) -> str
     if not file_type:
@@ -87,6 +120,31 @@ def validate_file(file):
     return file
 
 
+def validate_file_path(path):
+    # type: (Union[str, os.PathLike]) -> str
+    path = os.fspath(path)
+    if not path:
+        raise InvalidArgument("file", "`file` cannot be an empty path.")
+    if not os.path.isfile(path):
+        raise InvalidArgument(
+            "file", f"`file` refers to '{path}' but no such file exists."
+        )
+    return path
+
+
+def validate_buffer(buffer):
+    # type: (Any) -> memoryview
+    view = memoryview(buffer)
+    if not view.nbytes:
+        raise InvalidArgument("file", "`file` cannot be empty.")
+    if not view.c_contiguous:
+        raise InvalidArgument("file", "`file` must be a contiguous buffer.")
+    if view.ndim != 1 or view.format != "B":
+        # Slicing must be by byte.
+        view = view.cast("B")
+    return view
+
+
 def validate_url(url):
     # type: (str) -> str
     if not url:
@@ -143,6 +201,18 @@ def _validate_datetime_or_timedelta(parameter_name, value):
     return value
 
 
+def validate_datetime(parameter_name, value):
+    # type: (str, datetime) -> datetime
+    if not isinstance(value, datetime):
+        raise InvalidArgument(
+            parameter_name, f"`{parameter_name}` must be a datetime."
+        )
+    # As above, naive datetimes are assumed to be in UTC time.
+    if value.utcoffset() is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
 def validate_expires(expires):
     # type: (Union[datetime, timedelta]) -> datetime
     return _validate_datetime_or_timedelta("expires", expires)
@@ -161,3 +231,60 @@ def validate_export_kind(kind):
     if munged_kind not in _allowed_kinds:
         raise InvalidArgument("kind", f'"{kind}" is not a valid file type')
     return munged_kind
+
+
+def validate_page_size(page_size):
+    # type: (int) -> int
+    if isinstance(page_size, bool) or not isinstance(page_size, int):
+        raise InvalidArgument("page_size", "`page_size` must be an integer.")
+    if page_size < 1:
+        raise InvalidArgument("page_size", "`page_size` must be at least 1.")
+    return page_size
+
+
+def validate_prefetch(prefetch):
+    # type: (int) -> int
+    if isinstance(prefetch, bool) or not isinstance(prefetch, int):
+        raise InvalidArgument("prefetch", "`prefetch` must be an integer.")
+    if prefetch < 0:
+        raise InvalidArgument("prefetch", "`prefetch` cannot be negative.")
+    return prefetch
+
+
+def validate_max_workers(max_workers):
+    # type: (int) -> int
+    if isinstance(max_workers, bool) or not isinstance(max_workers, int):
+        raise InvalidArgument("max_workers", "`max_workers` must be an integer.")
+    if max_workers < 1:
+        raise InvalidArgument("max_workers", "`max_workers` must be at least 1.")
+    return max_workers
+
+
+def validate_deadline(deadline, parameter_name="deadline"):
+    # type: (Optional[Union[float, timedelta, Deadline]], str) -> Optional[Deadline]
+    """Converts a number of seconds (or a timedelta) from now to a `Deadline`.
+
+    Deadlines (and None) are returned unchanged, so that a deadline passed on to
+    other calls is only started once.
+    """
+    if deadline is None or isinstance(deadline, Deadline):
+        return deadline
+    if isinstance(deadline, timedelta):
+        deadline = deadline.total_seconds()
+    if isinstance(deadline, bool) or not isinstance(deadline, (int, float)):
+        raise InvalidArgument(
+            parameter_name,
+            f"`{parameter_name}` must be a number of seconds, a timedelta or a Deadline.",
+        )
+    if deadline <= 0:
+        raise InvalidArgument(parameter_name, f"`{parameter_name}` must be positive.")
+    return Deadline(deadline)
+
+
+def validate_cancellation(cancellation):
+    # type: (Optional[CancellationToken]) -> Optional[CancellationToken]
+    if cancellation is not None and not isinstance(cancellation, CancellationToken):
+        raise InvalidArgument(
+            "cancellation", "`cancellation` must be a CancellationToken."
+        )
+    return cancellation
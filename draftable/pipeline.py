@@ -0,0 +1,265 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from .endpoints.comparisons.comparison import Comparison
+from .endpoints.comparisons.sides import FileSide, URLSide
+from .endpoints.exceptions import ComparisonFailed, ExportFailed
+from .endpoints.exports.export import Export
+from .endpoints.validation import (
+    validate_cancellation,
+    validate_export_kind,
+    validate_max_workers,
+)
+from .transport.cancellation import CancellationToken
+
+try:
+    from typing import Any, BinaryIO, Iterable, Iterator, Optional, Set, Union
+except ImportError:
+    pass
+
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class PipelineJob(object):
+    """Describes a comparison to create, export and (optionally) download.
+
+    If a `cancellation` token is given, cancelling it abandons the job at its next
+    cancellation point, and the job's result reports the `Cancelled` error.
+    """
+
+    def __init__(
+        self,
+        left,  # type: Union[str, FileSide, URLSide]
+        right,  # type: Union[str, FileSide, URLSide]
+        dest=None,  # type: Optional[Union[str, BinaryIO]]
+        kind="single_page",  # type: str
+        include_cover_page=False,  # type: bool
+        identifier=None,  # type: Optional[str]
+        public=False,  # type: bool
+        expires=None,  # type: Optional[Union[datetime, timedelta]]
+        cancellation=None,  # type: Optional[CancellationToken]
+    ):
+        self.left = left
+        self.right = right
+        self.dest = dest
+        self.kind = validate_export_kind(kind)
+        self.include_cover_page = include_cover_page
+        self.identifier = identifier
+        self.public = public
+        self.expires = expires
+        self.cancellation = validate_cancellation(cancellation)
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "PipelineJob("
+            f"left={self.left!r}, "
+            f"right={self.right!r}, "
+            f"dest={self.dest!r}, "
+            f"kind={self.kind!r}"
+            ")"
+        )
+
+
+class PipelineResult(object):
+    def __init__(self, job):
+        # type: (PipelineJob) -> None
+        self.job = job
+        self.comparison = None  # type: Optional[Comparison]
+        self.export = None  # type: Optional[Export]
+        self.digest = None  # type: Optional[str]
+        self.error = None  # type: Optional[Exception]
+
+    @property
+    def ok(self):
+        # type: () -> bool
+        return self.error is None
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "PipelineResult("
+            f"job={self.job!r}, "
+            f"comparison={self.comparison!r}, "
+            f"export={self.export!r}, "
+            f"digest={self.digest!r}, "
+            f"error={self.error!r}"
+            ")"
+        )
+
+
+class ComparePipeline(object):
+    """Creates, exports and downloads comparisons, overlapping the stages of many jobs.
+
+    Each stage has its own thread pool, so while one job's export is rendering,
+    another's files can be uploading and a third's export can be downloading. The
+    size of each pool bounds the concurrency of that stage.
+
+    Use as a context manager, or call `close()` when finished.
+    """
+
+    def __init__(
+        self,
+        client,  # type: Any
+        max_uploads=4,  # type: int
+        max_polls=16,  # type: int
+        max_exports=4,  # type: int
+        max_downloads=4,  # type: int
+        poll_interval=DEFAULT_POLL_INTERVAL,  # type: float
+        timeout=None,  # type: Optional[float]
+    ):
+        self.__client = client
+        self.__poll_interval = poll_interval
+        self.__timeout = timeout
+        self.__max_in_flight = (
+            validate_max_workers(max_uploads)
+            + validate_max_workers(max_polls)
+            + validate_max_workers(max_exports)
+            + validate_max_workers(max_downloads)
+        )
+        self.__outstanding = set()  # type: Set[Future]
+        self.__lock = threading.Lock()
+        self.__uploads = ThreadPoolExecutor(max_uploads, "draftable-upload")
+        self.__polls = ThreadPoolExecutor(max_polls, "draftable-poll")
+        self.__exports = ThreadPoolExecutor(max_exports, "draftable-export")
+        self.__downloads = ThreadPoolExecutor(max_downloads, "draftable-download")
+
+    def __enter__(self):
+        # type: () -> ComparePipeline
+        return self
+
+    def __exit__(self, *exc_info):
+        # type: (Any) -> None
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        """Waits for submitted jobs to finish and releases the pipeline's threads."""
+        # Stages submit work to other stages, so wait for whole jobs to finish
+        # before shutting down any of them.
+        with self.__lock:
+            outstanding = list(self.__outstanding)
+        wait(outstanding)
+        for executor in (
+            self.__uploads,
+            self.__polls,
+            self.__exports,
+            self.__downloads,
+        ):
+            executor.shutdown(wait=True)
+
+    def submit(self, job):
+        # type: (PipelineJob) -> Future
+        """Submits a job to the pipeline.
+
+        :return: a future which resolves to the job's `PipelineResult`
+        """
+        future = Future()  # type: Future
+        with self.__lock:
+            self.__outstanding.add(future)
+        future.add_done_callback(self.__discard)
+
+        result = PipelineResult(job)
+        self.__run_stage(self.__uploads, self.__upload, result, future)
+        return future
+
+    def run(self, jobs):
+        # type: (Iterable[PipelineJob]) -> Iterator[PipelineResult]
+        """Runs many jobs through the pipeline, yielding results as jobs finish.
+
+        Jobs are submitted lazily, so that only enough jobs to keep every stage busy
+        are in flight at any time.
+        """
+        jobs = iter(jobs)
+        pending = set()
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < self.__max_in_flight:
+                try:
+                    pending.add(self.submit(next(jobs)))
+                except StopIteration:
+                    exhausted = True
+
+            if not pending:
+                return
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def __discard(self, future):
+        # type: (Future) -> None
+        with self.__lock:
+            self.__outstanding.discard(future)
+
+    def __run_stage(self, executor, stage, result, future):
+        # type: (ThreadPoolExecutor, Any, PipelineResult, Future) -> None
+        def run():
+            try:
+                stage(result, future)
+            except Exception as ex:  # pylint: disable=broad-except
+                result.error = ex
+                future.set_result(result)
+
+        executor.submit(run)
+
+    def __upload(self, result, future):
+        # type: (PipelineResult, Future) -> None
+        job = result.job
+        result.comparison = self.__client.comparisons.create(
+            job.left,
+            job.right,
+            identifier=job.identifier,
+            public=job.public,
+            expires=job.expires,
+            cancellation=job.cancellation,
+        )
+        self.__run_stage(self.__polls, self.__poll_comparison, result, future)
+
+    def __poll_comparison(self, result, future):
+        # type: (PipelineResult, Future) -> None
+        result.comparison = self.__client.comparisons.wait_until_ready(
+            result.comparison.identifier,
+            self.__poll_interval,
+            self.__timeout,
+            cancellation=result.job.cancellation,
+        )
+        if result.comparison.failed:
+            raise ComparisonFailed(result.comparison)
+        self.__run_stage(self.__exports, self.__export, result, future)
+
+    def __export(self, result, future):
+        # type: (PipelineResult, Future) -> None
+        job = result.job
+        result.export = self.__client.exports.create(
+            result.comparison,
+            kind=job.kind,
+            include_cover_page=job.include_cover_page,
+            cancellation=job.cancellation,
+        )
+        self.__run_stage(self.__polls, self.__poll_export, result, future)
+
+    def __poll_export(self, result, future):
+        # type: (PipelineResult, Future) -> None
+        result.export = self.__client.exports.wait_until_ready(
+            result.export.identifier,
+            self.__poll_interval,
+            self.__timeout,
+            cancellation=result.job.cancellation,
+        )
+        if result.export.failed:
+            raise ExportFailed(result.export)
+        if result.job.dest is None:
+            future.set_result(result)
+        else:
+            self.__run_stage(self.__downloads, self.__download, result, future)
+
+    def __download(self, result, future):
+        # type: (PipelineResult, Future) -> None
+        result.digest = self.__client.exports.download(
+            result.export, result.job.dest, cancellation=result.job.cancellation
+        )
+        future.set_result(result)
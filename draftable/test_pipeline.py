@@ -0,0 +1,99 @@
+import io
+import threading
+
+import pytest
+
+from .endpoints.comparisons.comparison import Comparison, ComparisonSide
+from .endpoints.exceptions import ComparisonFailed, InvalidArgument
+from .endpoints.exports.export import Export
+from .pipeline import ComparePipeline, PipelineJob
+
+
+def _comparison(identifier, ready=False, failed=None):
+    side = ComparisonSide("pdf", None, None)
+    return Comparison(
+        identifier, side, side, False, None, None, ready, None, failed, None
+    )
+
+
+def _export(identifier, comparison, ready=False):
+    return Export(
+        identifier, comparison, ready, False, "single_page", "http://x", None, False
+    )
+
+
+class _Comparisons(object):
+    def __init__(self):
+        self.created = []
+        self.lock = threading.Lock()
+
+    def create(
+        self,
+        left,
+        right,
+        identifier=None,
+        public=False,
+        expires=None,
+        cancellation=None,
+    ):
+        with self.lock:
+            self.created.append((left, right))
+        return _comparison(f"{left}-{right}")
+
+    def wait_until_ready(self, identifier, poll_interval, timeout, cancellation=None):
+        return _comparison(identifier, ready=True, failed=identifier == "bad-bad")
+
+
+class _Exports(object):
+    def create(
+        self,
+        comparison,
+        kind="single_page",
+        include_cover_page=False,
+        cancellation=None,
+    ):
+        return _export(f"export-{comparison.identifier}", comparison.identifier)
+
+    def wait_until_ready(self, identifier, poll_interval, timeout, cancellation=None):
+        return _export(identifier, identifier[len("export-") :], ready=True)
+
+    def download(self, export, dest, cancellation=None):
+        dest.write(export.identifier.encode("utf-8"))
+        return "digest"
+
+
+class _Client(object):
+    def __init__(self):
+        self.comparisons = _Comparisons()
+        self.exports = _Exports()
+
+
+def test_pipeline_runs_all_jobs():
+    client = _Client()
+    jobs = [PipelineJob(f"l{i}", f"r{i}", dest=io.BytesIO()) for i in range(20)]
+
+    with ComparePipeline(client, 2, 2, 2, 2) as pipeline:
+        results = list(pipeline.run(jobs))
+
+    assert len(results) == 20
+    assert all(result.ok for result in results)
+    for result in results:
+        assert result.export.ready
+        assert result.digest == "digest"
+        assert result.job.dest.getvalue() == b"export-" + (
+            result.comparison.identifier.encode("utf-8")
+        )
+
+
+def test_pipeline_reports_failures():
+    client = _Client()
+    with ComparePipeline(client) as pipeline:
+        result = pipeline.submit(PipelineJob("bad", "bad")).result()
+    assert not result.ok
+    assert isinstance(result.error, ComparisonFailed)
+    assert result.export is None
+
+
+def test_pipeline_job_validates_kind():
+    with pytest.raises(InvalidArgument):
+        PipelineJob("l", "r", kind="everything")
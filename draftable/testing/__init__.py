@@ -0,0 +1,6 @@
+from .payloads import (
+    generate_change_details,
+    iter_change_details_json,
+    write_change_details,
+)
+from .server import StandInServer
@@ -0,0 +1,360 @@
+import argparse
+import json
+import random
+
+try:
+    from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Tuple, Union
+
+    # A number of words or rectangles: fixed, uniformly distributed between a
+    # minimum and maximum (inclusive), or drawn by calling a function with a
+    # `random.Random`.
+    Distribution = Union[int, Tuple[int, int], Callable[[random.Random], int]]
+except ImportError:
+    pass
+
+
+KINDS = ("insertion", "deletion", "replacement")
+STYLE_KIND = "style"
+
+_FONTS = ("Times New Roman", "Arial", "Calibri", "Helvetica", "Georgia", "Verdana")
+_COLORS = ("#000000", "#1F3864", "#C00000", "#2E74B5", "#7F7F7F", "#00B050")
+_EMPHASES = (None, "bold", "italic", "bold italic", "underline")
+_SIZES = (8, 9, 10, 11, 12, 14, 16, 18, 24)
+_WORDS = (
+    "the of and to in a is that for it as was with be by on not he this are or "
+    "agreement party parties shall term notice payment clause section schedule "
+    "period liability confidential obligations effective date services fees "
+    "written consent pursuant hereto notwithstanding provided including without "
+    "limitation termination warranty indemnify governing law jurisdiction"
+).split()
+
+# Page dimensions in points (US letter), and margins that text stays within.
+_PAGE_WIDTH, _PAGE_HEIGHT, _MARGIN = 612.0, 792.0, 54.0
+_LINE_HEIGHT = 14.0
+
+
+def _sampler(name, distribution):
+    # type: (str, Distribution) -> Callable[[random.Random], int]
+    if callable(distribution):
+        return distribution
+    if isinstance(distribution, int):
+        low = high = distribution
+    else:
+        low, high = distribution
+    if not 0 <= low <= high:
+        raise ValueError(f"`{name}` must be a non-negative count or range of counts.")
+    return lambda rng: rng.randint(low, high)
+
+
+class _Generator(object):
+    """Generates changes one at a time, tallying them for the summary."""
+
+    def __init__(
+        self,
+        change_count,  # type: int
+        page_count,  # type: Optional[int]
+        rectangles_per_region,  # type: Distribution
+        style_count,  # type: int
+        style_rate,  # type: float
+        text_length,  # type: Distribution
+        seed,  # type: Optional[Union[int, str, bytes]]
+    ):
+        # type: (...) -> None
+        if change_count < 0:
+            raise ValueError("`change_count` must not be negative.")
+        if page_count is None:
+            page_count = max(1, change_count // 20)
+        if page_count < 1:
+            raise ValueError("`page_count` must be at least 1.")
+        if style_count < 1:
+            raise ValueError("`style_count` must be at least 1.")
+        if not 0 <= style_rate <= 1:
+            raise ValueError("`style_rate` must be between 0 and 1.")
+
+        self.change_count = change_count
+        self.page_count = page_count
+        self.__rectangles = _sampler("rectangles_per_region", rectangles_per_region)
+        self.__style_rate = style_rate
+        self.__text_length = _sampler("text_length", text_length)
+        self.__rng = random.Random(seed)
+
+        # The distinct styles that style changes switch between.
+        self.__styles = [
+            {
+                "font": self.__rng.choice(_FONTS),
+                "color": self.__rng.choice(_COLORS),
+                "emphasis": self.__rng.choice(_EMPHASES),
+                "size": self.__rng.choice(_SIZES),
+            }
+            for _ in range(style_count)
+        ]
+        self.__tallies = dict.fromkeys(
+            (
+                "insertion",
+                "deletion",
+                "replacement",
+                "deletedLeftWords",
+                "replacedLeftWords",
+                "insertedRightWords",
+                "replacedRightWords",
+                "leftCharacters",
+                "rightCharacters",
+            ),
+            0,
+        )
+
+    def __text(self):
+        # type: () -> Tuple[str, int]
+        words = max(1, self.__text_length(self.__rng))
+        return " ".join(self.__rng.choices(_WORDS, k=words)), words
+
+    def __region(self, page_index):
+        # type: (int) -> dict
+        rng = self.__rng
+        rectangles = []
+        top = round(rng.uniform(_MARGIN, _PAGE_HEIGHT - _MARGIN), 2)
+        for _ in range(max(1, self.__rectangles(rng))):
+            # Consecutive lines of text, wrapping to the top of the page.
+            left = round(rng.uniform(_MARGIN, _PAGE_WIDTH / 2), 2)
+            right = round(rng.uniform(left + 10, _PAGE_WIDTH - _MARGIN), 2)
+            rectangles.append(
+                {"left": left, "top": top, "right": right, "bottom": top + 12.0}
+            )
+            top += _LINE_HEIGHT
+            if top > _PAGE_HEIGHT - _MARGIN:
+                top = _MARGIN
+        return {"pageIndex": page_index, "rectangles": rectangles}
+
+    def changes(self):
+        # type: () -> Iterator[dict]
+        rng = self.__rng
+        tallies = self.__tallies
+        for index in range(self.change_count):
+            # Changes are spread evenly over the pages, in order.
+            page_index = index * self.page_count // self.change_count
+            change = {
+                "kind": None,
+                "leftText": None,
+                "rightText": None,
+                "leftRegion": None,
+                "rightRegion": None,
+                "stylesInfo": None,
+                "deletionMark": None,
+            }
+
+            if rng.random() < self.__style_rate:
+                kind = STYLE_KIND
+                text, words = self.__text()
+                change["leftText"] = change["rightText"] = text
+                change["leftRegion"] = self.__region(page_index)
+                change["rightRegion"] = self.__region(page_index)
+                change["stylesInfo"] = {
+                    "leftStyles": [rng.choice(self.__styles)],
+                    "rightStyles": [rng.choice(self.__styles)],
+                    "leftStyleMap": "0" * len(text),
+                    "rightStyleMap": "0" * len(text),
+                }
+                tallies["leftCharacters"] += len(text)
+                tallies["rightCharacters"] += len(text)
+            else:
+                kind = rng.choice(KINDS)
+                tallies[kind] += 1
+                if kind != "insertion":
+                    text, words = self.__text()
+                    change["leftText"] = text
+                    change["leftRegion"] = self.__region(page_index)
+                    tallies["leftCharacters"] += len(text)
+                    if kind == "deletion":
+                        tallies["deletedLeftWords"] += words
+                    else:
+                        tallies["replacedLeftWords"] += words
+                if kind != "deletion":
+                    text, words = self.__text()
+                    change["rightText"] = text
+                    change["rightRegion"] = self.__region(page_index)
+                    tallies["rightCharacters"] += len(text)
+                    if kind == "insertion":
+                        tallies["insertedRightWords"] += words
+                    else:
+                        tallies["replacedRightWords"] += words
+                if kind == "deletion":
+                    # Marks where the deleted text would have been on the right.
+                    change["deletionMark"] = {
+                        "pageIndex": page_index,
+                        "point": [
+                            rng.randint(int(_MARGIN), int(_PAGE_WIDTH - _MARGIN)),
+                            rng.randint(int(_MARGIN), int(_PAGE_HEIGHT - _MARGIN)),
+                        ],
+                    }
+            change["kind"] = kind
+            yield change
+
+    def summary(self):
+        # type: () -> dict
+        """The summary of the changes, once they've all been generated."""
+        tallies = self.__tallies
+        # Assume the documents are mostly unchanged, with text between each change.
+        matches = self.change_count + 1
+        matching_words = 40 * matches
+        left_words = (
+            matching_words + tallies["deletedLeftWords"] + tallies["replacedLeftWords"]
+        )
+        right_words = (
+            matching_words
+            + tallies["insertedRightWords"]
+            + tallies["replacedRightWords"]
+        )
+        # Roughly six characters per word, including the following space.
+        matching_characters = 6 * matching_words
+        return {
+            "anyChanges": self.change_count > 0,
+            "anyMatches": True,
+            "changeSummary": {
+                "matches": matches,
+                "deletions": tallies["deletion"],
+                "insertions": tallies["insertion"],
+                "replacements": tallies["replacement"],
+                "matchingWords": matching_words,
+                "deletedLeftWords": tallies["deletedLeftWords"],
+                "replacedLeftWords": tallies["replacedLeftWords"],
+                "insertedRightWords": tallies["insertedRightWords"],
+                "replacedRightWords": tallies["replacedRightWords"],
+            },
+            "leftDocumentSummary": {
+                "pageCount": self.page_count,
+                "characterCount": matching_characters + tallies["leftCharacters"],
+                "wordCount": left_words,
+            },
+            "rightDocumentSummary": {
+                "pageCount": self.page_count,
+                "characterCount": matching_characters + tallies["rightCharacters"],
+                "wordCount": right_words,
+            },
+        }
+
+
+def generate_change_details(
+    change_count=100,  # type: int
+    page_count=None,  # type: Optional[int]
+    rectangles_per_region=(1, 3),  # type: Distribution
+    style_count=8,  # type: int
+    style_rate=0.1,  # type: float
+    text_length=(1, 12),  # type: Distribution
+    seed=None,  # type: Optional[Union[int, str, bytes]]
+):
+    # type: (...) -> Dict[str, Any]
+    """Generates a realistic change details response, as returned by the API.
+
+    :param change_count: the number of changes
+    :param page_count: the number of pages the changes are spread over, or None
+        for one page per 20 changes
+    :param rectangles_per_region: the number of rectangles (lines of text) in
+        each region of a change
+    :param style_count: the number of distinct styles used by style changes
+    :param style_rate: the fraction of changes, from 0 to 1, which are style changes
+    :param text_length: the number of words in the text of each change
+    :param seed: a seed to generate the same payload each time, or None
+    :return: the decoded JSON of a change details response
+    """
+    generator = _Generator(
+        change_count,
+        page_count,
+        rectangles_per_region,
+        style_count,
+        style_rate,
+        text_length,
+        seed,
+    )
+    changes = list(generator.changes())
+    return {"changes": changes, "summary": generator.summary()}
+
+
+def iter_change_details_json(
+    change_count=100,  # type: int
+    page_count=None,  # type: Optional[int]
+    rectangles_per_region=(1, 3),  # type: Distribution
+    style_count=8,  # type: int
+    style_rate=0.1,  # type: float
+    text_length=(1, 12),  # type: Distribution
+    seed=None,  # type: Optional[Union[int, str, bytes]]
+):
+    # type: (...) -> Iterator[bytes]
+    """Generates a change details response as encoded JSON, a change at a time, so
+    that large payloads can be written without holding them in memory.
+
+    The JSON is the same as encoding the result of `generate_change_details` with
+    the same arguments using `json.dumps`, and the arguments are as for it.
+    """
+    generator = _Generator(
+        change_count,
+        page_count,
+        rectangles_per_region,
+        style_count,
+        style_rate,
+        text_length,
+        seed,
+    )
+
+    yield b'{"changes": ['
+    separator = b""
+    for change in generator.changes():
+        yield separator + json.dumps(change).encode("utf-8")
+        separator = b", "
+    yield b'], "summary": ' + json.dumps(generator.summary()).encode("utf-8") + b"}"
+
+
+def write_change_details(dest, **kwargs):
+    # type: (Union[str, BinaryIO], Any) -> int
+    """Writes a generated change details response to a file, without holding it in
+    memory.
+
+    :param dest: a file path, or a writable binary stream
+    :param kwargs: arguments as for `generate_change_details`
+    :return: the number of bytes written
+    """
+    if isinstance(dest, str):
+        with open(dest, "wb") as f:
+            return write_change_details(f, **kwargs)
+
+    written = 0
+    for chunk in iter_change_details_json(**kwargs):
+        dest.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def main(argv=None):
+    # type: (Optional[list]) -> None
+    parser = argparse.ArgumentParser(
+        prog="python -m draftable.testing.payloads",
+        description="Writes a generated change details response to a file.",
+    )
+    parser.add_argument("dest", help="the path to write the JSON to")
+    parser.add_argument("--changes", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=None)
+    parser.add_argument(
+        "--rectangles", type=int, nargs=2, default=(1, 3), metavar=("MIN", "MAX")
+    )
+    parser.add_argument("--styles", type=int, default=8)
+    parser.add_argument("--style-rate", type=float, default=0.1)
+    parser.add_argument(
+        "--words", type=int, nargs=2, default=(1, 12), metavar=("MIN", "MAX")
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    written = write_change_details(
+        args.dest,
+        change_count=args.changes,
+        page_count=args.pages,
+        rectangles_per_region=tuple(args.rectangles),
+        style_count=args.styles,
+        style_rate=args.style_rate,
+        text_length=tuple(args.words),
+        seed=args.seed,
+    )
+    print(f"Wrote {written} bytes to {args.dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,760 @@
+import argparse
+import email.parser
+import hashlib
+import json
+import random
+import string
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from ..endpoints.comparisons.signing import SigningContext
+from .payloads import generate_change_details
+
+try:
+    from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+except ImportError:
+    pass
+
+
+DEFAULT_ACCOUNT_ID = "account"
+DEFAULT_AUTH_TOKEN = "token"
+DEFAULT_CHANGE_COUNT = 100
+DEFAULT_EXPORT_SIZE = 64 * 1024
+
+_IDENTIFIER_CHARSET = string.ascii_lowercase
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+# Never set, so waiting on it only times out. Unlike `time.sleep`, this isn't
+# affected by tests which replace `time.sleep` to skip the client's retry delays.
+_never = threading.Event()
+
+
+def _format_time(timestamp):
+    # type: (float) -> str
+    return (
+        datetime.fromtimestamp(timestamp, timezone.utc)
+        .isoformat()
+        .replace("+00:00", "Z")
+    )
+
+
+class StandInServer(object):
+    """A local stand-in for the Draftable API, for testing and benchmarking the
+    client offline.
+
+    The server implements creating, getting, listing and deleting comparisons,
+    their change details and viewer, and creating, getting and downloading exports.
+    Comparisons and exports are kept in memory, and become ready `ready_delay`
+    seconds after they're created. Files are uploaded but their content is
+    discarded, and change details are generated, with `change_count` changes.
+
+    To simulate a real deployment, each request can be delayed by `latency`
+    seconds, and a random `failure_rate` of requests fail with one of the
+    `failure_statuses`. A `seed` makes the failures (and generated content)
+    repeatable.
+
+    The server runs in background threads of the current process::
+
+        with StandInServer(latency=0.05, failure_rate=0.1) as server:
+            client = Client(server.account_id, server.auth_token, server.base_url)
+
+    It can also run as a separate process, e.g. to keep it from competing with
+    the client for the GIL: `python -m draftable.testing.server --port 8000`.
+    """
+
+    def __init__(
+        self,
+        account_id=DEFAULT_ACCOUNT_ID,  # type: str
+        auth_token=DEFAULT_AUTH_TOKEN,  # type: str
+        latency=0.0,  # type: float
+        ready_delay=0.0,  # type: float
+        failure_rate=0.0,  # type: float
+        failure_statuses=(503,),  # type: Sequence[int]
+        comparison_failure_rate=0.0,  # type: float
+        change_count=DEFAULT_CHANGE_COUNT,  # type: int
+        export_size=DEFAULT_EXPORT_SIZE,  # type: int
+        seed=None,  # type: Optional[int]
+        host="127.0.0.1",  # type: str
+        port=0,  # type: int
+    ):
+        # type: (...) -> None
+        """
+        :param account_id: the account ID that clients must use
+        :param auth_token: the auth token that clients must use
+        :param latency: the number of seconds to delay each response by
+        :param ready_delay: the number of seconds after being created that
+            comparisons and exports become ready
+        :param failure_rate: the fraction of requests, from 0 to 1, which fail
+        :param failure_statuses: the HTTP statuses that failing requests respond
+            with, chosen at random
+        :param comparison_failure_rate: the fraction of comparisons, from 0 to 1,
+            which fail once processed, rather than becoming ready
+        :param change_count: the number of changes in each comparison's change details
+        :param export_size: the number of bytes in each export
+        :param seed: a seed for the random failures and content, or None
+        :param host: the interface to listen on
+        :param port: the port to listen on, or 0 for any free port
+        """
+        if latency < 0 or ready_delay < 0:
+            raise ValueError("`latency` and `ready_delay` must not be negative.")
+        for name, rate in (
+            ("failure_rate", failure_rate),
+            ("comparison_failure_rate", comparison_failure_rate),
+        ):
+            if not 0 <= rate <= 1:
+                raise ValueError(f"`{name}` must be between 0 and 1.")
+        if failure_rate and not failure_statuses:
+            raise ValueError("`failure_statuses` must not be empty.")
+        if change_count < 0 or export_size < 0:
+            raise ValueError("`change_count` and `export_size` must not be negative.")
+
+        self.__account_id = str(account_id)
+        self.__auth_token = str(auth_token)
+        self.latency = float(latency)
+        self.ready_delay = float(ready_delay)
+        self.failure_rate = float(failure_rate)
+        self.failure_statuses = tuple(failure_statuses)
+        self.comparison_failure_rate = float(comparison_failure_rate)
+        self.change_count = int(change_count)
+        self.export_size = int(export_size)
+        self.__seed = seed
+        self.__random = random.Random(seed)
+        self.__signing = SigningContext(self.__account_id, self.__auth_token)
+
+        self.__lock = threading.Lock()
+        self.__comparisons = {}  # type: Dict[str, dict]
+        self.__exports = {}  # type: Dict[str, dict]
+        self.__request_counts = {}  # type: Dict[str, int]
+
+        self.__httpd = _HTTPServer((host, port), _Handler)
+        self.__httpd.stand_in = self
+        self.__thread = None  # type: Optional[threading.Thread]
+
+    @property
+    def account_id(self):
+        # type: () -> str
+        return self.__account_id
+
+    @property
+    def auth_token(self):
+        # type: () -> str
+        return self.__auth_token
+
+    @property
+    def port(self):
+        # type: () -> int
+        return self.__httpd.server_port
+
+    @property
+    def base_url(self):
+        # type: () -> str
+        """The base URL to give to `Client`."""
+        host = self.__httpd.server_address[0]
+        return f"http://{host}:{self.port}/v1"
+
+    @property
+    def request_counts(self):
+        # type: () -> Dict[str, int]
+        """The number of requests received, by method and route, e.g. "GET comparison"."""
+        with self.__lock:
+            return dict(self.__request_counts)
+
+    def start(self):
+        # type: () -> StandInServer
+        """Starts serving requests in a background thread."""
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__httpd.serve_forever, args=(0.01,), daemon=True
+            )
+            self.__thread.start()
+        return self
+
+    def serve_forever(self):
+        # type: () -> None
+        """Serves requests in the current thread until interrupted."""
+        self.__httpd.serve_forever()
+
+    def stop(self):
+        # type: () -> None
+        """Stops serving requests and closes the listening socket."""
+        if self.__thread is not None:
+            self.__httpd.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__httpd.server_close()
+
+    def reset(self):
+        # type: () -> None
+        """Forgets all comparisons, exports and request counts."""
+        with self.__lock:
+            self.__comparisons.clear()
+            self.__exports.clear()
+            self.__request_counts.clear()
+
+    def __enter__(self):
+        # type: () -> StandInServer
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        # type: (Any) -> None
+        self.stop()
+
+    def __repr__(self):
+        # type: () -> str
+        return f"StandInServer(base_url={self.base_url!r})"
+
+    # The methods below are called by request handlers, from the server's threads.
+
+    def _record_request(self, route):
+        # type: (str) -> Optional[int]
+        """Counts a request, and returns the status to fail it with, if any."""
+        with self.__lock:
+            self.__request_counts[route] = self.__request_counts.get(route, 0) + 1
+            if self.failure_rate and self.__random.random() < self.failure_rate:
+                return self.__random.choice(self.failure_statuses)
+        return None
+
+    def _delay(self):
+        # type: () -> None
+        if self.latency:
+            _never.wait(self.latency)
+
+    def _authenticate(self, authorization):
+        # type: (Optional[str]) -> bool
+        return authorization == f"Token {self.__auth_token}"
+
+    def _verify_viewer_url(self, url):
+        # type: (str) -> bool
+        return self.__signing.verify(url)
+
+    def _create_comparison(self, data):
+        # type: (dict) -> Tuple[int, dict]
+        errors = {}
+        for side_name in ("left", "right"):
+            side = data.get(side_name)
+            if not isinstance(side, dict) or not side.get("file_type"):
+                errors[side_name] = ["A side with a `file_type` is required."]
+            elif not side.get("source_url") and not side.get("file"):
+                errors[side_name] = ["Either a `source_url` or `file` is required."]
+        if errors:
+            return 400, errors
+
+        now = time.time()
+        with self.__lock:
+            identifier = data.get("identifier")
+            if identifier:
+                if identifier in self.__comparisons:
+                    return 400, {
+                        "identifier": [
+                            "A comparison with this identifier already exists."
+                        ]
+                    }
+            else:
+                identifier = self.__new_identifier(self.__comparisons)
+            failed = self.__random.random() < self.comparison_failure_rate
+            self.__comparisons[identifier] = {
+                "identifier": identifier,
+                "left": self.__side(data["left"]),
+                "right": self.__side(data["right"]),
+                "public": data.get("public") in (True, "true", "True"),
+                "creation_time": now,
+                "expiry_time": data.get("expiry_time") or None,
+                "will_fail": failed,
+            }
+            return 201, self.__comparison_response(identifier, now)
+
+    def _get_comparison(self, identifier):
+        # type: (str) -> Optional[dict]
+        with self.__lock:
+            if identifier not in self.__comparisons:
+                return None
+            return self.__comparison_response(identifier, time.time())
+
+    def _list_comparisons(self):
+        # type: () -> List[dict]
+        now = time.time()
+        with self.__lock:
+            comparisons = sorted(
+                self.__comparisons.values(),
+                key=lambda comparison: comparison["creation_time"],
+                reverse=True,
+            )
+            return [
+                self.__comparison_response(comparison["identifier"], now)
+                for comparison in comparisons
+            ]
+
+    def _delete_comparison(self, identifier):
+        # type: (str) -> bool
+        with self.__lock:
+            return self.__comparisons.pop(identifier, None) is not None
+
+    def _change_details(self, identifier):
+        # type: (str) -> Tuple[int, dict]
+        comparison = self._get_comparison(identifier)
+        if comparison is None:
+            return 404, {"detail": "Not found."}
+        if comparison["failed"]:
+            return 400, {"detail": "The comparison failed."}
+        if not comparison["ready"]:
+            return 400, {"detail": "The comparison is not ready yet."}
+        # Derived from the identifier, so each request for a comparison's change
+        # details returns the same content.
+        return 200, generate_change_details(
+            self.change_count, seed=f"{self.__seed}:{identifier}"
+        )
+
+    def _create_export(self, data, base_url):
+        # type: (dict, str) -> Tuple[int, dict]
+        comparison = self._get_comparison(str(data.get("comparison")))
+        if comparison is None:
+            return 400, {"comparison": ["No comparison has this identifier."]}
+        now = time.time()
+        with self.__lock:
+            identifier = self.__new_identifier(self.__exports)
+            self.__exports[identifier] = {
+                "identifier": identifier,
+                "comparison": comparison["identifier"],
+                "kind": data.get("kind", "single_page"),
+                "include_cover_page": bool(data.get("include_cover_page")),
+                "creation_time": now,
+                "url": f"{base_url}/exports/{identifier}/download",
+            }
+            return 201, self.__export_response(identifier, now)
+
+    def _get_export(self, identifier):
+        # type: (str) -> Optional[dict]
+        with self.__lock:
+            if identifier not in self.__exports:
+                return None
+            return self.__export_response(identifier, time.time())
+
+    def _export_content(self, identifier):
+        # type: (str) -> bytes
+        # Deterministic content, so downloads can be checked and resumed.
+        block = hashlib.sha256(identifier.encode("utf-8")).digest() * 128
+        repeats = self.export_size // len(block) + 1
+        return (b"%PDF-1.7\n" + block * repeats)[: self.export_size]
+
+    def __new_identifier(self, existing):
+        # type: (Dict[str, dict]) -> str
+        while True:
+            identifier = "".join(
+                self.__random.choice(_IDENTIFIER_CHARSET) for _ in range(12)
+            )
+            if identifier not in existing:
+                return identifier
+
+    @staticmethod
+    def __side(side):
+        # type: (dict) -> dict
+        result = {"file_type": side["file_type"]}
+        if side.get("source_url"):
+            result["source_url"] = side["source_url"]
+        if side.get("display_name"):
+            result["display_name"] = side["display_name"]
+        return result
+
+    def __comparison_response(self, identifier, now):
+        # type: (str, float) -> dict
+        comparison = self.__comparisons[identifier]
+        ready_time = comparison["creation_time"] + self.ready_delay
+        ready = now >= ready_time
+        failed = ready and comparison["will_fail"]
+        response = {
+            "identifier": identifier,
+            "left": comparison["left"],
+            "right": comparison["right"],
+            "public": comparison["public"],
+            "creation_time": _format_time(comparison["creation_time"]),
+            "ready": ready,
+            "failed": failed,
+        }
+        if comparison["expiry_time"]:
+            response["expiry_time"] = comparison["expiry_time"]
+        if ready:
+            response["ready_time"] = _format_time(ready_time)
+        if failed:
+            response["error_message"] = "The stand-in server failed the comparison."
+        return response
+
+    def __export_response(self, identifier, now):
+        # type: (str, float) -> dict
+        export = self.__exports[identifier]
+        comparison = self.__comparisons.get(export["comparison"])
+        ready = now >= export["creation_time"] + self.ready_delay and (
+            comparison is not None
+            and now >= comparison["creation_time"] + self.ready_delay
+        )
+        failed = comparison is None or (ready and comparison["will_fail"])
+        response = {
+            "identifier": identifier,
+            "comparison": export["comparison"],
+            "kind": export["kind"],
+            "include_cover_page": export["include_cover_page"],
+            "ready": ready and not failed,
+            "failed": failed,
+            # The download URL is known from creation, as the client expects.
+            "url": export["url"],
+        }
+        if failed:
+            response["error_message"] = "The comparison failed."
+        return response
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once.
+    request_queue_size = 128
+    stand_in = None  # type: Optional[StandInServer]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "DraftableStandIn/1.0"
+    # Headers and body are written separately, which Nagle's algorithm would delay
+    # until the client acknowledges the headers.
+    disable_nagle_algorithm = True
+
+    @property
+    def stand_in(self):
+        # type: () -> StandInServer
+        return self.server.stand_in
+
+    def do_GET(self):
+        # type: () -> None
+        self.__handle("GET")
+
+    def do_POST(self):
+        # type: () -> None
+        self.__handle("POST")
+
+    def do_DELETE(self):
+        # type: () -> None
+        self.__handle("DELETE")
+
+    def log_message(self, *args):
+        # type: (Any) -> None
+        pass
+
+    def __handle(self, method):
+        # type: (str) -> None
+        _, _, path, query, _ = urlsplit(self.path)
+        parts = [part for part in path.split("/") if part]
+        route, arguments = _route(method, parts)
+
+        # Read any body first, so the connection can be reused whatever the response.
+        try:
+            body = self.__read_body()
+        except ConnectionError:
+            self.close_connection = True
+            return
+        except ValueError as ex:
+            self.__respond_json(400, {"detail": str(ex)})
+            return
+
+        stand_in = self.stand_in
+        failure_status = stand_in._record_request(route)
+        stand_in._delay()
+        if failure_status is not None:
+            self.__respond_json(failure_status, {"detail": "Injected failure."})
+            return
+
+        public = route in ("GET viewer", "GET export download")
+        if not public and not stand_in._authenticate(self.headers.get("Authorization")):
+            self.__respond_json(
+                401, {"detail": "Invalid token header. No credentials provided."}
+            )
+            return
+
+        handler = getattr(self, "_route_" + route.replace(" ", "_").lower(), None)
+        if handler is None:
+            self.__respond_json(404, {"detail": "Not found."})
+            return
+        try:
+            handler(*arguments, query=parse_qs(query), body=body)
+        except ValueError as ex:
+            self.__respond_json(400, {"detail": str(ex)})
+
+    # Routes, named after the method and route returned by `_route`.
+
+    def _route_get_comparisons(self, query, body):
+        # type: (dict, bytes) -> None
+        results = self.stand_in._list_comparisons()
+        for name in ("ready", "failed"):
+            if name in query:
+                value = query[name][0] == "true"
+                results = [result for result in results if result[name] == value]
+        if "limit" not in query:
+            self.__respond_json(200, {"count": len(results), "results": results})
+            return
+
+        limit = int(query["limit"][0])
+        offset = int(query.get("offset", ["0"])[0])
+        if limit <= 0 or offset < 0:
+            raise ValueError("`limit` must be positive and `offset` not negative.")
+        next_url = None
+        if offset + limit < len(results):
+            parameters = {key: values[0] for key, values in query.items()}
+            parameters["offset"] = str(offset + limit)
+            next_url = f"{self.__base_url()}/comparisons?{urlencode(parameters)}"
+        self.__respond_json(
+            200,
+            {
+                "count": len(results),
+                "next": next_url,
+                "results": results[offset : offset + limit],
+            },
+        )
+
+    def _route_post_comparisons(self, query, body):
+        # type: (dict, bytes) -> None
+        status, response = self.stand_in._create_comparison(self.__parse_body(body))
+        self.__respond_json(status, response)
+
+    def _route_get_comparison(self, identifier, query, body):
+        # type: (str, dict, bytes) -> None
+        comparison = self.stand_in._get_comparison(identifier)
+        if comparison is None:
+            self.__respond_json(404, {"detail": "Not found."})
+        else:
+            self.__respond_json(200, comparison, conditional=True)
+
+    def _route_delete_comparison(self, identifier, query, body):
+        # type: (str, dict, bytes) -> None
+        if self.stand_in._delete_comparison(identifier):
+            self.__respond(204, b"", None)
+        else:
+            self.__respond_json(404, {"detail": "Not found."})
+
+    def _route_get_change_details(self, identifier, query, body):
+        # type: (str, dict, bytes) -> None
+        status, response = self.stand_in._change_details(identifier)
+        self.__respond_json(status, response)
+
+    def _route_get_viewer(self, account_id, identifier, query, body):
+        # type: (str, str, dict, bytes) -> None
+        comparison = self.stand_in._get_comparison(identifier)
+        if comparison is None or account_id != self.stand_in.account_id:
+            self.__respond(404, b"<h1>Not found</h1>", "text/html")
+            return
+        if not comparison["public"] and not self.stand_in._verify_viewer_url(
+            f"http://{self.headers.get('Host', '')}{self.path}"
+        ):
+            self.__respond(403, b"<h1>Invalid or expired signature</h1>", "text/html")
+            return
+        content = f"<h1>Comparison {identifier}</h1>".encode("utf-8")
+        self.__respond(200, content, "text/html")
+
+    def _route_post_exports(self, query, body):
+        # type: (dict, bytes) -> None
+        status, response = self.stand_in._create_export(
+            self.__parse_body(body), self.__base_url()
+        )
+        self.__respond_json(status, response)
+
+    def _route_get_export(self, identifier, query, body):
+        # type: (str, dict, bytes) -> None
+        export = self.stand_in._get_export(identifier)
+        if export is None:
+            self.__respond_json(404, {"detail": "Not found."})
+        else:
+            self.__respond_json(200, export)
+
+    def _route_get_export_download(self, identifier, query, body):
+        # type: (str, dict, bytes) -> None
+        export = self.stand_in._get_export(identifier)
+        if export is None or not export["ready"]:
+            self.__respond(404, b"Not found", "text/plain")
+            return
+
+        content = self.stand_in._export_content(identifier)
+        range_header = self.headers.get("Range", "")
+        if range_header.startswith("bytes=") and range_header.endswith("-"):
+            start = int(range_header[len("bytes=") : -1])
+            if start >= len(content):
+                self.__respond(416, b"", "text/plain")
+                return
+            content_range = f"bytes {start}-{len(content) - 1}/{len(content)}"
+            self.__respond(
+                206,
+                content[start:],
+                "application/pdf",
+                {"Content-Range": content_range},
+            )
+            return
+        self.__respond(200, content, "application/pdf", {"Accept-Ranges": "bytes"})
+
+    # Helpers
+
+    def __base_url(self):
+        # type: () -> str
+        return f"http://{self.headers.get('Host', '')}/v1"
+
+    def __read_body(self):
+        # type: () -> bytes
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                chunk = self.rfile.read(size + 2)[:size]
+                if not size:
+                    break
+                chunks.append(chunk)
+            body = b"".join(chunks)
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        encoding = self.headers.get("Content-Encoding")
+        if encoding in _WBITS:
+            try:
+                body = zlib.decompress(body, _WBITS[encoding])
+            except zlib.error as ex:
+                raise ValueError(str(ex)) from ex
+        return body
+
+    def __parse_body(self, body):
+        # type: (bytes) -> dict
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            return _parse_multipart(content_type, body)
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError as ex:
+            raise ValueError(f"JSON parse error - {ex}") from ex
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object.")
+        return data
+
+    def __respond_json(self, status, data, conditional=False):
+        # type: (int, Union[dict, list], bool) -> None
+        content = json.dumps(data).encode("utf-8")
+        headers = {}
+        if conditional:
+            etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                self.__respond(304, b"", None, headers)
+                return
+        self.__respond(status, content, "application/json", headers)
+
+    def __respond(self, status, content, content_type, headers=None):
+        # type: (int, bytes, Optional[str], Optional[Dict[str, str]]) -> None
+        try:
+            self.send_response(status)
+            if content_type is not None:
+                self.send_header("Content-Type", content_type)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if status not in (204, 304):
+                self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            if self.command != "HEAD" and status not in (204, 304):
+                self.wfile.write(content)
+        except ConnectionError:
+            # The client abandoned the request, e.g. because it timed out.
+            self.close_connection = True
+
+
+def _route(method, parts):
+    # type: (str, List[str]) -> Tuple[str, List[str]]
+    # Returns the name of the route for a request and the arguments in its path.
+    if parts[:1] == ["v1"]:
+        parts = parts[1:]
+    if parts[:1] == ["comparisons"]:
+        if len(parts) == 1:
+            return f"{method} comparisons", []
+        if len(parts) == 4 and parts[1] == "viewer":
+            return f"{method} viewer", parts[2:]
+        if len(parts) == 2:
+            return f"{method} comparison", parts[1:]
+        if len(parts) == 3 and parts[2] == "change-details":
+            return f"{method} change details", parts[1:2]
+    elif parts[:1] == ["exports"]:
+        if len(parts) == 1:
+            return f"{method} exports", []
+        if len(parts) == 2:
+            return f"{method} export", parts[1:]
+        if len(parts) == 3 and parts[2] == "download":
+            return f"{method} export download", parts[1:2]
+    return f"{method} unknown", []
+
+
+def _parse_multipart(content_type, body):
+    # type: (str, bytes) -> dict
+    # Nested fields are flattened by the client as "left.file_type", etc. Files'
+    # content is replaced by its length, as only its presence matters.
+    message = email.parser.BytesParser().parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    if not message.is_multipart():
+        raise ValueError("Multipart form parse error.")
+    data = {}  # type: Dict[str, Any]
+    for part in message.get_payload():
+        name = part.get_param("name", header="content-disposition")
+        if not name:
+            continue
+        content = part.get_payload(decode=True) or b""
+        if part.get_filename() is not None:
+            value = len(content)  # type: Any
+        else:
+            value = content.decode("utf-8")
+        target = data
+        *parents, key = name.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+    return data
+
+
+def main(argv=None):
+    # type: (Optional[List[str]]) -> None
+    parser = argparse.ArgumentParser(
+        prog="python -m draftable.testing.server",
+        description="Runs a local stand-in for the Draftable API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--account-id", default=DEFAULT_ACCOUNT_ID)
+    parser.add_argument("--auth-token", default=DEFAULT_AUTH_TOKEN)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--ready-delay", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--failure-statuses", type=int, nargs="+", default=[503], metavar="STATUS"
+    )
+    parser.add_argument("--comparison-failure-rate", type=float, default=0.0)
+    parser.add_argument("--change-count", type=int, default=DEFAULT_CHANGE_COUNT)
+    parser.add_argument("--export-size", type=int, default=DEFAULT_EXPORT_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = StandInServer(
+        account_id=args.account_id,
+        auth_token=args.auth_token,
+        latency=args.latency,
+        ready_delay=args.ready_delay,
+        failure_rate=args.failure_rate,
+        failure_statuses=args.failure_statuses,
+        comparison_failure_rate=args.comparison_failure_rate,
+        change_count=args.change_count,
+        export_size=args.export_size,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Serving the Draftable API stand-in at {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
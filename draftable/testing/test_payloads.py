@@ -0,0 +1,81 @@
+import inspect
+import io
+import json
+
+import pytest
+
+from ..endpoints.comparisons.changes import change_details_from_response
+from .payloads import (
+    generate_change_details,
+    iter_change_details_json,
+    write_change_details,
+)
+
+
+def test_generate_change_details():
+    data = generate_change_details(
+        500, page_count=10, rectangles_per_region=3, style_rate=0.2, seed=1
+    )
+    assert len(data["changes"]) == 500
+    assert data == generate_change_details(
+        500, page_count=10, rectangles_per_region=3, style_rate=0.2, seed=1
+    )
+
+    details = change_details_from_response(data)
+    assert len(details.changes) == 500
+    assert details.summary.leftDocumentSummary.pageCount == 10
+    pages = {
+        change.leftRegion.pageIndex for change in details.changes if change.leftRegion
+    }
+    assert pages == set(range(10))
+    for change in details.changes:
+        for region in (change.leftRegion, change.rightRegion):
+            if region is not None:
+                assert len(region.rectangles) == 3
+
+    kinds = [change.kind for change in details.changes]
+    summary = details.summary.changeSummary
+    assert summary.insertions == kinds.count("insertion")
+    assert summary.deletions == kinds.count("deletion")
+    assert summary.replacements == kinds.count("replacement")
+    assert 50 < kinds.count("style") < 150
+
+
+def test_distributions():
+    data = generate_change_details(200, style_rate=0, text_length=lambda rng: 5, seed=2)
+    for change in data["changes"]:
+        for text in (change["leftText"], change["rightText"]):
+            assert text is None or len(text.split()) == 5
+
+    with pytest.raises(ValueError):
+        generate_change_details(10, text_length=(5, 1))
+    with pytest.raises(ValueError):
+        generate_change_details(10, style_rate=2)
+
+
+def test_iter_change_details_json():
+    kwargs = dict(change_count=300, style_count=3, seed=3)
+    content = b"".join(iter_change_details_json(**kwargs))
+    assert content == json.dumps(generate_change_details(**kwargs)).encode("utf-8")
+
+    assert json.loads(b"".join(iter_change_details_json(change_count=0))) == {
+        "changes": [],
+        "summary": generate_change_details(0)["summary"],
+    }
+    with pytest.raises(TypeError):
+        list(iter_change_details_json(changes=1))
+    # The defaults must be the same for the JSON to be the same.
+    assert inspect.signature(iter_change_details_json).parameters == (
+        inspect.signature(generate_change_details).parameters
+    )
+
+
+def test_write_change_details(tmp_path):
+    path = tmp_path / "changes.json"
+    written = write_change_details(str(path), change_count=1000, seed=4)
+    assert written == path.stat().st_size
+    assert len(json.loads(path.read_bytes())["changes"]) == 1000
+
+    sink = io.BytesIO()
+    write_change_details(sink, change_count=1000, seed=4)
+    assert sink.getvalue() == path.read_bytes()
@@ -0,0 +1,179 @@
+import io
+import subprocess
+import sys
+import time
+
+import pytest
+import requests
+
+from ..client import Client
+from ..endpoints.exceptions import BadRequest, ChecksumMismatch, NotFound
+from ..transport import UploadCompression
+from .server import StandInServer
+
+
+@pytest.fixture
+def server():
+    with StandInServer(seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    return Client(server.account_id, server.auth_token, server.base_url)
+
+
+def test_comparisons(client):
+    comparison = client.comparisons.create(
+        "https://example.com/left.pdf", "https://example.com/right.pdf", "abc"
+    )
+    assert comparison.identifier == "abc"
+    assert comparison.ready
+    assert comparison.left.file_type == "pdf"
+    assert comparison.left.source_url == "https://example.com/left.pdf"
+
+    with pytest.raises(BadRequest):
+        client.comparisons.create(
+            "https://example.com/left.pdf", "https://example.com/right.pdf", "abc"
+        )
+
+    assert client.comparisons.get("abc").identifier == "abc"
+    client.comparisons.delete("abc")
+    with pytest.raises(NotFound):
+        client.comparisons.get("abc")
+
+
+def test_upload(server, tmp_path):
+    client = Client(
+        server.account_id,
+        server.auth_token,
+        server.base_url,
+        upload_compression=UploadCompression(threshold=0),
+    )
+    path = tmp_path / "left.txt"
+    path.write_bytes(b"left " * 1000)
+    comparison = client.comparisons.create(str(path), "https://example.com/right.pdf")
+    assert comparison.left.file_type == "txt"
+    assert comparison.right.file_type == "pdf"
+
+
+def test_list(client):
+    for index in range(5):
+        client.comparisons.create(
+            "https://example.com/left.pdf", "https://example.com/right.pdf", f"c{index}"
+        )
+    assert len(client.comparisons.all()) == 5
+    identifiers = [
+        comparison.identifier for comparison in client.comparisons.iter_all(page_size=2)
+    ]
+    assert sorted(identifiers) == [f"c{index}" for index in range(5)]
+
+
+def test_readiness_and_change_details(server, client):
+    server.ready_delay = 0.2
+    server.change_count = 25
+    client.comparisons.create(
+        "https://example.com/left.pdf", "https://example.com/right.pdf", "abc"
+    )
+    assert not client.comparisons.get("abc").ready
+    assert client.comparisons.change_details("abc") is None
+
+    client.comparisons.wait_until_ready("abc", poll_interval=0.05, timeout=5)
+    details = client.comparisons.change_details("abc")
+    assert len(details.changes) == 25
+    # Generated content is the same each time.
+    assert details.to_dict() == client.comparisons.change_details("abc").to_dict()
+
+
+def test_exports(client):
+    client.comparisons.create(
+        "https://example.com/left.pdf", "https://example.com/right.pdf", "abc"
+    )
+    export = client.exports.create("abc", kind="combined")
+    assert export.ready
+    assert client.exports.get(export.identifier).kind == "combined"
+
+    sink = io.BytesIO()
+    client.exports.download(export, sink)
+    assert sink.getvalue().startswith(b"%PDF")
+    assert len(sink.getvalue()) == 64 * 1024
+
+
+def test_export_checksum_mismatch(client, tmp_path):
+    client.comparisons.create(
+        "https://example.com/left.pdf", "https://example.com/right.pdf", "abc"
+    )
+    export = client.exports.create("abc")
+    dest = tmp_path / "export.pdf"
+    digest = client.exports.download(export, dest)
+    assert dest.stat().st_size == 64 * 1024
+
+    with pytest.raises(ChecksumMismatch):
+        client.exports.download(export, dest, expected_digest="0" * len(digest))
+    assert not dest.exists()
+
+
+def test_exports_not_ready(server, client):
+    server.ready_delay = 0.2
+    client.comparisons.create(
+        "https://example.com/left.pdf", "https://example.com/right.pdf", "abc"
+    )
+    export = client.exports.create("abc")
+    assert not export.ready
+    assert export.url.endswith(f"/exports/{export.identifier}/download")
+    assert client.exports.wait_until_ready(export.identifier, 0.05).ready
+
+
+def test_viewer(client):
+    client.comparisons.create(
+        "https://example.com/left.pdf", "https://example.com/right.pdf", "abc"
+    )
+    assert requests.get(client.comparisons.signed_viewer_url("abc")).status_code == 200
+    assert requests.get(client.comparisons.public_viewer_url("abc")).status_code == 403
+
+
+def test_authentication(server):
+    client = Client(server.account_id, "wrong", server.base_url)
+    with pytest.raises(BadRequest) as info:
+        client.comparisons.all()
+    assert info.value.status_code == 401
+
+
+def test_failure_injection(server):
+    server.failure_rate = 0.5
+    client = Client(server.account_id, server.auth_token, server.base_url)
+    failures = 0
+    for _ in range(20):
+        try:
+            client.comparisons.all()
+        except BadRequest as ex:
+            assert ex.status_code == 503
+            failures += 1
+    assert 0 < failures < 20
+    assert server.request_counts["GET comparisons"] == 20
+
+
+def test_retries_recover_from_failures(server, monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    server.failure_rate = 0.3
+    client = Client(
+        server.account_id, server.auth_token, server.base_url, max_retries=10
+    )
+    for _ in range(10):
+        client.comparisons.all()
+    assert server.request_counts["GET comparisons"] > 10
+
+
+def test_subprocess():
+    process = subprocess.Popen(
+        [sys.executable, "-m", "draftable.testing.server", "--port", "0"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        base_url = process.stdout.readline().split()[-1]
+        client = Client("account", "token", base_url)
+        assert client.comparisons.all() == []
+    finally:
+        process.terminate()
+        process.wait(10)
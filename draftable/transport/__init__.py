@@ -1 +1,13 @@
-from .rest_client import RESTClient
+from .cancellation import CancellationToken, CancelledError
+from .compression import UploadCompression
+from .decoding import JSON_BACKENDS
+from .instrumentation import (
+    CompositeInstrumentation,
+    Instrumentation,
+    MetricsInstrumentation,
+    OpenTelemetryInstrumentation,
+    RequestInfo,
+)
+from .rest_client import DEFAULT_MAX_CONNECTIONS, RESTClient
+from .stats import TransportStats
+from .timeouts import Deadline, DeadlineExceededError, Timeouts
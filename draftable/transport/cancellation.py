@@ -0,0 +1,74 @@
+import threading
+
+import requests
+
+try:
+    from typing import Optional
+except ImportError:
+    pass
+
+
+class CancelledError(requests.exceptions.RequestException):
+    """Raised when an operation is abandoned because its token was cancelled."""
+
+
+class CancellationToken(object):
+    """Cancels operations from another thread.
+
+    Cancellation is cooperative: a cancelled operation stops at its next
+    cancellation point, which is before each request, between the chunks of an
+    upload or download, and while waiting to retry a request or poll for a
+    comparison or export. A request waiting for the server to respond isn't
+    interrupted, but is bounded by its timeouts.
+
+    A token may be shared by several operations, e.g. all of those making up a
+    job, which are all cancelled together. Tokens can't be reset.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.__event = threading.Event()
+        self.__reason = None  # type: Optional[str]
+
+    def cancel(self, reason=None):
+        # type: (Optional[str]) -> None
+        """Cancels the operations using this token. Cancelling again has no effect.
+
+        :param reason: a description of why, which is included in the exception
+            raised by the cancelled operations
+        """
+        if not self.__event.is_set():
+            self.__reason = reason
+            self.__event.set()
+
+    @property
+    def cancelled(self):
+        # type: () -> bool
+        return self.__event.is_set()
+
+    @property
+    def reason(self):
+        # type: () -> Optional[str]
+        return self.__reason
+
+    def check(self):
+        # type: () -> None
+        """Raises `CancelledError` if the token has been cancelled."""
+        if self.__event.is_set():
+            message = "The operation was cancelled."
+            if self.__reason:
+                message = f"The operation was cancelled: {self.__reason}"
+            raise CancelledError(message)
+
+    def sleep(self, seconds):
+        # type: (float) -> None
+        """Waits for a number of seconds, unless the token is cancelled first.
+
+        :raises CancelledError: if the token is (or becomes) cancelled
+        """
+        self.__event.wait(seconds)
+        self.check()
+
+    def __repr__(self):
+        # type: () -> str
+        return f"CancellationToken(cancelled={self.cancelled!r})"
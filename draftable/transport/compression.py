@@ -0,0 +1,175 @@
+import tempfile
+import zlib
+
+from .multipart import MultipartBody
+
+try:
+    from typing import Iterator, Optional
+except ImportError:
+    pass
+
+
+DEFAULT_COMPRESSION_THRESHOLD = 64 * 1024
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_MAX_COMPRESSION_RATIO = 0.9
+# Compressed bodies larger than this are spooled to a temporary file.
+SPOOL_SIZE = 1024 * 1024
+# The size of the chunks yielded when iterating over a compressed body.
+_CHUNK_SIZE = 64 * 1024
+
+_WBITS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    # HTTP's "deflate" content coding is the zlib format, not raw deflate.
+    "deflate": zlib.MAX_WBITS,
+}
+
+
+class UploadCompression(object):
+    """Settings for compressing the bodies of file uploads.
+
+    The API server (or a proxy in front of it) must support decompressing request
+    bodies with the chosen `Content-Encoding`. Servers which respond "415 Unsupported
+    Media Type" to a compressed upload are sent it again uncompressed, and aren't sent
+    compressed uploads again.
+
+    :param encoding: the content coding to compress with, "gzip" or "deflate"
+    :param threshold: the size in bytes below which uploads aren't compressed
+    :param level: the zlib compression level, from 1 (fastest) to 9 (smallest)
+    :param max_ratio: uploads are sent uncompressed unless compression reduces their
+        size to at most this fraction of the original, e.g. for PDFs and other
+        formats which are already compressed
+    """
+
+    def __init__(
+        self,
+        encoding="gzip",  # type: str
+        threshold=DEFAULT_COMPRESSION_THRESHOLD,  # type: int
+        level=DEFAULT_COMPRESSION_LEVEL,  # type: int
+        max_ratio=DEFAULT_MAX_COMPRESSION_RATIO,  # type: float
+    ):
+        # Imported here as the endpoints package depends on the transport package.
+        from ..endpoints.exceptions import InvalidArgument
+
+        if encoding not in _WBITS:
+            raise InvalidArgument("encoding", 'must be one of "gzip" or "deflate".')
+        if not 1 <= level <= 9:
+            raise InvalidArgument("level", "must be between 1 and 9.")
+        self.__encoding = encoding
+        self.__threshold = max(0, int(threshold))
+        self.__level = level
+        self.__max_ratio = float(max_ratio)
+
+    @property
+    def encoding(self):
+        # type: () -> str
+        return self.__encoding
+
+    @property
+    def threshold(self):
+        # type: () -> int
+        return self.__threshold
+
+    @property
+    def level(self):
+        # type: () -> int
+        return self.__level
+
+    @property
+    def max_ratio(self):
+        # type: () -> float
+        return self.__max_ratio
+
+    def compress(self, body):
+        # type: (MultipartBody) -> Optional[CompressedBody]
+        """Compresses a body, if it's large enough and compresses well enough.
+
+        The compressed body is spooled to a temporary file if it's large, rather
+        than held in memory, as its size must be known before it's sent.
+
+        :return: the compressed body, which should be closed once sent, or None if
+            the body should be sent uncompressed, in which case it's rewound to be
+            read again
+        """
+        if len(body) < self.__threshold:
+            return None
+
+        compressor = zlib.compressobj(
+            self.__level, zlib.DEFLATED, _WBITS[self.__encoding]
+        )
+        compressed = CompressedBody()
+        try:
+            for chunk in body:
+                compressed.write(compressor.compress(chunk))
+            compressed.write(compressor.flush())
+        except BaseException:
+            compressed.close()
+            raise
+
+        if len(compressed) > len(body) * self.__max_ratio:
+            compressed.close()
+            body.reset()
+            return None
+        compressed.reset()
+        return compressed
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "UploadCompression("
+            f"encoding={self.__encoding!r}, "
+            f"threshold={self.__threshold!r}, "
+            f"level={self.__level!r}, "
+            f"max_ratio={self.__max_ratio!r}"
+            ")"
+        )
+
+
+class CompressedBody(object):
+    """A compressed request body, held in memory up to `SPOOL_SIZE` bytes and in a
+    temporary file beyond that. Like `MultipartBody` it can be sent by requests,
+    with a `Content-Length`, and rewound to be sent again.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.__file = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self.__length = 0
+
+    def write(self, chunk):
+        # type: (bytes) -> None
+        self.__file.write(chunk)
+        self.__length += len(chunk)
+
+    def __len__(self):
+        # type: () -> int
+        return self.__length
+
+    def __iter__(self):
+        # type: () -> Iterator[bytes]
+        while True:
+            chunk = self.read(_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        # type: (int) -> bytes
+        return self.__file.read(size)
+
+    def reset(self):
+        # type: () -> None
+        """Rewinds the body to be read again from the start."""
+        self.__file.seek(0)
+
+    def close(self):
+        # type: () -> None
+        """Releases the memory or temporary file holding the body."""
+        self.__file.close()
+
+    def __enter__(self):
+        # type: () -> CompressedBody
+        return self
+
+    def __exit__(self, *exc_info):
+        # type: (...) -> None
+        self.close()
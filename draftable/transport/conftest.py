@@ -0,0 +1,43 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+class LocalServer(ThreadingHTTPServer):
+    """An HTTP server on a free local port, serving requests from a thread."""
+
+    daemon_threads = True
+
+    def __init__(self, handler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.handler = handler
+        self.base_url = f"http://127.0.0.1:{self.server_port}"
+        self.__thread = threading.Thread(
+            target=self.serve_forever, args=(0.01,), daemon=True
+        )
+        self.__thread.start()
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+@pytest.fixture
+def serve():
+    """Starts local HTTP servers for a test, stopping them after it.
+
+    Call it with a `BaseHTTPRequestHandler` subclass, and any class attributes to
+    give the handler. Each server gets its own subclass of the handler, available
+    as `server.handler`, so state kept on it by one test doesn't leak into others.
+    """
+    servers = []
+
+    def serve(handler, **attributes):
+        server = LocalServer(type(handler.__name__, (handler,), attributes))
+        servers.append(server)
+        return server
+
+    yield serve
+    for server in servers:
+        server.close()
@@ -0,0 +1,56 @@
+import json
+
+try:
+    from typing import Any, Callable, Optional, Tuple, Union
+except ImportError:
+    pass
+
+# JSON decoding backends, in order of preference. Faster backends are used when
+# they're installed, e.g. via the "speedups" extra.
+JSON_BACKENDS = ("orjson", "ujson", "json")
+
+
+def _import_loads(backend):
+    # type: (str) -> Optional[Callable[[bytes], Any]]
+    if backend == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return orjson.loads
+    if backend == "ujson":
+        try:
+            import ujson
+        except ImportError:
+            return None
+        return ujson.loads
+    if backend == "json":
+        return json.loads
+    raise ValueError(
+        f"Unknown JSON backend '{backend}', expected one of {', '.join(JSON_BACKENDS)}."
+    )
+
+
+def json_decoder(backend=None):
+    # type: (Optional[Union[str, Callable[[bytes], Any]]]) -> Tuple[str, Callable[[bytes], Any]]
+    """Resolves a JSON decoding backend.
+
+    :param backend: the name of a backend in `JSON_BACKENDS`, a function which decodes
+        JSON from bytes, or None to use the fastest installed backend
+    :return: a tuple of the backend's name and its decoding function
+    :raises ValueError: if the named backend is unknown
+    :raises ImportError: if the named backend isn't installed
+    """
+    if callable(backend):
+        return "custom", backend
+    if backend is not None:
+        loads = _import_loads(backend)
+        if loads is None:
+            raise ImportError(f"The JSON backend '{backend}' isn't installed.")
+        return backend, loads
+
+    for name in JSON_BACKENDS:
+        loads = _import_loads(name)
+        if loads is not None:
+            return name, loads
+    raise AssertionError("The json module is always available.")
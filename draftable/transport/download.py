@@ -0,0 +1,139 @@
+import hashlib
+import os
+
+import requests
+
+from .cancellation import CancellationToken, CancelledError
+from .rest_client import RESTClient
+from .timeouts import Deadline, DeadlineExceededError
+
+try:
+    from typing import Any, BinaryIO, Optional, Union
+except ImportError:
+    pass
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_RESUMES = 3
+
+# Errors which can occur part way through a download, and which can be recovered
+# from by resuming the download.
+_RESUMABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+)
+
+
+def _content_range_start(response):
+    # type: (requests.Response) -> int
+    # e.g. "bytes 1000-1999/2000"
+    content_range = response.headers.get("Content-Range", "")
+    try:
+        return int(content_range.split(" ", 1)[1].split("-", 1)[0])
+    except (IndexError, ValueError):
+        return -1
+
+
+def _start_position(sink):
+    # type: (BinaryIO) -> Optional[int]
+    if hasattr(sink, "seekable") and sink.seekable():
+        return sink.tell()
+    return None
+
+
+def _restart(sink, start):
+    # type: (BinaryIO, Optional[int]) -> None
+    if start is None:
+        raise OSError(
+            "The download was interrupted and the server doesn't support resuming "
+            "it, but the destination stream can't be rewound to start again."
+        )
+    sink.seek(start)
+    sink.truncate()
+
+
+def stream_to_sink(
+    client,  # type: RESTClient
+    url,  # type: str
+    sink,  # type: BinaryIO
+    chunk_size=DEFAULT_CHUNK_SIZE,  # type: int
+    max_resumes=DEFAULT_MAX_RESUMES,  # type: int
+    digest_algorithm="sha256",  # type: str
+    deadline=None,  # type: Optional[Deadline]
+    cancellation=None,  # type: Optional[CancellationToken]
+):
+    # type: (...) -> str
+    """Streams the content at `url` to a writable binary stream in chunks.
+
+    If the connection is interrupted the download is resumed using a range request,
+    or restarted if the server doesn't support range requests.
+
+    :param deadline: if given, the deadline for the whole download, including any
+        resumed requests
+    :param cancellation: if given, a token which abandons the download when
+        cancelled, checked between chunks
+    :return: the hex-encoded digest of the downloaded content
+    """
+    hasher = hashlib.new(digest_algorithm)
+    start = _start_position(sink)
+    written = 0
+    resumes = 0
+
+    while True:
+        headers = {"Range": f"bytes={written}-"} if written else None
+        try:
+            response = client.stream(
+                url, headers=headers, deadline=deadline, cancellation=cancellation
+            )
+            with response:
+                if written and (
+                    response.status_code != 206
+                    or _content_range_start(response) != written
+                ):
+                    # The server ignored our range request, so start again.
+                    _restart(sink, start)
+                    hasher = hashlib.new(digest_algorithm)
+                    written = 0
+
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    sink.write(chunk)
+                    hasher.update(chunk)
+                    written += len(chunk)
+                    if deadline is not None:
+                        deadline.check()
+                    if cancellation is not None:
+                        cancellation.check()
+            return hasher.hexdigest()
+        except (DeadlineExceededError, CancelledError):
+            raise
+        except _RESUMABLE_ERRORS as ex:
+            if cancellation is not None:
+                cancellation.check()
+            if deadline is not None and deadline.expired:
+                # Reads are cut short to end by the deadline, so don't resume.
+                raise DeadlineExceededError(
+                    f"The deadline of {deadline.seconds:g} seconds was exceeded."
+                ) from ex
+            if resumes >= max_resumes:
+                raise
+            resumes += 1
+
+
+def stream_to_destination(client, url, dest, **kwargs):
+    # type: (RESTClient, str, Union[str, os.PathLike, BinaryIO], Any) -> str
+    """As `stream_to_sink`, but `dest` may also be a file path.
+
+    A partially written file is removed if the download fails.
+    """
+    if hasattr(dest, "write"):
+        return stream_to_sink(client, url, dest, **kwargs)
+
+    path = os.fspath(dest)
+    try:
+        with open(path, "wb") as sink:
+            return stream_to_sink(client, url, sink, **kwargs)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
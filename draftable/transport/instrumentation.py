@@ -0,0 +1,428 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import parse_url
+
+try:
+    from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+except ImportError:
+    pass
+
+
+# The API's resources, which are followed in URLs by an identifier.
+_RESOURCES = ("comparisons", "exports")
+
+
+def endpoint_template(url):
+    # type: (Any) -> str
+    """Returns the API endpoint of a URL with identifiers replaced by placeholders,
+    e.g. "comparisons/{id}/change-details", which is suitable as a metric label.
+
+    URLs not referring to an API resource (e.g. the URLs of export downloads) are
+    reported as "other".
+    """
+    segments = [segment for segment in (parse_url(str(url)).path or "").split("/")]
+    for index, segment in enumerate(segments):
+        if segment in _RESOURCES:
+            template = segments[index:]
+            if len(template) > 1 and template[1]:
+                template[1] = "{id}"
+            return "/".join(segment for segment in template if segment)
+    return "other"
+
+
+class RequestInfo(object):
+    """Describes a request made by the client, passed to `Instrumentation` hooks.
+
+    Attributes are filled in as the request progresses: `status_code`,
+    `bytes_received`, `duration` and `timings` are None until the response has been
+    received (and remain None if the request fails).
+
+    `timings` is a dictionary of the phases of the request in seconds:
+
+    - "connect": establishing a new connection, including resolving its host name
+      (absent if a pooled connection was reused)
+    - "tls": the TLS handshake of a new HTTPS connection (absent if a pooled
+      connection was reused)
+    - "wait": sending the request and waiting for the response headers
+    - "transfer": receiving the response body (absent for streamed responses,
+      whose body is read by the caller)
+    """
+
+    def __init__(self, method, url, endpoint, attempt=1):
+        # type: (str, str, str, int) -> None
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.status_code = None  # type: Optional[int]
+        self.bytes_sent = 0
+        self.bytes_received = None  # type: Optional[int]
+        self.duration = None  # type: Optional[float]
+        self.timings = None  # type: Optional[Dict[str, float]]
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "RequestInfo("
+            f"method={self.method!r}, "
+            f"endpoint={self.endpoint!r}, "
+            f"attempt={self.attempt!r}, "
+            f"status_code={self.status_code!r}, "
+            f"duration={self.duration!r}"
+            ")"
+        )
+
+
+class Instrumentation(object):
+    """Receives notifications of the requests made by a client.
+
+    Subclasses override the hooks for the events they're interested in. Hooks are
+    called on the thread making the request, so they should be quick and must be
+    thread-safe. Exceptions raised by hooks aren't caught.
+    """
+
+    def on_request_start(self, request):
+        # type: (RequestInfo) -> None
+        """Called before a request is sent."""
+
+    def on_request_end(self, request):
+        # type: (RequestInfo) -> None
+        """Called when a response has been received, whatever its status code."""
+
+    def on_retry(self, request, delay):
+        # type: (RequestInfo, float) -> None
+        """Called when a request is going to be retried after `delay` seconds.
+
+        :param request: the attempt which is being retried
+        """
+
+    def on_error(self, request, error):
+        # type: (RequestInfo, Exception) -> None
+        """Called when a request fails without receiving a response (e.g. because of
+        a connection error or a timeout).
+        """
+
+
+class CompositeInstrumentation(Instrumentation):
+    """Passes notifications on to several instrumentations in turn."""
+
+    def __init__(self, *instrumentations):
+        # type: (Instrumentation) -> None
+        self.__instrumentations = instrumentations
+
+    def on_request_start(self, request):
+        # type: (RequestInfo) -> None
+        for instrumentation in self.__instrumentations:
+            instrumentation.on_request_start(request)
+
+    def on_request_end(self, request):
+        # type: (RequestInfo) -> None
+        for instrumentation in self.__instrumentations:
+            instrumentation.on_request_end(request)
+
+    def on_retry(self, request, delay):
+        # type: (RequestInfo, float) -> None
+        for instrumentation in self.__instrumentations:
+            instrumentation.on_retry(request, delay)
+
+    def on_error(self, request, error):
+        # type: (RequestInfo, Exception) -> None
+        for instrumentation in self.__instrumentations:
+            instrumentation.on_error(request, error)
+
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# The type and help text of each metric, by its name without the namespace.
+_METRIC_FAMILIES = {
+    "errors_total": ("counter", "Requests that failed without a response."),
+    "request_bytes_total": ("counter", "Bytes sent in request bodies."),
+    "request_duration_seconds": ("histogram", "Duration of requests in seconds."),
+    "requests_total": ("counter", "Requests that received a response."),
+    "response_bytes_total": ("counter", "Bytes received in response bodies."),
+    "retries_total": ("counter", "Requests that were retried."),
+}
+
+
+class _Histogram(object):
+    def __init__(self, buckets):
+        # type: (Sequence[float]) -> None
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        # type: (float) -> None
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+def _labels(labels):
+    # type: (Tuple[Tuple[str, str], ...]) -> str
+    def escape(value):
+        # type: (str) -> str
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels)
+
+
+class MetricsInstrumentation(Instrumentation):
+    """Collects Prometheus-style metrics about requests, without any dependencies.
+
+    The metrics are:
+
+    - `<namespace>_requests_total` (counter, by method, endpoint and status)
+    - `<namespace>_request_duration_seconds` (histogram, by method and endpoint)
+    - `<namespace>_request_bytes_total` and `<namespace>_response_bytes_total`
+      (counters, by method and endpoint)
+    - `<namespace>_retries_total` (counter, by method and endpoint)
+    - `<namespace>_errors_total` (counter, by method, endpoint and error type)
+
+    Use `render()` to expose them in the Prometheus text format, e.g. from a custom
+    collector or an HTTP handler, or `samples()` to export them elsewhere.
+    """
+
+    def __init__(self, namespace="draftable", buckets=DEFAULT_BUCKETS):
+        # type: (str, Sequence[float]) -> None
+        self.__namespace = namespace
+        self.__buckets = tuple(sorted(buckets))
+        self.__lock = threading.Lock()
+        self.__counters = (
+            {}
+        )  # type: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]
+        self.__histograms = {}  # type: Dict[Tuple[Tuple[str, str], ...], _Histogram]
+
+    def __increment(self, name, labels, amount=1.0):
+        # type: (str, Tuple[Tuple[str, str], ...], float) -> None
+        key = (name, labels)
+        self.__counters[key] = self.__counters.get(key, 0.0) + amount
+
+    def on_request_end(self, request):
+        # type: (RequestInfo) -> None
+        labels = (("method", request.method), ("endpoint", request.endpoint))
+        with self.__lock:
+            self.__increment(
+                "requests_total", labels + (("status", str(request.status_code)),)
+            )
+            self.__increment("request_bytes_total", labels, request.bytes_sent)
+            if request.bytes_received is not None:
+                self.__increment("response_bytes_total", labels, request.bytes_received)
+            if request.duration is not None:
+                histogram = self.__histograms.get(labels)
+                if histogram is None:
+                    histogram = self.__histograms[labels] = _Histogram(self.__buckets)
+                histogram.observe(request.duration)
+
+    def on_retry(self, request, delay):
+        # type: (RequestInfo, float) -> None
+        labels = (("method", request.method), ("endpoint", request.endpoint))
+        with self.__lock:
+            self.__increment("retries_total", labels)
+
+    def on_error(self, request, error):
+        # type: (RequestInfo, Exception) -> None
+        labels = (
+            ("method", request.method),
+            ("endpoint", request.endpoint),
+            ("error", type(error).__name__),
+        )
+        with self.__lock:
+            self.__increment("errors_total", labels)
+
+    def samples(self):
+        # type: () -> List[Tuple[str, Dict[str, str], float]]
+        """Returns the current value of every metric, as a list of `(name, labels,
+        value)` tuples, with histograms expanded into their buckets, sum and count.
+        """
+        prefix = self.__namespace + "_" if self.__namespace else ""
+        samples = []  # type: List[Tuple[str, Dict[str, str], float]]
+        with self.__lock:
+            for (name, labels), value in sorted(self.__counters.items()):
+                samples.append((prefix + name, dict(labels), value))
+
+            name = prefix + "request_duration_seconds"
+            for labels, histogram in sorted(self.__histograms.items()):
+                cumulative = 0
+                bounds = [str(bound) for bound in histogram.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    bucket_labels = dict(labels, le=bound)
+                    samples.append((name + "_bucket", bucket_labels, cumulative))
+                samples.append((name + "_sum", dict(labels), histogram.sum))
+                samples.append((name + "_count", dict(labels), cumulative))
+        return samples
+
+    def render(self):
+        # type: () -> str
+        """Renders the metrics in the Prometheus text exposition format, with `# HELP`
+        and `# TYPE` lines before the samples of each metric.
+        """
+        prefix = self.__namespace + "_" if self.__namespace else ""
+        lines = []
+        family = None
+        for name, labels, value in self.samples():
+            if name[len(prefix) :] not in _METRIC_FAMILIES:
+                # A histogram's "_bucket", "_sum" or "_count" series.
+                name_family = name.rsplit("_", 1)[0]
+            else:
+                name_family = name
+            if name_family != family:
+                family = name_family
+                kind, help_text = _METRIC_FAMILIES[family[len(prefix) :]]
+                lines.append(f"# HELP {family} {help_text}")
+                lines.append(f"# TYPE {family} {kind}")
+            label_text = _labels(tuple(labels.items()))
+            lines.append(f"{name}{{{label_text}}} {value!r}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """Records a client span for each request using OpenTelemetry.
+
+    Requires the `opentelemetry-api` package. Spans are named "<method> <endpoint>",
+    and have the standard HTTP attributes, plus the timings of the request as
+    attributes prefixed with "draftable.timing.".
+
+    :param tracer: the tracer to create spans with, or None to get one from the
+        global tracer provider
+    """
+
+    def __init__(self, tracer=None):
+        # type: (Optional[Any]) -> None
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetryInstrumentation requires the opentelemetry-api package."
+            )
+        self.__trace = trace
+        self.__tracer = tracer or trace.get_tracer("draftable")
+        self.__spans = threading.local()
+
+    def on_request_start(self, request):
+        # type: (RequestInfo) -> None
+        span = self.__tracer.start_span(
+            f"{request.method} {request.endpoint}",
+            kind=self.__trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": request.method,
+                "url.full": request.url,
+                "draftable.endpoint": request.endpoint,
+                "draftable.attempt": request.attempt,
+            },
+        )
+        self.__spans.current = span
+
+    def __end(self):
+        # type: () -> Optional[Any]
+        span = getattr(self.__spans, "current", None)
+        self.__spans.current = None
+        return span
+
+    def on_request_end(self, request):
+        # type: (RequestInfo) -> None
+        span = self.__end()
+        if span is None:
+            return
+        span.set_attribute("http.response.status_code", request.status_code)
+        span.set_attribute("http.request.body.size", request.bytes_sent)
+        if request.bytes_received is not None:
+            span.set_attribute("http.response.body.size", request.bytes_received)
+        for phase, seconds in (request.timings or {}).items():
+            span.set_attribute(f"draftable.timing.{phase}", seconds)
+        if request.status_code is not None and request.status_code >= 400:
+            span.set_status(self.__trace.Status(self.__trace.StatusCode.ERROR))
+        span.end()
+
+    def on_error(self, request, error):
+        # type: (RequestInfo, Exception) -> None
+        span = self.__end()
+        if span is None:
+            return
+        span.record_exception(error)
+        span.set_status(self.__trace.Status(self.__trace.StatusCode.ERROR, str(error)))
+        span.end()
+
+
+# Timings of new connections are recorded for the request being made on the current
+# thread, as requests doesn't expose them.
+_connection_timings = threading.local()
+
+
+def _record_timing(phase, seconds):
+    # type: (str, float) -> None
+    timings = getattr(_connection_timings, "current", None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def collect_connection_timings():
+    # type: () -> Iterator[Dict[str, float]]
+    """Collects the timings of connections made on the current thread within the
+    context, for clients using an `InstrumentedHTTPAdapter`.
+    """
+    previous = getattr(_connection_timings, "current", None)
+    timings = {}  # type: Dict[str, float]
+    _connection_timings.current = timings
+    try:
+        yield timings
+    finally:
+        _connection_timings.current = previous
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        # Resolves the host name and establishes the TCP connection.
+        started = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record_timing("connect", time.perf_counter() - started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record_timing("connect", time.perf_counter() - started)
+
+    def connect(self):
+        # The time spent on the TLS handshake is the time spent connecting, less the
+        # time spent establishing the TCP connection.
+        started = time.perf_counter()
+        timings = getattr(_connection_timings, "current", None)
+        connecting = timings.get("connect", 0.0) if timings is not None else 0.0
+        try:
+            return super().connect()
+        finally:
+            if timings is not None:
+                tcp = timings.get("connect", 0.0) - connecting
+                _record_timing("tls", time.perf_counter() - started - tcp)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class InstrumentedHTTPAdapter(requests.adapters.HTTPAdapter):
+    """An HTTP adapter which times the connections it establishes."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
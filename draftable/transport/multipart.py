@@ -0,0 +1,189 @@
+import binascii
+import io
+import os
+
+try:
+    from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+except ImportError:
+    pass
+
+
+# The size of the chunks yielded when iterating over a body.
+_CHUNK_SIZE = 64 * 1024
+
+# Characters escaped in header parameters, as per the HTML5 multipart/form-data
+# encoding algorithm.
+_HEADER_PARAMETER_ESCAPES = {
+    c: f"%{c:02X}" for c in range(0x20) if c != 0x1B
+}  # type: dict
+_HEADER_PARAMETER_ESCAPES[ord('"')] = "%22"
+_HEADER_PARAMETER_ESCAPES[ord("\\")] = "\\\\"
+
+
+def _header_parameter(name, value):
+    # type: (str, str) -> str
+    return f'{name}="{value.translate(_HEADER_PARAMETER_ESCAPES)}"'
+
+
+def _remaining_length(file):
+    # type: (Any) -> Optional[int]
+    try:
+        position = file.tell()
+        try:
+            size = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            size = file.seek(0, io.SEEK_END)
+            file.seek(position)
+        return max(0, size - position)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+class _FilePart(object):
+    def __init__(self, file, length):
+        # type: (Any, int) -> None
+        self.file = file
+        self.start = file.tell()
+        self.length = length
+        self.remaining = length
+
+    def reset(self):
+        # type: () -> None
+        self.file.seek(self.start)
+        self.remaining = self.length
+
+    def read(self, size):
+        # type: (int) -> bytes
+        if not self.remaining:
+            return b""
+        chunk = self.file.read(min(size, self.remaining))
+        if not chunk:
+            raise OSError("The file being uploaded was truncated during the upload.")
+        self.remaining -= len(chunk)
+        return chunk
+
+
+class MultipartBody(object):
+    """A multipart/form-data request body which streams the content of files.
+
+    The body is read in chunks as it is sent, rather than being assembled in memory
+    first. Buffers (including memory-mapped files) are sent as slices of themselves
+    without being copied, and files are read a chunk at a time.
+
+    :param fields: a dictionary of form field names to values, where values of None
+        are omitted and other values are converted to strings
+    :param files: a dictionary of form field names to `(filename, content,
+        content_type)` tuples, where `content` is a file object opened in binary mode
+        or a bytes-like object
+    :param check: if given, a function called before each chunk of the body is read,
+        which may raise an exception to abandon sending it
+    """
+
+    def __init__(self, fields, files, boundary=None, check=None):
+        # type: (dict, dict, Optional[str], Optional[Callable[[], None]]) -> None
+        self.__check = check
+        self.__boundary = boundary or binascii.hexlify(os.urandom(16)).decode("ascii")
+        self.__parts = []  # type: List[Union[memoryview, _FilePart]]
+        self.__length = 0
+
+        for name, value in fields.items():
+            if value is None:
+                continue
+            if not isinstance(value, bytes):
+                value = str(value).encode("utf-8")
+            self.__add_part(name, None, None, memoryview(value))
+
+        for name, (filename, content, content_type) in files.items():
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                content = memoryview(content).cast("B")
+            else:
+                length = _remaining_length(content)
+                if length is None:
+                    # Without knowing its length the body can't be streamed with a
+                    # Content-Length, so fall back to reading it into memory.
+                    content = memoryview(content.read())
+                else:
+                    content = _FilePart(content, length)
+            self.__add_part(name, filename, content_type, content)
+
+        self.__add_buffer(f"--{self.__boundary}--\r\n".encode("ascii"))
+        self.__part = 0
+        self.__offset = 0
+
+    @property
+    def content_type(self):
+        # type: () -> str
+        return f"multipart/form-data; boundary={self.__boundary}"
+
+    def __len__(self):
+        # type: () -> int
+        return self.__length
+
+    def __iter__(self):
+        # type: () -> Iterator[Union[bytes, memoryview]]
+        while True:
+            chunk = self.read(_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        # type: (int) -> Union[bytes, memoryview]
+        """Reads up to `size` bytes of the body, or all of the remaining body if `size`
+        is negative or None.
+
+        Chunks of buffers are returned as memoryviews over the original buffer.
+        """
+        if size is None or size < 0:
+            return b"".join(iter(self))
+
+        if self.__check is not None:
+            self.__check()
+        while self.__part < len(self.__parts):
+            part = self.__parts[self.__part]
+            if isinstance(part, memoryview):
+                chunk = part[self.__offset : self.__offset + size]
+                self.__offset += len(chunk)
+            else:
+                chunk = part.read(size)
+            if chunk:
+                return chunk
+            self.__part += 1
+            self.__offset = 0
+        return b""
+
+    def reset(self):
+        # type: () -> None
+        """Rewinds the body to be read again from the start, e.g. to retry a request.
+
+        Files are rewound to their positions when the body was created.
+        """
+        for part in self.__parts:
+            if isinstance(part, _FilePart):
+                part.reset()
+        self.__part = 0
+        self.__offset = 0
+
+    def __add_buffer(self, buffer):
+        # type: (Union[bytes, memoryview]) -> None
+        if not isinstance(buffer, memoryview):
+            buffer = memoryview(buffer)
+        self.__parts.append(buffer)
+        self.__length += buffer.nbytes
+
+    def __add_part(self, name, filename, content_type, content):
+        # type: (str, Optional[str], Optional[str], Union[memoryview, _FilePart]) -> None
+        disposition = f"form-data; {_header_parameter('name', name)}"
+        if filename is not None:
+            disposition += f"; {_header_parameter('filename', filename)}"
+        headers = f"--{self.__boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type is not None:
+            headers += f"Content-Type: {content_type}\r\n"
+        self.__add_buffer(f"{headers}\r\n".encode("utf-8"))
+
+        if isinstance(content, memoryview):
+            self.__add_buffer(content)
+        else:
+            self.__parts.append(content)
+            self.__length += content.length
+        self.__add_buffer(b"\r\n")
@@ -1,9 +1,37 @@
+import random
+import time
+
 import requests
+from urllib3.util.request import ACCEPT_ENCODING
 
 from ..utilities import Url
+from .cancellation import CancellationToken
+from .compression import UploadCompression
+from .decoding import json_decoder
+from .instrumentation import (
+    Instrumentation,
+    InstrumentedHTTPAdapter,
+    RequestInfo,
+    collect_connection_timings,
+    endpoint_template,
+)
+from .multipart import MultipartBody
+from .stats import TransportStats
+from .timeouts import Deadline, DeadlineExceededError, Timeouts
+
+DEFAULT_MAX_CONNECTIONS = 10
+
+# Only requests which can safely be repeated are retried.
+_IDEMPOTENT_METHODS = frozenset(("GET", "DELETE"))
+# Statuses of responses from gateways and overloaded servers, which are transient.
+_RETRY_STATUSES = frozenset((502, 503, 504))
+# The delays between retries are chosen at random up to an exponentially
+# increasing limit, in seconds.
+_RETRY_DELAY = 0.5
+_MAX_RETRY_DELAY = 8.0
 
 try:
-    from typing import Any, Optional, Tuple, Union
+    from typing import Any, Callable, Optional, Tuple, Union
 except ImportError:
     pass
 
@@ -55,13 +83,72 @@ def _flatten_form_data(initial_data):
     return data, files
 
 
+def _checkpoint(deadline, cancellation):
+    # type: (Optional[Deadline], Optional[CancellationToken]) -> Optional[Callable[[], None]]
+    # Returns a function which raises if the deadline has passed or the operation
+    # has been cancelled, for checking between the chunks of an upload.
+    checks = [token.check for token in (cancellation, deadline) if token is not None]
+    if not checks:
+        return None
+
+    def check():
+        # type: () -> None
+        for check_token in checks:
+            check_token()
+
+    return check
+
+
 class RESTClient(object):
-    def __init__(self, account_id, auth_token):
-        # type: (str, str) -> None
+    def __init__(
+        self,
+        account_id,  # type: str
+        auth_token,  # type: str
+        max_connections=DEFAULT_MAX_CONNECTIONS,  # type: int
+        upload_compression=None,  # type: Optional[UploadCompression]
+        json_backend=None,  # type: Optional[Union[str, Callable[[bytes], Any]]]
+        instrumentation=None,  # type: Optional[Instrumentation]
+        timeouts=None,  # type: Optional[Timeouts]
+        max_retries=0,  # type: int
+    ):
+        """
+        :param timeouts: the timeouts of requests, or None for the default timeouts
+        :param max_retries: the number of times to retry GET and DELETE requests
+            which fail with a connection error, a timeout, or a 502, 503 or 504
+            response
+        """
+        if isinstance(max_retries, bool) or not isinstance(max_retries, int):
+            raise ValueError("`max_retries` must be an integer.")
+        if max_retries < 0:
+            raise ValueError("`max_retries` cannot be negative.")
         self.__account_id = account_id
         self.__auth_token = auth_token
+        self.__upload_compression = upload_compression
+        self.__json_backend, self.__json_loads = json_decoder(json_backend)
+        self.__stats = TransportStats()
+        self.__instrumentation = instrumentation
+        self.__timeouts = timeouts or Timeouts()
+        self.__max_retries = max_retries
         self.verify_ssl = True
 
+        # A single session shares pooled (keep-alive) connections between requests,
+        # including requests made concurrently from multiple threads.
+        self.__session = requests.Session()
+        # Connections are only timed when the timings will be reported.
+        adapter_class = (
+            requests.adapters.HTTPAdapter
+            if instrumentation is None
+            else InstrumentedHTTPAdapter
+        )
+        adapter = adapter_class(
+            pool_connections=max_connections, pool_maxsize=max_connections
+        )
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+        # Request every response compression urllib3 supports, which includes
+        # brotli and zstd when the optional packages for them are installed.
+        self.__session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
     @property
     def account_id(self):
         # type: () -> str
@@ -72,44 +159,312 @@ class RESTClient(object):
         # type: () -> str
         return self.__auth_token
 
+    @property
+    def json_backend(self):
+        # type: () -> str
+        """The name of the backend used to decode JSON responses."""
+        return self.__json_backend
+
+    @property
+    def stats(self):
+        # type: () -> TransportStats
+        """Totals of the time spent receiving and decoding responses."""
+        return self.__stats
+
+    @property
+    def instrumentation(self):
+        # type: () -> Optional[Instrumentation]
+        return self.__instrumentation
+
+    @property
+    def timeouts(self):
+        # type: () -> Timeouts
+        return self.__timeouts
+
+    @property
+    def max_retries(self):
+        # type: () -> int
+        return self.__max_retries
+
     def __auth(self, r):
         r.headers["Authorization"] = f"Token {self.__auth_token}"
         return r
 
-    def get(self, url, parameters=None):
-        # type: (Union[str, Url], Optional[dict]) -> Union[dict, list]
-        response = requests.get(
-            url, auth=self.__auth, params=parameters, verify=self.verify_ssl
+    def get(
+        self, url, parameters=None, operation="read", deadline=None, cancellation=None
+    ):
+        # type: (Union[str, Url], Optional[dict], str, Optional[Deadline], Optional[CancellationToken]) -> Union[dict, list]
+        """Performs a GET request.
+
+        :param operation: the class of operation, which determines the timeouts
+        :param deadline: if given, the deadline for the request and any retries
+        :param cancellation: if given, a token which abandons the request (and any
+            retries) when cancelled
+        """
+        response, network_seconds = self.__send(
+            "GET",
+            url,
+            operation,
+            deadline,
+            cancellation,
+            auth=self.__auth,
+            params=parameters,
+        )
+        response.raise_for_status()
+        return self.__decode(response, network_seconds)
+
+    def get_conditional(self, url, etag=None, deadline=None, cancellation=None):
+        # type: (Union[str, Url], Optional[str], Optional[Deadline], Optional[CancellationToken]) -> Tuple[Optional[Union[dict, list]], Optional[str]]
+        """Performs a GET request, revalidating a previously received entity tag.
+
+        :return: a tuple of the response data, or None if the server responded
+            "304 Not Modified", and the entity tag of the response (if any)
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        response, network_seconds = self.__send(
+            "GET",
+            url,
+            "read",
+            deadline,
+            cancellation,
+            auth=self.__auth,
+            headers=headers,
         )
         response.raise_for_status()
-        return response.json()
+        etag = response.headers.get("ETag", etag)
+        if response.status_code == 304:
+            self.__stats.record(network_seconds, 0.0, 0, 0)
+            return None, etag
+        return self.__decode(response, network_seconds), etag
+
+    def stream(
+        self, url, headers=None, authenticate=False, deadline=None, cancellation=None
+    ):
+        # type: (Union[str, Url], Optional[dict], bool, Optional[Deadline], Optional[CancellationToken]) -> requests.Response
+        """Performs a streaming GET request, for downloading large responses.
 
-    def post(self, url, data):
-        # type: (str, dict) -> Union[dict, list]
+        Authentication is only sent if requested, as the URLs of downloads may refer
+        to other hosts. The caller must close the returned response.
+        """
+        # Ask for the content unencoded, as ranges for resuming downloads refer to
+        # the content as sent.
+        headers = {"Accept-Encoding": "identity", **(headers or {})}
+        response, _ = self.__send(
+            "GET",
+            url,
+            "download",
+            deadline,
+            cancellation,
+            auth=self.__auth if authenticate else None,
+            headers=headers,
+            stream=True,
+        )
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        return response
+
+    def post(self, url, data, deadline=None, cancellation=None):
+        # type: (str, dict, Optional[Deadline], Optional[CancellationToken]) -> Union[dict, list]
+        started = time.perf_counter()
         if not _data_contains_file(data):
-            response = requests.post(
-                url, auth=self.__auth, json=data, verify=self.verify_ssl
+            response, _ = self.__send(
+                "POST", url, "read", deadline, cancellation, auth=self.__auth, json=data
             )
         else:
             data, files = _flatten_form_data(data)
+            # The body streams the files' content, rather than copying it in memory,
+            # and stops between chunks if the deadline passes or it's cancelled.
+            body = MultipartBody(data, files, check=_checkpoint(deadline, cancellation))
+            compression = self.__upload_compression
+            compressed = None if compression is None else compression.compress(body)
             # Obscure issue:
             # When the request is bad (e.g. invalid authentication), requests throws a weird ConnectionError rather than a HTTPError. Only in this multipart case!
             # (It seems that when the request is bad, our API (via Django Rest Framework) may not wait for the full upload?)
             # Asking for JSON seems to help? But it fails with frequency ~30% when you give invalid credentials.
             # I don't have a good fix for this (yet!), so there's a note in the exception thrown in the weird case. ~ James (April 2017)
-            response = requests.post(
-                url,
-                auth=self.__auth,
-                data=data,
-                files=files,
-                headers={"Accept": "application/json"},
-                verify=self.verify_ssl,
-            )
+            if compressed is not None:
+                with compressed:
+                    response = self.__post_body(
+                        url,
+                        compressed,
+                        body.content_type,
+                        deadline,
+                        cancellation,
+                        compression.encoding,
+                    )
+                if response.status_code == 415:
+                    # The server doesn't support compressed uploads, so send this
+                    # one again uncompressed, and don't compress any more.
+                    self.__upload_compression = None
+                    self.__notify_retry("POST", url, 1, response.status_code, 0.0)
+                    body.reset()
+                    compressed = None
+            if compressed is None:
+                response = self.__post_body(
+                    url, body, body.content_type, deadline, cancellation
+                )
 
+        network_seconds = time.perf_counter() - started
         response.raise_for_status()
-        return response.json()
+        return self.__decode(response, network_seconds)
+
+    def __decode(self, response, network_seconds):
+        # type: (requests.Response, float) -> Union[dict, list]
+        content = response.content
+        started = time.perf_counter()
+        try:
+            data = self.__json_loads(content)
+        except ValueError as ex:
+            # Raised as requests does, so that it's handled like other request errors.
+            raise requests.exceptions.JSONDecodeError(
+                str(ex), content.decode("utf-8", "replace"), getattr(ex, "pos", 0) or 0
+            ) from ex
+        decode_seconds = time.perf_counter() - started
+
+        try:
+            # The size of the body as transferred, before decompression.
+            bytes_received = response.raw.tell()
+        except AttributeError:
+            bytes_received = len(content)
+        self.__stats.record(
+            network_seconds, decode_seconds, bytes_received, len(content)
+        )
+        return data
+
+    def __post_body(
+        self, url, body, content_type, deadline, cancellation, content_encoding=None
+    ):
+        # type: (str, Any, str, Optional[Deadline], Optional[CancellationToken], Optional[str]) -> requests.Response
+        headers = {"Accept": "application/json", "Content-Type": content_type}
+        if content_encoding is not None:
+            headers["Content-Encoding"] = content_encoding
+        response, _ = self.__send(
+            "POST",
+            url,
+            "upload",
+            deadline,
+            cancellation,
+            auth=self.__auth,
+            data=body,
+            headers=headers,
+        )
+        return response
+
+    def __send(self, method, url, operation, deadline, cancellation, **kwargs):
+        # type: (str, Union[str, Url], str, Optional[Deadline], Optional[CancellationToken], **Any) -> Tuple[requests.Response, float]
+        """Sends a request with the timeouts of its class of operation, retrying
+        idempotent requests which fail transiently.
 
-    def delete(self, url):
-        # type: (str) -> None
-        response = requests.delete(url, auth=self.__auth, verify=self.verify_ssl)
+        :return: a tuple of the response and the seconds spent on the request
+        """
+        retries = self.__max_retries if method in _IDEMPOTENT_METHODS else 0
+        attempt = 1
+        while True:
+            if cancellation is not None:
+                cancellation.check()
+            timeout = self.__timeouts.for_operation(operation, deadline)
+            try:
+                response, network_seconds = self.__send_once(
+                    method, url, attempt, timeout, **kwargs
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as ex:
+                # Uploads are abandoned by raising from the body, which requests
+                # reports as a connection error, and requests are cut short to end
+                # by the deadline.
+                if cancellation is not None and cancellation.cancelled:
+                    cancellation.check()
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceededError(
+                        f"The deadline of {deadline.seconds:g} seconds was exceeded."
+                    ) from ex
+                if attempt > retries:
+                    raise
+                failure, status_code = ex, None  # type: Any, Optional[int]
+            else:
+                if attempt > retries or response.status_code not in _RETRY_STATUSES:
+                    return response, network_seconds
+                failure, status_code = response, response.status_code
+
+            # Exponential backoff with jitter, so that clients don't retry in step.
+            delay = random.uniform(0, min(_MAX_RETRY_DELAY, _RETRY_DELAY * 2**attempt))
+            if deadline is not None and delay >= deadline.remaining():
+                # There's no time left to retry, so give up now.
+                if isinstance(failure, requests.Response):
+                    return failure, network_seconds
+                raise failure
+            if isinstance(failure, requests.Response):
+                failure.close()
+            self.__notify_retry(method, url, attempt, status_code, delay)
+            if cancellation is not None:
+                cancellation.sleep(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def __send_once(self, method, url, attempt, timeout, **kwargs):
+        # type: (str, Union[str, Url], int, Tuple[Optional[float], Optional[float]], **Any) -> Tuple[requests.Response, float]
+        """Sends a request, notifying the instrumentation (if any) of its progress."""
+        instrumentation = self.__instrumentation
+        if instrumentation is None:
+            started = time.perf_counter()
+            response = self.__session.request(
+                method, url, timeout=timeout, verify=self.verify_ssl, **kwargs
+            )
+            return response, time.perf_counter() - started
+
+        stream = kwargs.get("stream", False)
+        request = RequestInfo(
+            method, str(url), "download" if stream else endpoint_template(url), attempt
+        )
+        instrumentation.on_request_start(request)
+        with collect_connection_timings() as timings:
+            started = time.perf_counter()
+            try:
+                response = self.__session.request(
+                    method, url, timeout=timeout, verify=self.verify_ssl, **kwargs
+                )
+            except Exception as ex:
+                instrumentation.on_error(request, ex)
+                raise
+            network_seconds = time.perf_counter() - started
+
+        request.status_code = response.status_code
+        request.bytes_sent = int(response.request.headers.get("Content-Length") or 0)
+        if not stream:
+            try:
+                # The size of the body as transferred, before decompression.
+                request.bytes_received = response.raw.tell()
+            except AttributeError:
+                request.bytes_received = len(response.content)
+        request.duration = network_seconds
+
+        # The response's elapsed time runs until its headers were received, and
+        # includes establishing any new connection.
+        elapsed = response.elapsed.total_seconds()
+        timings["wait"] = max(0.0, elapsed - sum(timings.values()))
+        if not stream:
+            timings["transfer"] = max(0.0, network_seconds - elapsed)
+        request.timings = timings
+        instrumentation.on_request_end(request)
+        return response, network_seconds
+
+    def __notify_retry(self, method, url, attempt, status_code, delay):
+        # type: (str, Union[str, Url], int, Optional[int], float) -> None
+        instrumentation = self.__instrumentation
+        if instrumentation is not None:
+            request = RequestInfo(method, str(url), endpoint_template(url), attempt)
+            request.status_code = status_code
+            instrumentation.on_retry(request, delay)
+
+    def delete(self, url, deadline=None, cancellation=None):
+        # type: (str, Optional[Deadline], Optional[CancellationToken]) -> None
+        response, _ = self.__send(
+            "DELETE", url, "read", deadline, cancellation, auth=self.__auth
+        )
         response.raise_for_status()
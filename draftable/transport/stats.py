@@ -0,0 +1,91 @@
+import threading
+
+try:
+    from typing import Dict
+except ImportError:
+    pass
+
+
+class TransportStats(object):
+    """Thread-safe totals of the time spent making requests and decoding responses.
+
+    Network time is measured from sending a request until its response body has been
+    received (and decompressed), and decode time is the time spent decoding the JSON
+    in response bodies.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__network_seconds = 0.0
+        self.__decode_seconds = 0.0
+        self.__bytes_received = 0
+        self.__bytes_decoded = 0
+
+    def record(self, network_seconds, decode_seconds, bytes_received, bytes_decoded):
+        # type: (float, float, int, int) -> None
+        """Records a request.
+
+        :param network_seconds: the time taken to send the request and receive its
+            response
+        :param decode_seconds: the time taken to decode the response
+        :param bytes_received: the size of the response body as transferred, which
+            may be compressed
+        :param bytes_decoded: the size of the (decompressed) response body decoded
+        """
+        with self.__lock:
+            self.__requests += 1
+            self.__network_seconds += network_seconds
+            self.__decode_seconds += decode_seconds
+            self.__bytes_received += bytes_received
+            self.__bytes_decoded += bytes_decoded
+
+    def reset(self):
+        # type: () -> None
+        with self.__lock:
+            self.__requests = 0
+            self.__network_seconds = 0.0
+            self.__decode_seconds = 0.0
+            self.__bytes_received = 0
+            self.__bytes_decoded = 0
+
+    @property
+    def requests(self):
+        # type: () -> int
+        return self.__requests
+
+    @property
+    def network_seconds(self):
+        # type: () -> float
+        return self.__network_seconds
+
+    @property
+    def decode_seconds(self):
+        # type: () -> float
+        return self.__decode_seconds
+
+    @property
+    def bytes_received(self):
+        # type: () -> int
+        return self.__bytes_received
+
+    @property
+    def bytes_decoded(self):
+        # type: () -> int
+        return self.__bytes_decoded
+
+    def to_dict(self):
+        # type: () -> Dict[str, float]
+        with self.__lock:
+            return {
+                "requests": self.__requests,
+                "network_seconds": self.__network_seconds,
+                "decode_seconds": self.__decode_seconds,
+                "bytes_received": self.__bytes_received,
+                "bytes_decoded": self.__bytes_decoded,
+            }
+
+    def __repr__(self):
+        # type: () -> str
+        values = ", ".join(f"{key}={value!r}" for key, value in self.to_dict().items())
+        return f"TransportStats({values})"
@@ -0,0 +1,173 @@
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from ..endpoints import ComparisonsEndpoint
+from ..endpoints.exceptions import Cancelled
+from ..utilities import Url
+from .cancellation import CancellationToken, CancelledError
+from .download import stream_to_sink
+from .instrumentation import Instrumentation
+from .multipart import MultipartBody
+from .rest_client import RESTClient
+
+COMPARISON = (
+    b'{"identifier": "abc", "left": {"file_type": "pdf"}, '
+    b'"right": {"file_type": "pdf"}, "public": false, '
+    b'"creation_time": "2024-01-01T00:00:00Z", "ready": false, "failed": false}'
+)
+CONTENT = b"x" * (1024 * 1024)
+
+
+def test_cancellation_token():
+    token = CancellationToken()
+    assert not token.cancelled
+    token.check()
+
+    token.cancel("job cancelled")
+    token.cancel("again")
+    assert token.cancelled
+    assert token.reason == "job cancelled"
+    with pytest.raises(CancelledError, match="job cancelled"):
+        token.check()
+
+
+def test_cancellation_token_sleep():
+    token = CancellationToken()
+    token.sleep(0.01)
+
+    threading.Timer(0.05, token.cancel).start()
+    started = time.monotonic()
+    with pytest.raises(CancelledError):
+        token.sleep(10)
+    assert time.monotonic() - started < 1
+
+
+def test_multipart_body_check():
+    reads = []
+
+    def check():
+        reads.append(None)
+        if len(reads) > 2:
+            raise CancelledError()
+
+    body = MultipartBody({}, {"file": ("file", CONTENT, None)}, check=check)
+    with pytest.raises(CancelledError):
+        list(body)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    status = 200
+
+    def __respond(self, status, content):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        except ConnectionError:
+            # The client abandoned the request.
+            pass
+
+    def do_GET(self):
+        if self.path.endswith("/download"):
+            self.__respond(200, CONTENT)
+        else:
+            self.__respond(self.status, COMPARISON)
+
+    def do_POST(self):
+        try:
+            self.rfile.read(int(self.headers["Content-Length"]))
+        except ConnectionError:
+            return
+        self.__respond(201, COMPARISON)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url(serve):
+    return f"{serve(_Handler).base_url}/v1"
+
+
+class _CancellingFile(io.BytesIO):
+    """Cancels a token once part of the file has been read."""
+
+    def __init__(self, content, token):
+        super().__init__(content)
+        self.token = token
+
+    def read(self, size=-1):
+        if self.tell() > 0:
+            self.token.cancel()
+        return super().read(size)
+
+
+def test_upload_cancelled(base_url):
+    token = CancellationToken()
+    file = _CancellingFile(CONTENT * 8, token)
+    data = {"left": {"file_type": "txt", "file": ("left.txt", file, "text/plain")}}
+    client = RESTClient("account", "token")
+    with pytest.raises(CancelledError):
+        client.post(f"{base_url}/comparisons", data, cancellation=token)
+    # The upload stopped part way through the file.
+    assert file.tell() < len(CONTENT) * 8
+
+
+def test_cancelled_before_request(base_url):
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(CancelledError):
+        RESTClient("account", "token").get(
+            f"{base_url}/comparisons/abc", cancellation=token
+        )
+
+
+class _CancelOnRetry(Instrumentation):
+    def __init__(self, token):
+        self.token = token
+
+    def on_retry(self, request, delay):
+        self.token.cancel()
+
+
+def test_retry_sleep_cancelled(serve):
+    base_url = f"{serve(_Handler, status=503).base_url}/v1"
+    token = CancellationToken()
+    client = RESTClient(
+        "account", "token", instrumentation=_CancelOnRetry(token), max_retries=5
+    )
+    with pytest.raises(CancelledError):
+        client.get(f"{base_url}/comparisons/abc", cancellation=token)
+
+
+def test_download_cancelled(base_url):
+    token = CancellationToken()
+
+    class _Sink(io.BytesIO):
+        def write(self, chunk):
+            token.cancel()
+            return super().write(chunk)
+
+    sink = _Sink()
+    client = RESTClient("account", "token")
+    with pytest.raises(CancelledError):
+        stream_to_sink(
+            client, f"{base_url}/download", sink, chunk_size=1024, cancellation=token
+        )
+    assert len(sink.getvalue()) == 1024
+
+
+def test_wait_until_ready_cancelled(base_url):
+    comparisons = ComparisonsEndpoint(RESTClient("account", "token"), Url(base_url))
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel, ("job cancelled",)).start()
+    started = time.monotonic()
+    with pytest.raises(Cancelled, match="job cancelled"):
+        comparisons.wait_until_ready("abc", poll_interval=10, cancellation=token)
+    assert time.monotonic() - started < 1
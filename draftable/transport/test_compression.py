@@ -0,0 +1,114 @@
+import gzip
+import io
+import os
+import zlib
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from ..endpoints.exceptions import InvalidArgument
+from . import compression
+from .compression import UploadCompression
+from .multipart import MultipartBody
+from .rest_client import RESTClient
+
+TEXT = b"The quick brown fox jumps over the lazy dog.\n" * 5000
+
+
+def _body(content):
+    return MultipartBody(
+        {"left.file_type": "txt"},
+        {"left.file": ("left.txt", io.BytesIO(content), "application/octet-stream")},
+    )
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [("gzip", gzip.decompress), ("deflate", zlib.decompress)],
+)
+def test_compress(encoding, decompress):
+    body = _body(TEXT)
+    with UploadCompression(encoding).compress(body) as compressed:
+        assert len(compressed) < len(body) / 10
+        body.reset()
+        assert decompress(b"".join(compressed)) == body.read()
+        compressed.reset()
+        assert len(compressed.read()) == len(compressed)
+
+
+def test_compress_spools_large_bodies(monkeypatch):
+    monkeypatch.setattr(compression, "SPOOL_SIZE", 1024)
+    body = _body(TEXT * 10)
+    with UploadCompression().compress(body) as compressed:
+        assert len(compressed) > 1024
+        body.reset()
+        assert gzip.decompress(compressed.read()) == body.read()
+
+
+def test_compress_skips_small_and_incompressible_bodies():
+    assert UploadCompression(threshold=len(TEXT) * 2).compress(_body(TEXT)) is None
+
+    content = os.urandom(100_000)
+    body = _body(content)
+    assert UploadCompression().compress(body) is None
+    # The body is rewound to be sent uncompressed.
+    assert content in body.read()
+
+
+def test_upload_compression_validation():
+    with pytest.raises(InvalidArgument):
+        UploadCompression("br")
+    with pytest.raises(InvalidArgument):
+        UploadCompression(level=0)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    accept_compressed = True
+    requests = None  # type: list
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        encoding = self.headers.get("Content-Encoding")
+        self.requests.append((encoding, len(body)))
+        if encoding and not self.accept_compressed:
+            self.send_response(415)
+            content = b"{}"
+        else:
+            if encoding == "gzip":
+                body = gzip.decompress(body)
+            self.send_response(201)
+            content = b'{"received": %d}' % body.count(TEXT)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def _post(client, server):
+    url = f"{server.base_url}/comparisons"
+    data = {"left": {"file_type": "txt", "file": ("left.txt", TEXT, "text/plain")}}
+    return client.post(url, data)
+
+
+def test_post_compressed(serve):
+    server = serve(_Handler, requests=[])
+    client = RESTClient("account", "token", upload_compression=UploadCompression())
+    assert _post(client, server) == {"received": 1}
+    assert server.handler.requests[0][0] == "gzip"
+    assert server.handler.requests[0][1] < len(TEXT) / 10
+
+
+def test_post_compressed_unsupported(serve):
+    server = serve(_Handler, requests=[], accept_compressed=False)
+    client = RESTClient("account", "token", upload_compression=UploadCompression())
+    assert _post(client, server) == {"received": 1}
+    assert _post(client, server) == {"received": 1}
+    # After the server rejects a compressed upload, uploads are sent uncompressed.
+    assert [encoding for encoding, _ in server.handler.requests] == [
+        "gzip",
+        None,
+        None,
+    ]
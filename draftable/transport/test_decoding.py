@@ -0,0 +1,84 @@
+import gzip
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from .decoding import JSON_BACKENDS, json_decoder
+from .rest_client import RESTClient
+
+PAYLOAD = {"changes": [{"kind": "replace", "left": "abc" * 10, "right": "def"}] * 500}
+
+
+def test_json_decoder():
+    name, loads = json_decoder()
+    assert name in JSON_BACKENDS
+    assert loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    assert json_decoder("json") == ("json", json.loads)
+
+    def custom(content):
+        return "custom"
+
+    assert json_decoder(custom) == ("custom", custom)
+
+    with pytest.raises(ValueError):
+        json_decoder("simplejson-but-faster")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    headers_received = None  # type: list
+    body = json.dumps(PAYLOAD).encode("utf-8")
+
+    def do_GET(self):
+        self.headers_received.append(dict(self.headers))
+        body = self.body
+        self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(serve):
+    return serve(_Handler, headers_received=[])
+
+
+@pytest.mark.parametrize("backend", [None, "json"])
+def test_get_decodes_compressed_responses(server, backend):
+    client = RESTClient("account", "token", json_backend=backend)
+    assert client.get(f"{server.base_url}/changes") == PAYLOAD
+    assert "gzip" in server.handler.headers_received[0]["Accept-Encoding"]
+
+    stats = client.stats
+    assert stats.requests == 1
+    assert stats.bytes_decoded == len(_Handler.body)
+    assert stats.bytes_received < stats.bytes_decoded / 10
+    assert stats.network_seconds > 0
+    assert stats.decode_seconds > 0
+
+    stats.reset()
+    assert stats.to_dict()["requests"] == 0
+
+
+def test_stream_requests_unencoded_content(server):
+    client = RESTClient("account", "token")
+    with client.stream(f"{server.base_url}/changes") as response:
+        assert response.headers.get("Content-Encoding") is None
+    assert server.handler.headers_received[0]["Accept-Encoding"] == "identity"
+
+
+def test_invalid_json_is_a_request_exception(server):
+    client = RESTClient(
+        "account", "token", json_backend=lambda content: json.loads(b"{")
+    )
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get(f"{server.base_url}/changes")
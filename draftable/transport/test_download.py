@@ -0,0 +1,97 @@
+import hashlib
+import io
+
+import pytest
+import requests
+
+from .download import stream_to_destination, stream_to_sink
+
+CONTENT = bytes(range(256)) * 40
+
+
+class _Response(object):
+    def __init__(self, body, status_code=200, headers=None, fail_after=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError("connection reset")
+            yield self.body[i : i + chunk_size]
+
+
+class _Client(object):
+    """Serves CONTENT, failing part way through the first `failures` responses."""
+
+    def __init__(self, failures=0, supports_ranges=True):
+        self.failures = failures
+        self.supports_ranges = supports_ranges
+        self.ranges = []
+
+    def stream(self, url, headers=None, deadline=None, cancellation=None):
+        fail_after = 1000 if self.failures else None
+        self.failures = max(0, self.failures - 1)
+
+        range_header = (headers or {}).get("Range")
+        self.ranges.append(range_header)
+        if range_header and self.supports_ranges:
+            start = int(range_header[len("bytes=") : -1])
+            return _Response(
+                CONTENT[start:],
+                206,
+                {"Content-Range": f"bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}"},
+                fail_after,
+            )
+        return _Response(CONTENT, fail_after=fail_after)
+
+
+def test_stream_to_sink():
+    sink = io.BytesIO()
+    digest = stream_to_sink(_Client(), "http://x", sink, chunk_size=100)
+    assert sink.getvalue() == CONTENT
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_stream_to_sink_resumes_with_range():
+    client = _Client(failures=2)
+    sink = io.BytesIO()
+    digest = stream_to_sink(client, "http://x", sink, chunk_size=100)
+    assert sink.getvalue() == CONTENT
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+    assert client.ranges == [None, "bytes=1000-", "bytes=2000-"]
+
+
+def test_stream_to_sink_restarts_without_range_support():
+    client = _Client(failures=1, supports_ranges=False)
+    sink = io.BytesIO(b"prefix")
+    sink.seek(0, io.SEEK_END)
+    digest = stream_to_sink(client, "http://x", sink, chunk_size=100)
+    assert sink.getvalue() == b"prefix" + CONTENT
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_stream_to_sink_gives_up():
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        stream_to_sink(_Client(failures=5), "http://x", io.BytesIO(), 100, 2)
+
+
+def test_stream_to_destination_path(tmp_path):
+    path = tmp_path / "export.pdf"
+    stream_to_destination(_Client(failures=1), "http://x", path, chunk_size=100)
+    assert path.read_bytes() == CONTENT
+
+    path = tmp_path / "failed.pdf"
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        stream_to_destination(
+            _Client(failures=5), "http://x", path, chunk_size=100, max_resumes=0
+        )
+    assert not path.exists()
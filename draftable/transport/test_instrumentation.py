@@ -0,0 +1,254 @@
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from .compression import UploadCompression
+from .instrumentation import (
+    CompositeInstrumentation,
+    Instrumentation,
+    MetricsInstrumentation,
+    OpenTelemetryInstrumentation,
+    RequestInfo,
+    endpoint_template,
+)
+from .rest_client import RESTClient
+
+
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        ("https://api.draftable.com/v1/comparisons", "comparisons"),
+        ("https://api.draftable.com/v1/comparisons/aBcDeF", "comparisons/{id}"),
+        (
+            "https://api.draftable.com/v1/comparisons/aBcDeF/change-details",
+            "comparisons/{id}/change-details",
+        ),
+        ("https://api.draftable.com/v1/comparisons/?limit=10", "comparisons"),
+        ("https://api.draftable.com/v1/exports/xYz", "exports/{id}"),
+        ("https://files.example.com/export.pdf", "other"),
+    ],
+)
+def test_endpoint_template(url, endpoint):
+    assert endpoint_template(url) == endpoint
+
+
+class _Recorder(Instrumentation):
+    def __init__(self):
+        self.events = []
+
+    def on_request_start(self, request):
+        self.events.append(("start", request.method, request.endpoint))
+
+    def on_request_end(self, request):
+        self.events.append(("end", request.method, request.status_code))
+        self.last = request
+
+    def on_retry(self, request, delay):
+        self.events.append(("retry", request.method, request.status_code))
+
+    def on_error(self, request, error):
+        self.events.append(("error", request.method, type(error)))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def __respond(self, status, content):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        if self.path.endswith("/missing"):
+            self.__respond(404, b"{}")
+        else:
+            self.__respond(200, b'{"identifier": "abc"}')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding"):
+            self.__respond(415, b"{}")
+        else:
+            self.__respond(201, b'{"identifier": "abc"}')
+
+    def do_DELETE(self):
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url(serve):
+    return f"{serve(_Handler).base_url}/v1"
+
+
+def test_hooks(base_url):
+    recorder = _Recorder()
+    client = RESTClient("account", "token", instrumentation=recorder)
+
+    assert client.get(f"{base_url}/comparisons/abc") == {"identifier": "abc"}
+    request = recorder.last
+    assert request.endpoint == "comparisons/{id}"
+    assert request.bytes_sent == 0
+    assert request.bytes_received == len(b'{"identifier": "abc"}')
+    assert request.duration > 0
+    # A new connection was made, and the response body was read.
+    assert set(request.timings) == {"connect", "wait", "transfer"}
+
+    client.post(f"{base_url}/comparisons", {"identifier": "abc"})
+    assert recorder.last.bytes_sent == len(b'{"identifier": "abc"}')
+    # The connection was reused.
+    assert "connect" not in recorder.last.timings
+
+    client.delete(f"{base_url}/comparisons/abc")
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(f"{base_url}/comparisons/missing")
+
+    assert recorder.events == [
+        ("start", "GET", "comparisons/{id}"),
+        ("end", "GET", 200),
+        ("start", "POST", "comparisons"),
+        ("end", "POST", 201),
+        ("start", "DELETE", "comparisons/{id}"),
+        ("end", "DELETE", 204),
+        ("start", "GET", "comparisons/{id}"),
+        ("end", "GET", 404),
+    ]
+
+
+def test_hooks_error():
+    recorder = _Recorder()
+    client = RESTClient("account", "token", instrumentation=recorder)
+    # Nothing listens on port 9 (discard) locally.
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("http://127.0.0.1:9/v1/comparisons")
+    assert recorder.events == [
+        ("start", "GET", "comparisons"),
+        ("error", "GET", requests.exceptions.ConnectionError),
+    ]
+
+
+def test_hooks_retry(base_url):
+    recorder = _Recorder()
+    client = RESTClient(
+        "account",
+        "token",
+        upload_compression=UploadCompression(threshold=0, max_ratio=100),
+        instrumentation=recorder,
+    )
+    data = {"left": {"file_type": "txt", "file": ("left.txt", b"text", "text/plain")}}
+    assert client.post(f"{base_url}/comparisons", data) == {"identifier": "abc"}
+    assert [event for event, _, _ in recorder.events] == [
+        "start",
+        "end",
+        "retry",
+        "start",
+        "end",
+    ]
+    assert recorder.events[2] == ("retry", "POST", 415)
+
+
+def test_composite_instrumentation():
+    first, second = _Recorder(), _Recorder()
+    composite = CompositeInstrumentation(first, second)
+    request = RequestInfo("GET", "https://example.com/v1/comparisons", "comparisons")
+    composite.on_request_start(request)
+    composite.on_retry(request, 1.0)
+    assert first.events == [("start", "GET", "comparisons"), ("retry", "GET", None)]
+    assert second.events == first.events
+
+
+def _finished_request(method, endpoint, status_code, duration):
+    request = RequestInfo(method, "https://example.com", endpoint)
+    request.status_code = status_code
+    request.bytes_sent = 10
+    request.bytes_received = 100
+    request.duration = duration
+    request.timings = {}
+    return request
+
+
+def test_metrics_instrumentation():
+    metrics = MetricsInstrumentation(buckets=(0.1, 1.0))
+    metrics.on_request_end(_finished_request("GET", "comparisons/{id}", 200, 0.05))
+    metrics.on_request_end(_finished_request("GET", "comparisons/{id}", 200, 0.5))
+    metrics.on_request_end(_finished_request("GET", "comparisons/{id}", 404, 5.0))
+    metrics.on_retry(_finished_request("POST", "comparisons", 415, 0.1), 0.0)
+    metrics.on_error(
+        RequestInfo("GET", "https://example.com", "comparisons"), TimeoutError()
+    )
+
+    samples = {
+        (name, tuple(sorted(labels.items()))): value
+        for name, labels, value in metrics.samples()
+    }
+    get = (("endpoint", "comparisons/{id}"), ("method", "GET"))
+    assert samples[("draftable_requests_total", get + (("status", "200"),))] == 2
+    assert samples[("draftable_requests_total", get + (("status", "404"),))] == 1
+    assert samples[("draftable_request_bytes_total", get)] == 30
+    assert samples[("draftable_response_bytes_total", get)] == 300
+    buckets = [
+        samples[
+            ("draftable_request_duration_seconds_bucket", (get[0], ("le", le), get[1]))
+        ]
+        for le in ("0.1", "1.0", "+Inf")
+    ]
+    assert buckets == [1, 2, 3]
+    assert samples[("draftable_request_duration_seconds_count", get)] == 3
+    assert samples[("draftable_request_duration_seconds_sum", get)] == pytest.approx(
+        5.55
+    )
+    post = (("endpoint", "comparisons"), ("method", "POST"))
+    assert samples[("draftable_retries_total", post)] == 1
+    error = (("endpoint", "comparisons"), ("error", "TimeoutError"), ("method", "GET"))
+    assert samples[("draftable_errors_total", error)] == 1
+
+    text = metrics.render()
+    assert (
+        'draftable_requests_total{method="GET",endpoint="comparisons/{id}",'
+        'status="200"} 2.0\n'
+    ) in text
+    assert (
+        'draftable_request_duration_seconds_bucket{method="GET",'
+        'endpoint="comparisons/{id}",le="+Inf"} 3\n'
+    ) in text
+    types = [line for line in text.splitlines() if line.startswith("# TYPE ")]
+    assert types == [
+        "# TYPE draftable_errors_total counter",
+        "# TYPE draftable_request_bytes_total counter",
+        "# TYPE draftable_requests_total counter",
+        "# TYPE draftable_response_bytes_total counter",
+        "# TYPE draftable_retries_total counter",
+        "# TYPE draftable_request_duration_seconds histogram",
+    ]
+    assert text.startswith(
+        "# HELP draftable_errors_total Requests that failed without a response.\n"
+        "# TYPE draftable_errors_total counter\n"
+    )
+
+
+def test_opentelemetry_instrumentation():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    instrumentation = OpenTelemetryInstrumentation(provider.get_tracer("test"))
+
+    request = _finished_request("GET", "comparisons/{id}", 200, 0.1)
+    instrumentation.on_request_start(request)
+    instrumentation.on_request_end(request)
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "GET comparisons/{id}"
+    assert span.attributes["http.response.status_code"] == 200
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+import requests
+
+from .multipart import MultipartBody
+
+FIELDS = {
+    "identifier": None,
+    "public": True,
+    "left.file_type": "pdf",
+    "left.display_name": 'a "quoted"\nname',
+}
+
+
+def _expected(files):
+    request = requests.Request("POST", "http://x", data=FIELDS, files=files).prepare()
+    boundary = request.headers["Content-Type"].split("boundary=")[1]
+    return request.body.replace(boundary.encode("ascii"), b"BOUNDARY")
+
+
+def test_multipart_body_matches_requests():
+    content = bytes(range(256)) * 1000
+    body = MultipartBody(
+        FIELDS,
+        {
+            "left.file": ("left.pdf", io.BytesIO(content), "application/pdf"),
+            "right.file": ("right.pdf", memoryview(content), "application/pdf"),
+        },
+        boundary="BOUNDARY",
+    )
+    expected = _expected(
+        {
+            "left.file": ("left.pdf", content, "application/pdf"),
+            "right.file": ("right.pdf", content, "application/pdf"),
+        }
+    )
+    assert body.content_type == "multipart/form-data; boundary=BOUNDARY"
+    assert len(body) == len(expected)
+    assert b"".join(body) == expected
+
+
+def test_multipart_body_does_not_copy_buffers():
+    content = bytearray(b"x" * 100_000)
+    body = MultipartBody({}, {"file": ("f", content, None)})
+    chunks = [body.read(4096) for _ in range(30)]
+    views = [c for c in chunks if isinstance(c, memoryview) and c.obj is content]
+    assert sum(len(v) for v in views) == len(content)
+
+
+def test_multipart_body_reads_unsized_files():
+    class Unseekable(object):
+        def __init__(self, content):
+            self.stream = io.BytesIO(content)
+
+        def read(self, size=-1):
+            return self.stream.read(size)
+
+        def __iter__(self):
+            return iter(self.stream)
+
+    body = MultipartBody({}, {"file": ("f", Unseekable(b"abc"), None)}, "B")
+    assert body.read() == (
+        b'--B\r\nContent-Disposition: form-data; name="file"; filename="f"\r\n\r\n'
+        b"abc\r\n--B--\r\n"
+    )
+
+
+def test_multipart_body_detects_truncated_files():
+    file = io.BytesIO(b"abc")
+    body = MultipartBody({}, {"file": ("f", file, None)})
+    file.truncate(1)
+    with pytest.raises(OSError):
+        body.read()
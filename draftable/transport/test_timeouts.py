@@ -0,0 +1,152 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from ..endpoints import ComparisonsEndpoint
+from ..endpoints.exceptions import DeadlineExceeded, EndpointException
+from ..utilities import Url
+from .rest_client import RESTClient
+from .timeouts import Deadline, DeadlineExceededError, Timeouts
+
+COMPARISON = (
+    b'{"identifier": "abc", "left": {"file_type": "pdf"}, '
+    b'"right": {"file_type": "pdf"}, "public": false, '
+    b'"creation_time": "2024-01-01T00:00:00Z", "ready": false, "failed": false}'
+)
+
+
+def test_timeouts_for_operation():
+    timeouts = Timeouts(connect=5, read=10, change_details=None)
+    assert timeouts.for_operation("read") == (5, 10)
+    assert timeouts.for_operation("upload") == (5, 300)
+    assert timeouts.for_operation("change_details") == (5, None)
+
+    deadline = Deadline(2)
+    connect, read = timeouts.for_operation("change_details", deadline)
+    assert 1.5 < connect <= 2
+    assert read == connect
+
+
+def test_timeouts_validation():
+    with pytest.raises(ValueError):
+        Timeouts(read=0)
+    with pytest.raises(ValueError):
+        Timeouts(connect=-1)
+
+
+def test_deadline():
+    deadline = Deadline(60)
+    assert 59 < deadline.remaining() <= 60
+    assert not deadline.expired
+    deadline.check()
+
+    deadline = Deadline(0)
+    assert deadline.expired
+    assert deadline.remaining() == 0
+    with pytest.raises(DeadlineExceededError):
+        deadline.check()
+    with pytest.raises(DeadlineExceededError):
+        Timeouts().for_operation("read", deadline)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Statuses to respond with, in turn, before responding normally.
+    failures = ()
+    delay = 0.0
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        if self.failures:
+            status, content = self.failures.pop(0), b"{}"
+        else:
+            # Not time.sleep, which tests of retries replace.
+            threading.Event().wait(self.delay)
+            status, content = 200, COMPARISON
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        except ConnectionError:
+            # The client timed out and closed the connection.
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def _base_url(server):
+    return f"{server.base_url}/v1"
+
+
+def test_read_timeout(serve):
+    server = serve(_Handler, delay=0.5)
+    client = RESTClient("account", "token", timeouts=Timeouts(read=0.1))
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get(f"{_base_url(server)}/comparisons/abc")
+
+
+def test_retries(serve, monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    server = serve(_Handler, failures=[503, 502])
+    client = RESTClient("account", "token", max_retries=2)
+    assert client.get(f"{_base_url(server)}/comparisons/abc")["identifier"] == "abc"
+    assert server.handler.requests == 3
+
+    server.handler.failures = [503, 503, 503]
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(f"{_base_url(server)}/comparisons/abc")
+
+
+def test_no_retries_by_default(serve):
+    server = serve(_Handler, failures=[503])
+    client = RESTClient("account", "token")
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(f"{_base_url(server)}/comparisons/abc")
+    assert server.handler.requests == 1
+
+
+def test_retries_read_timeout(serve, monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    server = serve(_Handler, delay=0.5)
+    client = RESTClient("account", "token", timeouts=Timeouts(read=0.1), max_retries=1)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get(f"{_base_url(server)}/comparisons/abc")
+    assert server.handler.requests == 2
+
+
+def test_deadline_exceeded(serve):
+    server = serve(_Handler, delay=0.5)
+    client = RESTClient("account", "token", max_retries=3)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        client.get(f"{_base_url(server)}/comparisons/abc", deadline=Deadline(0.1))
+    assert time.monotonic() - started < 0.4
+    assert server.handler.requests == 1
+
+
+def test_endpoint_deadline(serve):
+    url = Url(_base_url(serve(_Handler, delay=0.5)))
+    comparisons = ComparisonsEndpoint(RESTClient("account", "token"), url)
+    with pytest.raises(DeadlineExceeded):
+        comparisons.get("abc", deadline=0.1)
+
+    client = RESTClient("account", "token", timeouts=Timeouts(read=0.1))
+    comparisons = ComparisonsEndpoint(client, url)
+    with pytest.raises(EndpointException, match="in time"):
+        comparisons.get("abc")
+
+
+def test_wait_until_ready_deadline(serve):
+    url = Url(_base_url(serve(_Handler)))
+    comparisons = ComparisonsEndpoint(RESTClient("account", "token"), url)
+    deadline = Deadline(0.2)
+    with pytest.raises(DeadlineExceeded, match="within 0.2 seconds"):
+        comparisons.wait_until_ready("abc", poll_interval=0.05, timeout=deadline)
+    assert deadline.remaining() < 0.05
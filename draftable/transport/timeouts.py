@@ -0,0 +1,160 @@
+import time
+
+import requests
+
+try:
+    from typing import Optional, Tuple
+except ImportError:
+    pass
+
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_UPLOAD_TIMEOUT = 300.0
+DEFAULT_CHANGE_DETAILS_TIMEOUT = 600.0
+DEFAULT_DOWNLOAD_TIMEOUT = 60.0
+
+
+class DeadlineExceededError(requests.exceptions.Timeout):
+    """Raised when a request can't be completed before its deadline."""
+
+
+class Deadline(object):
+    """A point in time by which an operation must be completed.
+
+    A deadline may be shared by several calls, e.g. to bound the total time spent
+    on a job, and bounds each request made, any retries, and the time spent waiting
+    between them.
+
+    :param seconds: the number of seconds from now until the deadline
+    """
+
+    def __init__(self, seconds):
+        # type: (float) -> None
+        self.__seconds = float(seconds)
+        self.__expires = time.monotonic() + self.__seconds
+
+    @property
+    def seconds(self):
+        # type: () -> float
+        """The number of seconds the deadline was set for."""
+        return self.__seconds
+
+    def remaining(self):
+        # type: () -> float
+        """The number of seconds until the deadline, or 0 if it has passed."""
+        return max(0.0, self.__expires - time.monotonic())
+
+    @property
+    def expired(self):
+        # type: () -> bool
+        return time.monotonic() >= self.__expires
+
+    def check(self):
+        # type: () -> None
+        """Raises `DeadlineExceededError` if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceededError(
+                f"The deadline of {self.__seconds:g} seconds was exceeded."
+            )
+
+    def __repr__(self):
+        # type: () -> str
+        return f"Deadline(seconds={self.__seconds!r}, remaining={self.remaining()!r})"
+
+
+class Timeouts(object):
+    """The timeouts of requests, by the class of operation.
+
+    Read timeouts bound the time waiting for the server to send data, i.e. for the
+    response to start and then between each part of it, rather than the total time
+    of a request. Use a `Deadline` to bound the total time. Timeouts of None wait
+    forever.
+
+    :param connect: the timeout for establishing a connection, for all requests
+    :param read: the read timeout for requests without a more specific timeout,
+        e.g. retrieving and deleting comparisons
+    :param upload: the read timeout for creating comparisons from uploaded files,
+        which includes the time taken by the server to receive the files
+    :param change_details: the read timeout for retrieving the change details of
+        comparisons, which may be computed on demand
+    :param download: the read timeout for downloading exports
+    """
+
+    def __init__(
+        self,
+        connect=DEFAULT_CONNECT_TIMEOUT,  # type: Optional[float]
+        read=DEFAULT_READ_TIMEOUT,  # type: Optional[float]
+        upload=DEFAULT_UPLOAD_TIMEOUT,  # type: Optional[float]
+        change_details=DEFAULT_CHANGE_DETAILS_TIMEOUT,  # type: Optional[float]
+        download=DEFAULT_DOWNLOAD_TIMEOUT,  # type: Optional[float]
+    ):
+        for name, value in (
+            ("connect", connect),
+            ("read", read),
+            ("upload", upload),
+            ("change_details", change_details),
+            ("download", download),
+        ):
+            if value is not None and not value > 0:
+                raise ValueError(f"`{name}` must be a positive number of seconds.")
+        self.__connect = connect
+        self.__read_timeouts = {
+            "read": read,
+            "upload": upload,
+            "change_details": change_details,
+            "download": download,
+        }
+
+    @property
+    def connect(self):
+        # type: () -> Optional[float]
+        return self.__connect
+
+    @property
+    def read(self):
+        # type: () -> Optional[float]
+        return self.__read_timeouts["read"]
+
+    @property
+    def upload(self):
+        # type: () -> Optional[float]
+        return self.__read_timeouts["upload"]
+
+    @property
+    def change_details(self):
+        # type: () -> Optional[float]
+        return self.__read_timeouts["change_details"]
+
+    @property
+    def download(self):
+        # type: () -> Optional[float]
+        return self.__read_timeouts["download"]
+
+    def for_operation(self, operation, deadline=None):
+        # type: (str, Optional[Deadline]) -> Tuple[Optional[float], Optional[float]]
+        """Returns the `(connect, read)` timeouts for a request, as accepted by
+        requests, shortened to end by the deadline if one is given.
+
+        :raises DeadlineExceededError: if the deadline has already passed
+        """
+        connect = self.__connect
+        read = self.__read_timeouts[operation]
+        if deadline is not None:
+            deadline.check()
+            remaining = deadline.remaining()
+            connect = remaining if connect is None else min(connect, remaining)
+            read = remaining if read is None else min(read, remaining)
+        return connect, read
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "Timeouts("
+            f"connect={self.__connect!r}, "
+            f"read={self.read!r}, "
+            f"upload={self.upload!r}, "
+            f"change_details={self.change_details!r}, "
+            f"download={self.download!r}"
+            ")"
+        )
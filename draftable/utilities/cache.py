@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    from typing import Any, Hashable, Optional
+except ImportError:
+    pass
+
+
+class TTLCache(object):
+    """A thread-safe, size-bounded LRU cache whose entries expire after a time-to-live.
+
+    Expired entries are discarded lazily, when they're next looked up or when they're
+    evicted to make room for new entries.
+    """
+
+    def __init__(self, maxsize, ttl):
+        # type: (int, float) -> None
+        self.__maxsize = maxsize
+        self.__ttl = ttl
+        self.__entries = OrderedDict()  # type: OrderedDict
+        self.__lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        # type: () -> int
+        return self.__maxsize
+
+    @property
+    def ttl(self):
+        # type: () -> float
+        return self.__ttl
+
+    def get(self, key, default=None):
+        # type: (Hashable, Any) -> Any
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self.__entries[key]
+                return default
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        # type: (Hashable, Any, Optional[float]) -> None
+        if self.__maxsize <= 0:
+            return
+        expires = time.monotonic() + (self.__ttl if ttl is None else ttl)
+        with self.__lock:
+            self.__entries[key] = (expires, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        # type: (Hashable, Any) -> Any
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        # type: () -> None
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        # type: (Hashable) -> bool
+        return self.get(key, self) is not self
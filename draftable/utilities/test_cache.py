@@ -0,0 +1,41 @@
+import time
+
+from .cache import TTLCache
+
+
+def test_get_set_pop():
+    cache = TTLCache(2, 60)
+    assert cache.get("a") is None
+    assert cache.get("a", 1) == 1
+    cache.set("a", "A")
+    assert cache.get("a") == "A"
+    assert "a" in cache
+    assert cache.pop("a") == "A"
+    assert "a" not in cache
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = TTLCache(2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_expiry():
+    cache = TTLCache(2, 60)
+    cache.set("a", 1, ttl=0.01)
+    cache.set("b", 2)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_disabled():
+    cache = TTLCache(0, 60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
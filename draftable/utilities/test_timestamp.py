@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from .timestamp import _parse_datetime_strptime, parse_datetime
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2024-02-29T23:59:59Z",
+        "2024-02-29T23:59:59.1Z",
+        "2024-02-29T23:59:59.12Z",
+        "2024-02-29T23:59:59.123Z",
+        "2024-02-29T23:59:59.1234Z",
+        "2024-02-29T23:59:59.12345Z",
+        "2024-02-29T23:59:59.123456Z",
+        "2024-02-29T23:59:59.000001Z",
+        # Unusual shapes which are handled by the slow path
+        "2024-2-9T3:5:9Z",
+        "2024-02-29T23:59:59.Z",
+    ],
+)
+def test_parse_datetime_matches_strptime(value):
+    try:
+        expected = _parse_datetime_strptime(value)
+    except ValueError:
+        with pytest.raises(ValueError):
+            parse_datetime(value)
+    else:
+        result = parse_datetime(value)
+        assert result == expected
+        assert result.tzinfo is timezone.utc
+
+
+def test_parse_datetime_microseconds():
+    assert parse_datetime("2024-01-02T03:04:05.12Z") == datetime(
+        2024, 1, 2, 3, 4, 5, 120000, tzinfo=timezone.utc
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "2024-02-30T00:00:00Z",
+        "2024-02-29T23:59:59",
+        "2024-02-29 23:59:59Z",
+        "2024-02-29T23:59:59+00:00",
+        "2024-02-29T23:59:59.1234567Z",
+        "2024-W01-1T00:00:00Z",
+        "2024-02-29T23:59:59.12a4Z",
+        "2024-02-29T23:59:59.123-05Z",
+        "2024-02-29T23:59:59.1+01Z",
+        "2024-02-29T23:59:59.1+0100Z",
+    ],
+)
+def test_parse_datetime_invalid(value):
+    with pytest.raises(ValueError):
+        parse_datetime(value)